@@ -1,7 +1,7 @@
 # Agents package initialization
 from .scraper import Web3ContentScraper, run_scraping_agent
 from .verifier import LegitimacyChecker
-from .runner import run_agent, start_scheduler, run_scheduler
+from .runner import run_agent, start_scheduler, stop_scheduler, get_scheduler
 from .language_detector import LanguageFilter
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     'LegitimacyChecker',
     'run_agent',
     'start_scheduler', 
-    'run_scheduler',
+    'stop_scheduler',
+    'get_scheduler',
     'LanguageFilter'
 ]
\ No newline at end of file
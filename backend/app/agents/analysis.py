@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import LLM_REQUEST_SECONDS, LLM_REQUESTS
+from .processor import (
+    FALLBACK_ANALYSIS, build_prompt, build_batch_prompt, cached_analysis, estimate_tokens,
+    pack_batches, remember_analysis, request_analysis, request_batch_analysis, validate_analysis
+)
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Rough upper bound on the JSON answer, used when charging the tokens/min bucket
+EXPECTED_OUTPUT_TOKENS = 200
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate_per_minute`"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        # Burst size defaults to a full minute's worth
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.tokens = self.capacity
+        self.refill_per_second = rate_per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.refill_per_second)
+
+def is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    # google.api_core exceptions carry the HTTP status on `.code`
+    code = getattr(exc, "code", None)
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+class AnalysisExecutor:
+    """
+    Runs Gemini analysis concurrently without blocking the event loop.
+    Throughput is bounded by the requests/min and tokens/min quotas rather
+    than a fixed sleep; transient failures are retried with jittered backoff.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.ANALYSIS_CONCURRENCY,
+        requests_per_minute: float = settings.ANALYSIS_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = settings.ANALYSIS_TOKENS_PER_MINUTE,
+        timeout: float = settings.ANALYSIS_TIMEOUT,
+        max_retries: int = settings.ANALYSIS_MAX_RETRIES,
+        batch_size: int = settings.ANALYSIS_BATCH_SIZE,
+        batch_token_budget: int = settings.ANALYSIS_BATCH_TOKEN_BUDGET,
+        batch_timeout: float = settings.ANALYSIS_BATCH_TIMEOUT,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0
+    ):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.batch_size = batch_size
+        self.batch_token_budget = batch_token_budget
+        self.batch_timeout = batch_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.5)
+
+    async def _call(self, make_request: Callable[[], Awaitable], cost: int, timeout: float, call: str = "single"):
+        """
+        Run one Gemini request under the concurrency limit and both quotas.
+        Returns None once retries are exhausted or the error isn't transient.
+        """
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.request_bucket.acquire()
+                await self.token_bucket.acquire(cost)
+                # Timed from here so quota waits don't count as model latency
+                started = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(make_request(), timeout=timeout)
+                    LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, call=call)
+                    LLM_REQUESTS.inc(call=call, outcome="ok")
+                    return result
+                except Exception as e:
+                    LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, call=call)
+                    if attempt < self.max_retries and is_retryable(e):
+                        LLM_REQUESTS.inc(call=call, outcome="retry")
+                        delay = self._backoff(attempt)
+                        logger.warning(f"Analysis retry {attempt + 1}/{self.max_retries} in {delay:.1f}s: {e!r}")
+                        await asyncio.sleep(delay)
+                        continue
+                    LLM_REQUESTS.inc(call=call, outcome="error")
+                    logger.error(f"Agent Error: {e!r}")
+                    return None
+        return None
+
+    async def analyze(self, title: str, raw_text: str) -> Dict:
+        """Analyze one article, returning the fallback analysis if every attempt fails"""
+        # Cache hits skip the quota entirely
+        cached = cached_analysis(title, raw_text)
+        if cached is not None:
+            return cached
+
+        cost = estimate_tokens(build_prompt(title, raw_text)) + EXPECTED_OUTPUT_TOKENS
+        result = await self._call(lambda: request_analysis(title, raw_text), cost, self.timeout)
+        if result is None:
+            return dict(FALLBACK_ANALYSIS)
+        # Only answers that pass validation are cached
+        if not remember_analysis(title, raw_text, result):
+            logger.warning(f"Analysis for '{title[:60]}' doesn't match the schema, using fallback")
+            return dict(FALLBACK_ANALYSIS)
+        return result
+
+    async def _analyze_batch(self, batch: List[Tuple[str, str, str]]) -> Dict[str, Dict]:
+        cost = estimate_tokens(build_batch_prompt(batch)) + EXPECTED_OUTPUT_TOKENS * len(batch)
+        answers = await self._call(lambda: request_batch_analysis(batch), cost, self.batch_timeout, call="batch")
+        return answers or {}
+
+    async def analyze_many(self, items: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Analyze (title, raw_text) pairs, preserving order.
+        Uncached items are packed into multi-article requests; anything a batch
+        answer leaves missing or malformed falls back to a single-article call.
+        """
+        results: List[Optional[Dict]] = [None] * len(items)
+        pending = []
+        for i, (title, raw_text) in enumerate(items):
+            cached = cached_analysis(title, raw_text)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((str(i), title, raw_text))
+
+        batches = list(pack_batches(pending, self.batch_size, self.batch_token_budget))
+        batch_answers = await asyncio.gather(*(self._analyze_batch(batch) for batch in batches))
+
+        retry = []
+        for batch, answers in zip(batches, batch_answers):
+            for article_id, title, raw_text in batch:
+                answer = answers.get(article_id)
+                if validate_analysis(answer):
+                    answer.pop("id", None)
+                    remember_analysis(title, raw_text, answer)
+                    results[int(article_id)] = answer
+                else:
+                    retry.append((int(article_id), title, raw_text))
+
+        if retry:
+            logger.info(f"Analysis: {len(retry)} items missing from batch answers, retrying individually")
+            singles = await asyncio.gather(*(self.analyze(title, raw_text) for _, title, raw_text in retry))
+            for (index, _, _), result in zip(retry, singles):
+                results[index] = result
+
+        return results
+
+_executor: Optional[AnalysisExecutor] = None
+
+def get_analysis_executor() -> AnalysisExecutor:
+    """Shared executor so the rate limiter spans consecutive cycles"""
+    global _executor
+    if _executor is None:
+        _executor = AnalysisExecutor()
+    return _executor
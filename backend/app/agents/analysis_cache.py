@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.metrics import LLM_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+_whitespace = re.compile(r'\s+')
+
+def content_key(model_name: str, prompt_version: str, title: str, raw_text: str) -> str:
+    """Cache key for an analysis: model + prompt version + normalized content hash"""
+    normalized = _whitespace.sub(' ', f"{title}\n{raw_text}").strip().lower()
+    digest = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    return f"{model_name}:{prompt_version}:{digest}"
+
+class AnalysisCache:
+    """
+    On-disk memoization of LLM analysis results.
+    Entries older than `max_age_seconds` are dropped, and the store is trimmed
+    to `max_entries` by least recent use.
+    """
+
+    # Run eviction every N writes instead of on each one
+    EVICT_EVERY = 100
+
+    def __init__(self, path: str, max_entries: int = 50000, max_age_seconds: float = 30 * 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_used ON analysis_cache (last_used)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] <= self.max_age_seconds:
+                self._conn.execute("UPDATE analysis_cache SET last_used = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.hits += 1
+                LLM_CACHE_LOOKUPS.inc(result="hit")
+                return json.loads(row[0])
+            self.misses += 1
+        LLM_CACHE_LOOKUPS.inc(result="miss")
+        return None
+
+    def set(self, key: str, result: Dict):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, result, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM analysis_cache WHERE created_at < ?", (now - self.max_age_seconds,))
+        self._conn.execute(
+            """
+            DELETE FROM analysis_cache WHERE key IN (
+                SELECT key FROM analysis_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": size
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_cache: Optional[AnalysisCache] = None
+
+def get_analysis_cache() -> AnalysisCache:
+    global _cache
+    if _cache is None:
+        _cache = AnalysisCache(
+            settings.ANALYSIS_CACHE_PATH,
+            max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+            max_age_seconds=settings.ANALYSIS_CACHE_MAX_AGE_DAYS * 86400
+        )
+    return _cache
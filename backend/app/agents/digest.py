@@ -0,0 +1,328 @@
+import asyncio
+import hashlib
+import html
+import logging
+import math
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from string import Template
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import aiohttp
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.http_client import get_http_client
+from app.repositories import ArticleRepository, UserRepository
+from .analysis import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Only what the email shows; the candidate query skips everything else
+DIGEST_COLUMNS = "id,title,url,source,summary,ecosystem_tag,legitimacy_score,sentiment_score,published_at,created_at"
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# --- Templates: parsed once, filled per article and per email ---
+
+_PAGE = Template("""<h1>Lexi Intelligence Brief: $date</h1>
+$cards""")
+
+_CARD = Template("""
+        <div style="border:1px solid #ddd; padding:15px; margin-bottom:15px; border-radius:8px;">
+            <h3 style="margin-top:0;">$title</h3>
+            <div style="font-size:12px; color:#666; margin-bottom:10px;">
+                <span style="background:#eee; padding:3px 6px;">$tag</span>
+                <span style="color:$color; font-weight:bold;"> • Sentiment: $sentiment/10</span>
+                <span> • $trust</span>
+            </div>
+            <p>$summary</p>
+            <a href="$url">Read Source ($source)</a>
+        </div>
+        """)
+
+class DigestRenderer:
+    """
+    Each article's card is rendered once per run and shared by every email it
+    appears in; identical selections (e.g. users with no bookmarks) share the
+    whole body.
+    """
+
+    def __init__(self, date_str: str):
+        self.date_str = date_str
+        self._cards: Dict[str, str] = {}
+        self._bodies: Dict[Tuple[str, ...], str] = {}
+
+    def card(self, article: Dict) -> str:
+        cached = self._cards.get(article["id"])
+        if cached is None:
+            sentiment = article.get("sentiment_score") or 5
+            cached = self._cards[article["id"]] = _CARD.substitute(
+                title=html.escape(article["title"] or ""),
+                tag=html.escape(article.get("ecosystem_tag") or ""),
+                color="green" if sentiment >= 7 else "red" if sentiment <= 4 else "orange",
+                sentiment=sentiment,
+                trust="Verified" if (article.get("legitimacy_score") or 0) > 0.8 else "Unverified",
+                summary=html.escape(article.get("summary") or ""),
+                url=html.escape(article["url"], quote=True),
+                source=html.escape(article.get("source") or "")
+            )
+        return cached
+
+    def render(self, articles: List[Dict]) -> str:
+        key = tuple(a["id"] for a in articles)
+        body = self._bodies.get(key)
+        if body is None:
+            body = _PAGE.substitute(date=self.date_str, cards="".join(self.card(a) for a in articles))
+            # Only bodies that repeat are worth keeping; personalized ones rarely do
+            if len(self._bodies) < 1000:
+                self._bodies[key] = body
+        return body
+
+class DigestRanker:
+    """
+    Ranks the candidate set per user in memory.
+    score = base + AFFINITY_WEIGHT * share of the user's bookmarks in the article's ecosystem,
+    where base mixes legitimacy with a recency decay. Within one ecosystem the order is
+    fixed by base, so a user's top k is always inside the generic top k plus the top k of
+    each ecosystem they bookmark; ranking a user only looks at those few lists.
+    """
+
+    AFFINITY_WEIGHT = 1.0
+    HALF_LIFE_HOURS = 48
+
+    def __init__(self, articles: List[Dict], per_user: int, now: Optional[datetime] = None):
+        self.per_user = per_user
+        now = now or datetime.now(timezone.utc)
+        self.base = {a["id"]: self._base_score(a, now) for a in articles}
+        ordered = sorted(articles, key=lambda a: self.base[a["id"]], reverse=True)
+        self.generic = ordered[:per_user]
+        self.by_tag: Dict[str, List[Dict]] = {}
+        for article in ordered:
+            bucket = self.by_tag.setdefault((article.get("ecosystem_tag") or "").lower(), [])
+            if len(bucket) < per_user:
+                bucket.append(article)
+
+    def _base_score(self, article: Dict, now: datetime) -> float:
+        legitimacy = article.get("legitimacy_score") or 0.0
+        try:
+            published = datetime.fromisoformat(article.get("published_at") or article["created_at"])
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            age_hours = max(0.0, (now - published).total_seconds() / 3600)
+        except (KeyError, TypeError, ValueError):
+            age_hours = self.HALF_LIFE_HOURS
+        return 0.6 * legitimacy + 0.4 * math.pow(0.5, age_hours / self.HALF_LIFE_HOURS)
+
+    def rank(self, ecosystems: Optional[Dict[str, int]]) -> List[Dict]:
+        if not ecosystems:
+            return self.generic
+        total = sum(ecosystems.values()) or 1
+        affinity = {tag.lower(): count / total for tag, count in ecosystems.items()}
+        candidates = {a["id"]: a for a in self.generic}
+        for tag in affinity:
+            for article in self.by_tag.get(tag, ()):
+                candidates[article["id"]] = article
+
+        def score(article: Dict) -> float:
+            tag = (article.get("ecosystem_tag") or "").lower()
+            return self.base[article["id"]] + self.AFFINITY_WEIGHT * affinity.get(tag, 0.0)
+
+        return sorted(candidates.values(), key=score, reverse=True)[:self.per_user]
+
+class DigestLedger:
+    """
+    Per-run delivery record, so a run that dies halfway can be re-run and only
+    sends to the users it hadn't reached. Keyed by run id (the digest date).
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS digest_deliveries (
+                run_id TEXT NOT NULL,
+                address TEXT NOT NULL,
+                status TEXT NOT NULL,
+                message_id TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, address)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def sent(self, run_id: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT address FROM digest_deliveries WHERE run_id = ? AND status = 'sent'", (run_id,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def record(self, run_id: str, results: Iterable[Tuple[str, str, Optional[str], Optional[str]]]):
+        """results: (address, status, message_id, error)"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO digest_deliveries (run_id, address, status, message_id, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, address, status, message_id, error, now) for address, status, message_id, error in results]
+            )
+            self._conn.commit()
+
+    def summary(self, run_id: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM digest_deliveries WHERE run_id = ? GROUP BY status", (run_id,)
+            ).fetchall()
+        return dict(rows)
+
+class ResendBatchSender:
+    """
+    Sends through Resend's batch endpoint (up to 100 emails per request) with
+    bounded concurrency under a requests/second budget. Each batch carries an
+    idempotency key derived from its recipients, so a batch re-sent after a
+    crash is deduplicated by Resend rather than delivered twice.
+    """
+
+    def __init__(
+        self,
+        api_key: str = settings.RESEND_API_KEY,
+        concurrency: int = settings.DIGEST_SEND_CONCURRENCY,
+        requests_per_second: float = settings.DIGEST_REQUESTS_PER_SECOND,
+        max_retries: int = 3
+    ):
+        self.url = f"{settings.RESEND_API_URL.rstrip('/')}/emails/batch"
+        self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(requests_per_second * 60, capacity=max(1.0, requests_per_second))
+        self.max_retries = max_retries
+        self.http_client = get_http_client("email", verify_ssl=True)
+
+    async def send(self, emails: List[Dict], idempotency_key: str) -> List[Optional[str]]:
+        """Returns Resend's message id per email; raises once retries are exhausted"""
+        session = await self.http_client.get_session()
+        headers = {**self.headers, "Idempotency-Key": idempotency_key}
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.bucket.acquire()
+                try:
+                    async with session.post(self.url, json=emails, headers=headers) as response:
+                        if response.status < 300:
+                            data = (await response.json()).get("data") or []
+                            return [item.get("id") for item in data] + [None] * (len(emails) - len(data))
+                        text = await response.text()
+                        if response.status not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                            raise RuntimeError(f"Resend HTTP {response.status}: {text[:200]}")
+                        delay = float(response.headers.get("Retry-After") or 2 ** attempt)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = 2 ** attempt
+                    logger.warning(f"Digest batch send failed ({e!r}), retrying")
+                await asyncio.sleep(delay)
+        raise RuntimeError("unreachable")
+
+class DigestEngine:
+    """
+    One digest run: load the candidate articles once, page through subscribers
+    (with their bookmarked ecosystems) a few hundred at a time, rank and render
+    in memory, and send in batches. Re-running the same run_id skips users the
+    ledger already marks as sent.
+    """
+
+    def __init__(
+        self,
+        articles: Optional[ArticleRepository] = None,
+        users: Optional[UserRepository] = None,
+        ledger: Optional[DigestLedger] = None,
+        sender: Optional[ResendBatchSender] = None,
+        per_user: int = settings.DIGEST_ARTICLES_PER_USER,
+        batch_size: int = settings.DIGEST_BATCH_SIZE,
+        page_size: int = settings.DIGEST_RECIPIENT_PAGE_SIZE
+    ):
+        db = get_database("service")
+        self.articles = articles or ArticleRepository(db)
+        self.users = users or UserRepository(db)
+        self.ledger = ledger or DigestLedger(settings.DIGEST_STATE_PATH)
+        self.sender = sender or ResendBatchSender()
+        self.per_user = per_user
+        self.batch_size = batch_size
+        self.page_size = page_size
+
+    async def _recipients(self):
+        """Subscribers page by page, then the operator copy to RECIPIENT_EMAIL if configured"""
+        after = None
+        while True:
+            page = await self.users.digest_recipients(after, self.page_size)
+            if not page:
+                break
+            yield page
+            if len(page) < self.page_size:
+                break
+            after = page[-1]["wallet_address"]
+        if settings.RECIPIENT_EMAIL:
+            yield [{"wallet_address": f"operator:{settings.RECIPIENT_EMAIL}", "email": settings.RECIPIENT_EMAIL, "ecosystems": {}}]
+
+    def _message(self, email: str, articles: List[Dict], renderer: DigestRenderer) -> Dict:
+        return {
+            "from": settings.DIGEST_FROM,
+            "to": [email],
+            "subject": f"Daily Web3 Intel: {len(articles)} Updates",
+            "html": renderer.render(articles)
+        }
+
+    async def _send_batch(self, run_id: str, batch: List[Tuple[str, Dict]]) -> Tuple[int, int]:
+        addresses = [address for address, _ in batch]
+        key = hashlib.sha256(f"{run_id}:{','.join(addresses)}".encode()).hexdigest()
+        try:
+            message_ids = await self.sender.send([message for _, message in batch], key)
+        except Exception as e:
+            logger.error(f"Digest batch of {len(batch)} failed: {e}")
+            self.ledger.record(run_id, [(address, "failed", None, str(e)[:500]) for address in addresses])
+            return 0, len(batch)
+        self.ledger.record(run_id, [(address, "sent", message_id, None) for address, message_id in zip(addresses, message_ids)])
+        return len(batch), 0
+
+    async def run(self, run_id: Optional[str] = None) -> Dict:
+        now = datetime.now(timezone.utc)
+        run_id = run_id or now.strftime("%Y-%m-%d")
+        since = (now - timedelta(days=settings.DIGEST_LOOKBACK_DAYS)).isoformat()
+        started = time.monotonic()
+
+        candidates = await self.articles.recent_processed(since, settings.DIGEST_CANDIDATE_LIMIT, columns=DIGEST_COLUMNS)
+        if not candidates:
+            logger.info("Digest: no new articles to send.")
+            return {"run_id": run_id, "candidates": 0, "sent": 0, "failed": 0, "skipped": 0}
+
+        ranker = DigestRanker(candidates, self.per_user, now)
+        renderer = DigestRenderer(now.strftime("%B %d, %Y"))
+        already_sent = self.ledger.sent(run_id)
+        sent = failed = skipped = 0
+
+        async for page in self._recipients():
+            pending = []
+            for recipient in page:
+                address = recipient["wallet_address"]
+                if address in already_sent:
+                    skipped += 1
+                    continue
+                picks = ranker.rank(recipient.get("ecosystems"))
+                if picks:
+                    pending.append((address, self._message(recipient["email"], picks, renderer)))
+
+            # Batches of one page go out concurrently, bounded by the sender
+            batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+            for ok, bad in await asyncio.gather(*(self._send_batch(run_id, batch) for batch in batches)):
+                sent += ok
+                failed += bad
+
+        elapsed = round(time.monotonic() - started, 2)
+        logger.info(
+            f"Digest {run_id}: {sent} sent, {failed} failed, {skipped} already sent "
+            f"from {len(candidates)} candidates in {elapsed}s"
+        )
+        return {"run_id": run_id, "candidates": len(candidates), "sent": sent, "failed": failed,
+                "skipped": skipped, "seconds": elapsed}
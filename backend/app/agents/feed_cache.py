@@ -0,0 +1,105 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+class FetchedFeed(NamedTuple):
+    """A changed feed body plus the validators to remember once its articles are stored"""
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+
+class FeedCache:
+    """
+    Persistent per-feed HTTP validator cache.
+    Stores ETag / Last-Modified and a hash of the last body we parsed so
+    unchanged feeds can be skipped before any parsing work happens.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS feed_validators (
+                feed_url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                updated_at REAL
+            )
+            """
+        )
+        self._conn.commit()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def hash_content(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()
+
+    def get(self, feed_url: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_hash FROM feed_validators WHERE feed_url = ?",
+                (feed_url,)
+            ).fetchone()
+        if not row:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "content_hash": row[2]}
+
+    def conditional_headers(self, feed_url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a feed"""
+        entry = self.get(feed_url)
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_unchanged(self, feed_url: str, content_hash: str) -> bool:
+        entry = self.get(feed_url)
+        return bool(entry) and entry["content_hash"] == content_hash
+
+    def update(self, feed_url: str, etag: Optional[str], last_modified: Optional[str], content_hash: str):
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO feed_validators (feed_url, etag, last_modified, content_hash, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(feed_url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    updated_at = excluded.updated_at
+                """,
+                (feed_url, etag, last_modified, content_hash, time.time())
+            )
+            self._conn.commit()
+
+    def commit(self, fetched: FetchedFeed):
+        """Remember a fetch's validators; only call once its articles are persisted"""
+        self.update(fetched.url, fetched.etag, fetched.last_modified, fetched.content_hash)
+
+    def record_hit(self, feed_url: str):
+        self.stats.setdefault(feed_url, {"hits": 0, "misses": 0})["hits"] += 1
+
+    def record_miss(self, feed_url: str):
+        self.stats.setdefault(feed_url, {"hits": 0, "misses": 0})["misses"] += 1
+
+    def summary(self) -> Dict[str, int]:
+        hits = sum(s["hits"] for s in self.stats.values())
+        misses = sum(s["misses"] for s in self.stats.values())
+        return {"feeds": len(self.stats), "hits": hits, "misses": misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,207 @@
+import asyncio
+import contextlib
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import AGENT_ARTICLES_STORED, AGENT_CYCLE_SECONDS
+from app.core.profiler import SamplingProfiler
+from .scraper import run_scraping_agent
+
+logger = logging.getLogger(__name__)
+
+# Every ingestion run, scheduled or manual, holds this scheduler lock
+INGESTION_LOCK = "ingestion"
+
+# Arguments for run_scraping_agent per job kind
+JOB_KINDS = {
+    "quick": {"force_all": False},
+    "deep": {"force_all": True, "limit_factor": settings.DEEP_SCRAPE_LIMIT_FACTOR},
+}
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+
+class AgentJob:
+    """One ingestion run and its live progress, read from the pipeline while it runs"""
+
+    def __init__(self, kind: str, trigger: str, profile: bool = False):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.trigger = trigger
+        self.profile = profile
+        self.profile_summary: Optional[Dict] = None
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.stored: Optional[int] = None
+        self.error: Optional[str] = None
+        self.pipeline = None
+        # Final pipeline numbers, kept once the run ends so history doesn't pin whole pipelines
+        self._final: Optional[Dict] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED, CANCELLED)
+
+    def _pipeline_state(self) -> Optional[Dict]:
+        if self.pipeline is None:
+            return self._final
+        return {
+            "metrics": self.pipeline.metrics(),
+            "stage": self.pipeline.current_stage(),
+            "errors": [f"{stage.name}: {message}" for stage in self.pipeline.stages for message in stage.recent_errors]
+        }
+
+    def freeze(self):
+        self._final = self._pipeline_state()
+        self.pipeline = None
+
+    def snapshot(self) -> Dict:
+        progress = {"stage": None, "fetched": 0, "parsed": 0, "analyzed": 0, "stored": self.stored or 0, "errors": 0}
+        stages = {}
+        recent_errors: List[str] = []
+        state = self._pipeline_state()
+        if state is not None:
+            stages = state["metrics"]["stages"]
+            progress.update(
+                stage=state["stage"] if not self.finished else None,
+                fetched=stages["fetch"]["out"],
+                parsed=stages["parse"]["out"],
+                analyzed=stages["analyze"]["out"],
+                stored=state["metrics"]["stored"],
+                errors=sum(stage["errors"] for stage in stages.values())
+            )
+            recent_errors = list(state["errors"])
+        if self.error:
+            recent_errors.append(self.error)
+
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "trigger": self.trigger,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": round(end - self.started_at, 2) if self.started_at else None,
+            "progress": progress,
+            "stages": {
+                name: {"elapsed_seconds": stage["elapsed_seconds"], "in": stage["in"], "out": stage["out"],
+                       "errors": stage["errors"], "done": stage["done"]}
+                for name, stage in stages.items()
+            },
+            "errors": recent_errors[-20:],
+            "profile": self.profile_summary if self.profile else None
+        }
+
+class AgentJobManager:
+    """
+    Runs agent cycles as background tasks and keeps a bounded history of them.
+    Runs are serialized on the scheduler's ingestion lock, so a manual run queues
+    behind a scheduled one instead of overlapping it, and asking for a kind that
+    is already queued or running returns that job rather than starting another.
+    """
+
+    def __init__(self, scheduler, max_history: int = settings.AGENT_JOB_HISTORY):
+        self.scheduler = scheduler
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, AgentJob]" = OrderedDict()
+        # The loop only keeps weak references to tasks
+        self._tasks = set()
+
+    def _remember(self, job: AgentJob):
+        self._jobs[job.id] = job
+        # Evict the oldest finished jobs; live ones are never dropped
+        while len(self._jobs) > self.max_history:
+            oldest = next((j for j in self._jobs.values() if j.finished), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest.id]
+
+    def get(self, job_id: str) -> Optional[AgentJob]:
+        return self._jobs.get(job_id)
+
+    def recent(self, limit: int = 10) -> List[Dict]:
+        jobs = list(self._jobs.values())[-limit:]
+        return [
+            {"job_id": j.id, "kind": j.kind, "trigger": j.trigger, "status": j.status,
+             "created_at": j.created_at, "stored": j.stored}
+            for j in reversed(jobs)
+        ]
+
+    def active(self, kind: str) -> Optional[AgentJob]:
+        return next((j for j in self._jobs.values() if j.kind == kind and not j.finished), None)
+
+    def state(self) -> str:
+        """Overall agent state: running while any run, scheduled or manual, is queued or in progress"""
+        return RUNNING if any(not j.finished for j in self._jobs.values()) else "idle"
+
+    async def run(self, kind: str, trigger: str = "schedule", job: Optional[AgentJob] = None) -> int:
+        """Execute a run in the caller's task; the caller must hold the ingestion lock"""
+        if job is None:
+            job = AgentJob(kind, trigger)
+            self._remember(job)
+        job.status = RUNNING
+        job.started_at = time.time()
+        logger.info(f"Agent job {job.id} ({kind}, {job.trigger}) started")
+        profiler = SamplingProfiler(settings.PROFILE_INTERVAL_MS / 1000) if job.profile else None
+        try:
+            with profiler or contextlib.nullcontext():
+                job.stored = await run_scraping_agent(**JOB_KINDS[kind], on_pipeline=lambda p: setattr(job, "pipeline", p))
+            job.status = SUCCEEDED
+            AGENT_ARTICLES_STORED.inc(job.stored or 0, kind=kind)
+            return job.stored
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+            raise
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            raise
+        finally:
+            job.finished_at = time.time()
+            job.freeze()
+            AGENT_CYCLE_SECONDS.observe(job.finished_at - job.started_at, kind=kind, status=job.status)
+            if profiler is not None:
+                self._save_profile(job, profiler)
+            logger.info(f"Agent job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s")
+
+    def _save_profile(self, job: AgentJob, profiler: SamplingProfiler):
+        path = os.path.join(settings.PROFILE_DIR, f"agent-{job.kind}-{job.id}.folded")
+        try:
+            profiler.write(path)
+        except OSError as e:
+            logger.warning(f"Could not write profile for job {job.id}: {e}")
+            path = None
+        job.profile_summary = profiler.summary(path)
+
+    def submit(self, kind: str, profile: bool = False) -> Tuple[AgentJob, bool]:
+        """
+        Queue a manual run. Returns (job, created); created is False if one was already pending,
+        in which case `profile` has no effect.
+        """
+        existing = self.active(kind)
+        if existing:
+            return existing, False
+
+        job = AgentJob(kind, "manual", profile=profile)
+        self._remember(job)
+
+        async def execute():
+            try:
+                await self.scheduler.run_exclusive(INGESTION_LOCK, f"manual:{job.id}", lambda: self.run(kind, job=job))
+            except asyncio.CancelledError:
+                job.status = CANCELLED
+                job.finished_at = job.finished_at or time.time()
+            except Exception as e:
+                logger.error(f"Agent job {job.id} failed: {e}")
+
+        task = asyncio.create_task(execute(), name=f"agent-job:{job.id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job, True
@@ -1,5 +1,8 @@
 import re
+import hashlib
 import logging
+from collections import OrderedDict
+from typing import Iterable, List
 from langdetect import detect, DetectorFactory
 from langdetect.lang_detect_exception import LangDetectException
 
@@ -8,11 +11,70 @@ DetectorFactory.seed = 0
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; clean_text and is_english run for every feed entry
+_WHITESPACE = re.compile(r'\s+')
+_NON_ENGLISH_LETTERS = re.compile(r'[^a-zA-Z]+')
+_WORD = re.compile(r"[a-z']+")
+_HTML_TAG = re.compile(r'<[^>]+>')
+_URL = re.compile(r'http\S+')
+_SPECIAL_CHARS = re.compile(r'[^\w\s\.\,\!\?\-\:\;\(\)]')
+_ELLIPSIS = re.compile(r'\.{3,}')
+_ZERO_WIDTH = re.compile(r'\u200b')
+
+# Function words that are rare outside English; a high share of them settles the question
+_STOPWORDS = frozenset("""
+    the and of to is that for it with was are be this by from have has or an but not will
+    can which their its you we they more about how what into than been were also these our
+    your would there all when who after over just only some such
+""".split())
+
+# Texts with at least this many words and this share of stopwords skip langdetect
+STOPWORD_MIN_WORDS = 8
+STOPWORD_ACCEPT_RATIO = 0.2
+
+# langdetect cost grows with input length; a prefix is enough to identify the language
+LANGDETECT_SAMPLE_CHARS = 600
+
+# Character-ratio check runs on the same bounded prefix
+RATIO_SAMPLE_CHARS = 2000
+
 class LanguageFilter:
-    def __init__(self):
-        self.english_pattern = re.compile(r'[a-zA-Z]')
-        self.non_english_pattern = re.compile(r'[^\x00-\x7F]+')  # Non-ASCII characters
-        
+    def __init__(self, cache_size: int = 10000):
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self.stats = {"cache_hits": 0, "fast_accept": 0, "fast_reject": 0, "langdetect": 0}
+
+    def _cache_key(self, text: str, min_english_ratio: float) -> bytes:
+        digest = hashlib.blake2b(text.encode('utf-8', 'ignore'), digest_size=16).digest()
+        return digest + str(min_english_ratio).encode()
+
+    def _classify(self, text: str, min_english_ratio: float) -> bool:
+        clean_text = _WHITESPACE.sub(' ', text[:RATIO_SAMPLE_CHARS])
+
+        # Tier 1: character ratio. Failing it rules the text out regardless of langdetect
+        total_chars = len(clean_text) - clean_text.count(' ')
+        if total_chars == 0:
+            return False
+        english_chars = len(_NON_ENGLISH_LETTERS.sub('', clean_text))
+        if english_chars / total_chars < min_english_ratio:
+            self.stats["fast_reject"] += 1
+            return False
+
+        # Tier 2: stopword density decides clearly English prose
+        words = _WORD.findall(clean_text.lower())
+        if len(words) >= STOPWORD_MIN_WORDS:
+            stopwords = sum(1 for word in words if word in _STOPWORDS)
+            if stopwords / len(words) >= STOPWORD_ACCEPT_RATIO:
+                self.stats["fast_accept"] += 1
+                return True
+
+        # Tier 3: langdetect on a bounded sample
+        self.stats["langdetect"] += 1
+        try:
+            return detect(clean_text[:LANGDETECT_SAMPLE_CHARS]) == 'en'
+        except LangDetectException:
+            return False
+
     def is_english(self, text: str, min_english_ratio: float = 0.7) -> bool:
         """
         Check if text is primarily English
@@ -20,69 +82,73 @@ class LanguageFilter:
         """
         if not text or len(text.strip()) < 10:
             return False
-            
+
         try:
-            # Method 1: Character-based check
-            clean_text = re.sub(r'\s+', ' ', text.strip())
-            if len(clean_text) < 10:
-                return False
-                
-            # Count English characters
-            english_chars = len(self.english_pattern.findall(clean_text))
-            total_chars = len(clean_text.replace(' ', ''))
-            
-            if total_chars == 0:
-                return False
-                
-            english_ratio = english_chars / total_chars
-            
-            # Method 2: langdetect library
-            try:
-                detected_lang = detect(clean_text)
-                is_english_detected = detected_lang == 'en'
-            except LangDetectException:
-                is_english_detected = False
-            
-            # Combine both methods
-            return english_ratio >= min_english_ratio and is_english_detected
-            
+            text = text.strip()
+            key = self._cache_key(text, min_english_ratio)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return cached
+
+            result = self._classify(text, min_english_ratio)
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return result
+
         except Exception as e:
             logger.error(f"Error detecting language: {e}")
             return False
-    
+
     def clean_text(self, text: str) -> str:
         """
         Clean text by removing special characters and normalizing
         """
         if not text:
             return ""
-            
+
         # Remove HTML tags
-        clean = re.sub(r'<[^>]+>', '', text)
-        
+        clean = _HTML_TAG.sub('', text)
+
         # Remove URLs
-        clean = re.sub(r'http\S+', '', clean)
-        
+        clean = _URL.sub('', clean)
+
         # Remove special characters but keep basic punctuation
-        clean = re.sub(r'[^\w\s\.\,\!\?\-\:\;\(\)]', '', clean)
-        
+        clean = _SPECIAL_CHARS.sub('', clean)
+
         # Remove extra whitespace
-        clean = re.sub(r'\s+', ' ', clean).strip()
-        
+        clean = _WHITESPACE.sub(' ', clean).strip()
+
         # Remove common problematic patterns
-        clean = re.sub(r'\.{3,}', '...', clean)  # Normalize ellipsis
-        clean = re.sub(r'\u200b', '', clean)  # Remove zero-width spaces
-        
+        clean = _ELLIPSIS.sub('...', clean)  # Normalize ellipsis
+        clean = _ZERO_WIDTH.sub('', clean)  # Remove zero-width spaces
+
         return clean
-    
+
     def should_include_article(self, title: str, summary: str, min_confidence: float = 0.6) -> bool:
         """
         Determine if article should be included based on language
         """
-        combined_text = f"{title} {summary}"
-        
+        return self._should_include(f"{title} {summary}", min_confidence)
+
+    def _should_include(self, combined_text: str, min_confidence: float) -> bool:
         # Quick length check
         if len(combined_text.strip()) < 20:
             return False
-            
-        return self.is_english(combined_text, min_confidence)
\ No newline at end of file
+
+        return self.is_english(combined_text, min_confidence)
+
+    def filter_many(self, texts: Iterable[str], min_confidence: float = 0.6) -> List[bool]:
+        """
+        Batch form of should_include_article for pre-combined "title summary" texts.
+        Duplicate texts in the batch are only classified once.
+        """
+        decided = {}
+        results = []
+        for text in texts:
+            if text not in decided:
+                decided[text] = self._should_include(text, min_confidence)
+            results.append(decided[text])
+        return results
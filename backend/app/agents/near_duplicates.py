@@ -0,0 +1,245 @@
+import hashlib
+import logging
+import random
+import re
+import sqlite3
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+# 16 bands of 4 rows: stories at Jaccard 0.6 become candidates ~90% of the time, at 0.3 ~12%
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+# Below this many features a signature is mostly noise, so we don't match on it
+MIN_FEATURES = 6
+# Long summaries would drown out the headline; only their opening counts
+SUMMARY_TOKENS = 40
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+
+_token = re.compile(r'[a-z0-9]+')
+_stopwords = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the this to was what when why will with".split()
+)
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _token.findall((text or "").lower()) if t not in _stopwords]
+
+def features(title: str, summary: str = "") -> Set[str]:
+    """Unigrams and bigrams of the title plus the opening words of the summary"""
+    tokens = tokenize(title)
+    feats = set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+    feats.update(tokenize(summary)[:SUMMARY_TOKENS])
+    return feats
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def minhash(title: str, summary: str = "") -> Optional[List[int]]:
+    """
+    NUM_PERM-value MinHash signature of the story's features.
+    Returns None when there is too little text to compare reliably.
+    """
+    feats = features(title, summary)
+    if len(feats) < MIN_FEATURES:
+        return None
+    hashes = [_hash64(f) for f in feats]
+    return [min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMUTATIONS]
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+def band_buckets(signature: List[int]) -> List[int]:
+    """One bucket id per band; the band number is mixed in so buckets never collide across bands"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f">I{ROWS_PER_BAND}Q", band, *rows), digest_size=8).digest()
+        # SQLite integers are signed 64-bit
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+def _pack(signature: List[int]) -> bytes:
+    return struct.pack(f">{NUM_PERM}Q", *signature)
+
+def _unpack(blob: bytes) -> List[int]:
+    return list(struct.unpack(f">{NUM_PERM}Q", blob))
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash-LSH index of recently ingested stories.
+    Candidates are stories sharing at least one band bucket (an indexed
+    column), then the estimated Jaccard similarity decides. Skipped
+    duplicates are recorded in near_duplicate_links so the copy can be
+    traced back to the story it was folded into.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold: float = settings.NEAR_DUP_THRESHOLD,
+        window_days: float = settings.NEAR_DUP_WINDOW_DAYS
+    ):
+        self.path = path
+        self.threshold = threshold
+        self.window_seconds = window_days * 86400
+        self.stats = {"checked": 0, "duplicates": 0, "unsigned": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS near_dup_signatures (
+                url TEXT PRIMARY KEY,
+                signature BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS near_dup_buckets (
+                bucket INTEGER NOT NULL,
+                url TEXT NOT NULL
+            )
+            """
+        )
+        # Indexes built before buckets were unique may hold repeats; keep one row of each
+        self._conn.execute(
+            "DELETE FROM near_dup_buckets WHERE rowid NOT IN (SELECT MIN(rowid) FROM near_dup_buckets GROUP BY bucket, url)"
+        )
+        self._conn.execute("DROP INDEX IF EXISTS idx_near_dup_buckets_bucket")
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_near_dup_buckets_bucket_url ON near_dup_buckets (bucket, url)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_near_dup_buckets_url ON near_dup_buckets (url)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS near_duplicate_links (
+                url TEXT PRIMARY KEY,
+                duplicate_of TEXT NOT NULL,
+                similarity REAL NOT NULL,
+                detected_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def find(self, signature: List[int]) -> Optional[Tuple[str, float]]:
+        """Return (url, similarity) of the most similar indexed story at or above the threshold"""
+        buckets = band_buckets(signature)
+        since = time.time() - self.window_seconds
+        placeholders = ",".join("?" * len(buckets))
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT s.url, s.signature FROM near_dup_signatures s
+                WHERE s.created_at >= ? AND s.url IN (
+                    SELECT url FROM near_dup_buckets WHERE bucket IN ({placeholders})
+                )
+                """,
+                (since, *buckets)
+            ).fetchall()
+
+        best = None
+        for url, blob in rows:
+            score = similarity(signature, _unpack(blob))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (url, score)
+        return best
+
+    def add_many(self, signatures: Dict[str, List[int]]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO near_dup_signatures (url, signature, created_at) VALUES (?, ?, ?)",
+                [(url, _pack(sig), now) for url, sig in signatures.items()]
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO near_dup_buckets (bucket, url) VALUES (?, ?)",
+                [(bucket, url) for url, sig in signatures.items() for bucket in band_buckets(sig)]
+            )
+            self._conn.commit()
+
+    def link(self, url: str, duplicate_of: str, score: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO near_duplicate_links (url, duplicate_of, similarity, detected_at) VALUES (?, ?, ?, ?)",
+                (url, duplicate_of, score, time.time())
+            )
+            self._conn.commit()
+
+    def prune(self):
+        """Forget signatures older than the comparison window"""
+        cutoff = time.time() - self.window_seconds
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM near_dup_signatures WHERE created_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM near_dup_buckets WHERE url NOT IN (SELECT url FROM near_dup_signatures)")
+            self._conn.commit()
+        if cursor.rowcount:
+            logger.info(f"Near-duplicate index: pruned {cursor.rowcount} old signatures")
+
+class NearDuplicateFilter:
+    """
+    Per-run view over the persistent index. Stories accepted earlier in the same
+    run are matched too, before they have been stored and committed to the index.
+    """
+
+    def __init__(self, index: NearDuplicateIndex):
+        self.index = index
+        self.pending: Dict[str, List[int]] = {}
+        # check() runs in a worker thread while commit() runs on the event loop
+        self._lock = threading.Lock()
+
+    def check(self, article: Dict) -> Optional[Tuple[str, float]]:
+        """Return (original_url, similarity) if the article duplicates a known story"""
+        self.index.stats["checked"] += 1
+        signature = minhash(article["title"], article.get("summary", ""))
+        if signature is None:
+            self.index.stats["unsigned"] += 1
+            return None
+
+        best = None
+        with self._lock:
+            for url, pending in self.pending.items():
+                score = similarity(signature, pending)
+                if score >= self.index.threshold and (best is None or score > best[1]):
+                    best = (url, score)
+        if best is None:
+            best = self.index.find(signature)
+
+        if best is None:
+            with self._lock:
+                self.pending[article["url"]] = signature
+            return None
+
+        self.index.stats["duplicates"] += 1
+        self.index.link(article["url"], best[0], best[1])
+        return best
+
+    def commit(self, urls: List[str]):
+        """Index the stories that were actually stored"""
+        with self._lock:
+            signatures = {url: self.pending.pop(url) for url in urls if url in self.pending}
+        if signatures:
+            self.index.add_many(signatures)
+
+    def discard(self, urls: List[str]):
+        """Forget stories that were dropped before being stored, so they can't shadow a later copy"""
+        with self._lock:
+            for url in urls:
+                self.pending.pop(url, None)
+
+_near_duplicate_index: Optional[NearDuplicateIndex] = None
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    global _near_duplicate_index
+    if _near_duplicate_index is None:
+        _near_duplicate_index = NearDuplicateIndex(settings.NEAR_DUP_INDEX_PATH)
+        _near_duplicate_index.prune()
+    return _near_duplicate_index
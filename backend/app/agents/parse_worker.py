@@ -0,0 +1,173 @@
+import asyncio
+import feedparser
+import logging
+import time
+import dateutil.parser
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+from app.core.config import settings
+from app.core.metrics import LANGUAGE_FILTER_ENTRIES, LANGUAGE_FILTER_SECONDS, PARSE_SECONDS
+from .language_detector import LanguageFilter
+
+logger = logging.getLogger(__name__)
+
+# One filter per worker process
+_language_filter = LanguageFilter()
+
+def extract_text_from_entry(entry) -> str:
+    content = ""
+    if hasattr(entry, 'content'):
+        content = entry.content[0].value
+    elif hasattr(entry, 'summary'):
+        content = entry.summary
+    elif hasattr(entry, 'description'):
+        content = entry.description
+
+    if content:
+        soup = BeautifulSoup(content, 'html.parser')
+        return soup.get_text()
+    return ""
+
+def parse_entry_datetime(entry) -> Optional[datetime]:
+    """The entry's own publish or update time, or None when it has none we can read"""
+    try:
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            return datetime.fromtimestamp(time.mktime(entry.published_parsed))
+        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+            return datetime.fromtimestamp(time.mktime(entry.updated_parsed))
+        elif hasattr(entry, 'published'):
+            return dateutil.parser.parse(entry.published)
+        elif hasattr(entry, 'updated'):
+            return dateutil.parser.parse(entry.updated)
+    except Exception:
+        pass
+    return None
+
+def parse_date(entry) -> str:
+    """Extract and parse date from feed entry safely"""
+    return (parse_entry_datetime(entry) or datetime.now()).isoformat()
+
+def _dates(entry) -> Dict:
+    """
+    published_at is what gets stored, falling back to now; published_ts is only the
+    entry's real timestamp (or None), so undated entries don't look like a burst of posts.
+    """
+    parsed = parse_entry_datetime(entry)
+    return {
+        "published_at": (parsed or datetime.now()).isoformat(),
+        "published_ts": parsed.timestamp() if parsed else None
+    }
+
+def clean_article_content(title: str, summary: str) -> tuple[str, str]:
+    clean_title = _language_filter.clean_text(title)
+    clean_summary = _language_filter.clean_text(summary)
+
+    if len(clean_title) > 200:
+        clean_title = clean_title[:197] + "..."
+    if len(clean_summary) > 3000:
+        clean_summary = clean_summary[:2997] + "..."
+
+    return clean_title, clean_summary
+
+def _parse_feed(content: bytes, source: str, default_tag: str, limit: int = 10) -> Tuple[List[Dict], Dict]:
+    """parse_feed_bytes plus language filter stats, which the pool records on the caller's side"""
+    articles = []
+    feed = feedparser.parse(content)
+    entries = feed.entries[:limit]
+    texts = [extract_text_from_entry(entry) for entry in entries]
+
+    filter_started = time.perf_counter()
+    keep = _language_filter.filter_many(f"{entry.title} {text}" for entry, text in zip(entries, texts))
+    stats = {"filter_seconds": time.perf_counter() - filter_started, "entries": len(keep), "kept": sum(keep)}
+
+    for entry, raw_text, include in zip(entries, texts, keep):
+        if not include:
+            continue
+
+        clean_title, clean_summary = clean_article_content(entry.title, raw_text)
+
+        articles.append({
+            "title": clean_title,
+            "url": entry.link,
+            "summary": clean_summary,
+            "source": source,
+            "ecosystem_tag": default_tag,
+            **_dates(entry)
+        })
+    return articles, stats
+
+def parse_feed_bytes(content: bytes, source: str, default_tag: str, limit: int = 10) -> List[Dict]:
+    """Parse a raw feed body into cleaned, English-only article dicts"""
+    return _parse_feed(content, source, default_tag, limit)[0]
+
+def parse_arxiv_bytes(content: bytes) -> List[Dict]:
+    """Arxiv API results are already English research abstracts, so skip filtering"""
+    articles = []
+    feed = feedparser.parse(content)
+    for entry in feed.entries:
+        articles.append({
+            "title": entry.title,
+            "url": entry.link,
+            "summary": entry.summary[:500],
+            "source": "arxiv",
+            "ecosystem_tag": "research",
+            **_dates(entry)
+        })
+    return articles
+
+class ParsePool:
+    """
+    Runs feed parsing, HTML stripping and language filtering off the event loop.
+    With `inline=True` work runs in the calling thread, which keeps tests simple.
+    """
+
+    def __init__(self, workers: int = settings.PARSE_WORKERS, inline: bool = settings.PARSE_INLINE):
+        self.workers = workers
+        self.inline = inline
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.inline:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(func, *args))
+
+    async def parse_feed(self, content: bytes, source: str, default_tag: str, limit: int = 10) -> List[Dict]:
+        started = time.perf_counter()
+        articles, stats = await self._run(_parse_feed, content, source, default_tag, limit)
+        PARSE_SECONDS.observe(time.perf_counter() - started, parser="feed")
+        LANGUAGE_FILTER_SECONDS.observe(stats["filter_seconds"])
+        LANGUAGE_FILTER_ENTRIES.inc(stats["kept"], result="kept")
+        LANGUAGE_FILTER_ENTRIES.inc(stats["entries"] - stats["kept"], result="dropped")
+        return articles
+
+    async def parse_arxiv(self, content: bytes) -> List[Dict]:
+        started = time.perf_counter()
+        articles = await self._run(parse_arxiv_bytes, content)
+        PARSE_SECONDS.observe(time.perf_counter() - started, parser="arxiv")
+        return articles
+
+    def shutdown(self, wait: bool = False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+_parse_pool: Optional[ParsePool] = None
+
+def get_parse_pool() -> ParsePool:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ParsePool()
+    return _parse_pool
+
+def shutdown_parse_pool():
+    if _parse_pool is not None:
+        _parse_pool.shutdown()
@@ -0,0 +1,419 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.core.cache import feed_response_cache
+from app.core.config import settings
+from app.core.metrics import PIPELINE_STAGE_ERRORS, PIPELINE_STAGE_ITEMS, PIPELINE_STAGE_SECONDS
+from app.repositories import ArticleRepository
+from .analysis import get_analysis_executor
+from .analysis_cache import get_analysis_cache
+from .near_duplicates import NearDuplicateFilter, get_near_duplicate_index
+from .url_canonicalizer import canonicalize_url, get_redirect_resolver
+from .verifier import get_legitimacy_checker
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input; each worker consumes exactly one
+_DONE = object()
+
+class Stage:
+    """
+    One step of the ingestion pipeline: a bounded input queue drained by
+    `concurrency` workers. Handlers receive a list of up to `batch_size`
+    items and return the items to pass downstream.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        concurrency: int = 1,
+        queue_size: int = settings.PIPELINE_QUEUE_SIZE,
+        batch_size: int = 1,
+        batch_wait: float = settings.PIPELINE_BATCH_WAIT,
+        on_error: Optional[Callable[[List[Any]], None]] = None
+    ):
+        self.name = name
+        self.handler = handler
+        # Called with the batch a handler raised on, whose items are dropped
+        self.on_error = on_error
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.downstream: Optional["Stage"] = None
+        self.metrics = {"in": 0, "out": 0, "errors": 0, "batches": 0, "max_queue_depth": 0, "busy_seconds": 0.0}
+        # Wall-clock span from the first batch until the last worker exits
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.recent_errors: deque = deque(maxlen=20)
+
+    async def put(self, item):
+        # Blocks when the queue is full, which is what pushes back on upstream stages
+        await self.queue.put(item)
+        self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], self.queue.qsize())
+
+    async def _next_batch(self):
+        """Return (batch, finished). Waits up to batch_wait to fill a batch."""
+        first = await self.queue.get()
+        if first is _DONE:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _worker(self):
+        finished = False
+        while not finished:
+            batch, finished = await self._next_batch()
+            if not batch:
+                continue
+
+            self.metrics["in"] += len(batch)
+            self.metrics["batches"] += 1
+            started = time.monotonic()
+            if self.started_at is None:
+                self.started_at = started
+            try:
+                outputs = await self.handler(batch) or []
+            except Exception as e:
+                self.record_error(f"failed on {len(batch)} items: {e}")
+                if self.on_error:
+                    self.on_error(batch)
+                outputs = []
+            busy = time.monotonic() - started
+            self.metrics["busy_seconds"] += busy
+            PIPELINE_STAGE_SECONDS.observe(busy, stage=self.name)
+
+            self.metrics["out"] += len(outputs)
+            PIPELINE_STAGE_ITEMS.inc(len(batch), stage=self.name, direction="in")
+            PIPELINE_STAGE_ITEMS.inc(len(outputs), stage=self.name, direction="out")
+            if self.downstream:
+                for output in outputs:
+                    await self.downstream.put(output)
+
+    def record_error(self, message: str):
+        self.metrics["errors"] += 1
+        PIPELINE_STAGE_ERRORS.inc(stage=self.name)
+        self.recent_errors.append(message)
+        logger.error(f"Pipeline stage '{self.name}' {message}")
+
+    def start(self) -> List[asyncio.Task]:
+        return [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def close(self):
+        for _ in range(self.concurrency):
+            await self.queue.put(_DONE)
+
+    def elapsed(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return round((self.finished_at or time.monotonic()) - self.started_at, 2)
+
+    def snapshot(self) -> Dict:
+        return {
+            **self.metrics,
+            "queue_depth": self.queue.qsize(),
+            "busy_seconds": round(self.metrics["busy_seconds"], 2),
+            "elapsed_seconds": self.elapsed(),
+            "done": self.finished_at is not None
+        }
+
+def needs_analysis(article: Dict) -> bool:
+    # Only run AI if summary is missing or tag is generic
+    return article["ecosystem_tag"] == "web3" or len(article["summary"]) < 50
+
+def build_payload(article: Dict, analysis: Optional[Dict]) -> Dict:
+    ai_summary = article["summary"]
+    ai_tag = article["ecosystem_tag"]
+    # Heuristic score from the verify stage; the model's own score replaces it when there is one
+    ai_legitimacy = article.get("legitimacy_score", 0.5)
+    ai_sentiment = 5
+
+    # Anything but an object is a malformed answer; store the article without it
+    if isinstance(analysis, dict):
+        ai_summary = analysis.get("summary") or ai_summary
+        tag = analysis.get("ecosystem_tag")
+        ai_tag = tag if isinstance(tag, str) and tag else ai_tag
+        ai_legitimacy = analysis.get("legitimacy_score", ai_legitimacy)
+        ai_sentiment = analysis.get("sentiment_score", 5)
+
+    return {
+        "title": article["title"],
+        "url": article["url"],
+        "canonical_url": article["canonical_url"],
+        "source": article["source"],
+        "created_at": datetime.now().isoformat(),
+        "summary": ai_summary,
+        "ecosystem_tag": ai_tag.lower(),
+        "published_at": article["published_at"],
+        "legitimacy_score": ai_legitimacy,
+        "sentiment_score": ai_sentiment,
+        "is_processed": True
+    }
+
+class IngestionPipeline:
+    """
+    fetch -> parse/filter -> canonicalize -> dedup -> verify -> analyze -> store, connected by bounded queues.
+    Articles from fast feeds are analyzed and stored while slow feeds are still
+    downloading, and queue bounds cap how much is held in memory at once.
+    """
+
+    def __init__(self, scraper, articles: ArticleRepository, poll_scheduler=None, conditional: bool = True):
+        self.scraper = scraper
+        self.conditional = conditional
+        self.articles = articles
+        self.poll_scheduler = poll_scheduler
+        self.seen_urls = set()
+        self.near_duplicates = NearDuplicateFilter(get_near_duplicate_index())
+        self.skipped_near_duplicates = 0
+        self.skipped_low_legitimacy = 0
+        # Per changed feed: fetch validators and articles not yet stored or deliberately dropped
+        self._fetched: Dict[str, Any] = {}
+        self._unsettled: Dict[str, int] = {}
+        self._failed_feeds = set()
+        self.stored_count = 0
+        self.started_at: Optional[float] = None
+        self.first_store_seconds: Optional[float] = None
+
+        self.fetch = Stage("fetch", self._fetch, concurrency=settings.PIPELINE_FETCH_CONCURRENCY, batch_wait=0)
+        self.parse = Stage("parse", self._parse, concurrency=settings.PARSE_WORKERS, batch_wait=0)
+        self.canonicalize = Stage(
+            "canonicalize", self._canonicalize, batch_size=settings.PIPELINE_BATCH_SIZE, on_error=self._fail_articles
+        )
+        self.dedup = Stage("dedup", self._dedup, batch_size=settings.PIPELINE_BATCH_SIZE, on_error=self._fail_articles)
+        self.verify = Stage("verify", self._verify, batch_size=settings.PIPELINE_BATCH_SIZE, on_error=self._fail_articles)
+        self.analyze = Stage(
+            "analyze", self._analyze,
+            concurrency=settings.PIPELINE_ANALYZE_CONCURRENCY,
+            batch_size=settings.ANALYSIS_BATCH_SIZE,
+            on_error=self._fail_articles
+        )
+        self.store = Stage(
+            "store", self._store, batch_size=settings.PIPELINE_BATCH_SIZE,
+            on_error=self._fail_payloads
+        )
+        self.stages = [self.fetch, self.parse, self.canonicalize, self.dedup, self.verify, self.analyze, self.store]
+        for upstream, downstream in zip(self.stages, self.stages[1:]):
+            upstream.downstream = downstream
+
+    def _settle_feeds(self, feed_urls, ok: bool = True):
+        """
+        Account for articles that were stored or deliberately dropped (ok) or lost to
+        an error (not ok). Once every article of a feed is settled, its validators are
+        committed, unless one was lost; then the next poll fetches the feed again.
+        """
+        for feed_url in feed_urls:
+            if not ok:
+                self._failed_feeds.add(feed_url)
+            self._unsettled[feed_url] -= 1
+            if self._unsettled[feed_url] == 0:
+                self._finish_feed(feed_url)
+
+    def _finish_feed(self, feed_url: str):
+        del self._unsettled[feed_url]
+        fetched = self._fetched.pop(feed_url)
+        if feed_url not in self._failed_feeds:
+            self.scraper.feed_cache.commit(fetched)
+
+    def _fail_articles(self, articles):
+        self.near_duplicates.discard([a["url"] for a in articles])
+        self._settle_feeds([a["feed_url"] for a in articles], ok=False)
+
+    def _fail_payloads(self, items):
+        self.near_duplicates.discard([payload["url"] for _, payload in items])
+        self._settle_feeds([feed for feed, _ in items], ok=False)
+
+    async def _fetch(self, specs):
+        outputs = []
+        for spec in specs:
+            try:
+                fetched = await self.scraper.fetch_feed(spec.url, conditional=self.conditional, source=spec.source)
+            except Exception as e:
+                self.fetch.record_error(f"error scraping {spec.url}: {e}")
+                continue
+            if fetched is not None:
+                outputs.append((spec, fetched))
+            elif self.poll_scheduler:
+                self.poll_scheduler.record_unchanged(spec)
+        return outputs
+
+    async def _parse(self, items):
+        articles = []
+        for spec, fetched in items:
+            try:
+                parsed = await self.scraper.parse_content(spec, fetched.body)
+            except Exception as e:
+                self.parse.record_error(f"error parsing {spec.url}: {e}")
+                continue
+            if self.poll_scheduler:
+                self.poll_scheduler.record_entries(spec, [a["published_ts"] for a in parsed])
+            for article in parsed:
+                article["feed_url"] = fetched.url
+            self._fetched[fetched.url] = fetched
+            self._unsettled[fetched.url] = len(parsed)
+            if not parsed:
+                self._finish_feed(fetched.url)
+            articles.extend(parsed)
+        return articles
+
+    async def _canonicalize(self, articles):
+        """Unwrap redirect links to the publisher's URL and derive the dedup key from it"""
+        targets = await get_redirect_resolver().resolve_many(self.scraper.session, [a["url"] for a in articles])
+        for article in articles:
+            article["url"] = targets.get(article["url"], article["url"])
+            article["canonical_url"] = canonicalize_url(article["url"])
+        return articles
+
+    async def _dedup(self, articles):
+        fresh = []
+        for article in articles:
+            if article["canonical_url"] not in self.seen_urls:
+                self.seen_urls.add(article["canonical_url"])
+                fresh.append(article)
+        kept = []
+        if fresh:
+            existing = await self.articles.existing_urls([a["canonical_url"] for a in fresh])
+            kept = await asyncio.to_thread(
+                self._drop_near_duplicates, [a for a in fresh if a["canonical_url"] not in existing]
+            )
+        kept_ids = {id(a) for a in kept}
+        self._settle_feeds([a["feed_url"] for a in articles if id(a) not in kept_ids])
+        return kept
+
+    def _drop_near_duplicates(self, articles):
+        """Same story from another source: skip it before it costs an LLM call and a row"""
+        kept = []
+        for article in articles:
+            match = self.near_duplicates.check(article)
+            if match:
+                self.skipped_near_duplicates += 1
+                logger.info(f"Near-duplicate skipped: {article['url']} ~ {match[0]} (similarity {match[1]:.2f})")
+            else:
+                kept.append(article)
+        return kept
+
+    async def _verify(self, articles):
+        """Score legitimacy heuristically and drop clear spam before it costs an LLM call"""
+        kept = []
+        for article, score in zip(articles, get_legitimacy_checker().score_many(articles)):
+            if score < settings.LEGITIMACY_MIN_SCORE:
+                self.skipped_low_legitimacy += 1
+                logger.info(f"Low legitimacy skipped: {article['url']} (score {score:.2f})")
+                self.near_duplicates.discard([article["url"]])
+                self._settle_feeds([article["feed_url"]])
+                continue
+            article["legitimacy_score"] = score
+            kept.append(article)
+        return kept
+
+    async def _analyze(self, articles):
+        needs_ai = [a for a in articles if needs_analysis(a)]
+        analyses = await get_analysis_executor().analyze_many(
+            [(a["title"], f"{a['title']}\n\n{a['summary']}") for a in needs_ai]
+        )
+        analysis_by_url = {a["url"]: result for a, result in zip(needs_ai, analyses)}
+        # The feed travels beside the payload, which must only hold article columns
+        outputs = []
+        for article in articles:
+            try:
+                payload = build_payload(article, analysis_by_url.get(article["url"]))
+            except Exception as e:
+                # One bad answer shouldn't cost the rest of the batch
+                self.analyze.record_error(f"bad analysis for {article['url']}: {e}")
+                payload = build_payload(article, None)
+            outputs.append((article["feed_url"], payload))
+        return outputs
+
+    async def _store(self, items):
+        payloads = [payload for _, payload in items]
+        stored_rows, failures = await self.articles.store_many(payloads)
+        for failure in failures:
+            self.store.record_error(f"DB ERROR for {failure['url']}: {failure['error']}")
+        failed_urls = {failure["url"] for failure in failures}
+        # Rows skipped as duplicates by the upsert count as stored
+        self._settle_feeds([feed for feed, payload in items if payload["url"] not in failed_urls])
+        self._settle_feeds([feed for feed, payload in items if payload["url"] in failed_urls], ok=False)
+        self.near_duplicates.discard(list(failed_urls))
+        self.near_duplicates.commit([row["url"] for row in stored_rows if row.get("url")])
+        if stored_rows:
+            # New rows change what /feed returns
+            feed_response_cache.invalidate()
+            if self.first_store_seconds is None:
+                self.first_store_seconds = round(time.monotonic() - self.started_at, 2)
+        self.stored_count += len(stored_rows)
+        return stored_rows
+
+    async def run(self, specs) -> int:
+        """Push every spec through the pipeline and return the number of rows stored"""
+        self.started_at = time.monotonic()
+        workers = {stage.name: stage.start() for stage in self.stages}
+
+        try:
+            for spec in specs:
+                await self.fetch.put(spec)
+
+            # Drain stage by stage: once a stage's workers exit, nothing more can reach the next one
+            for stage in self.stages:
+                await stage.close()
+                await asyncio.gather(*workers[stage.name])
+                stage.finished_at = time.monotonic()
+        finally:
+            # On cancellation or error, later stages' workers must not keep writing after run() returns
+            unfinished = [task for tasks in workers.values() for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+        return self.stored_count
+
+    def current_stage(self) -> Optional[str]:
+        """Earliest stage still running; stages overlap, but they finish in order"""
+        for stage in self.stages:
+            if stage.finished_at is None:
+                return stage.name
+        return None
+
+    def metrics(self) -> Dict:
+        return {
+            "stages": {stage.name: stage.snapshot() for stage in self.stages},
+            "stored": self.stored_count,
+            "near_duplicates_skipped": self.skipped_near_duplicates,
+            "low_legitimacy_skipped": self.skipped_low_legitimacy,
+            "first_store_seconds": self.first_store_seconds,
+            "elapsed_seconds": round(time.monotonic() - self.started_at, 2) if self.started_at else None
+        }
+
+    def log_summary(self):
+        metrics = self.metrics()
+        for name, stage in metrics["stages"].items():
+            logger.info(
+                f"Pipeline [{name}] in={stage['in']} out={stage['out']} errors={stage['errors']} "
+                f"max_queue={stage['max_queue_depth']} busy={stage['busy_seconds']}s"
+            )
+        logger.info(
+            f"Pipeline: stored {metrics['stored']} in {metrics['elapsed_seconds']}s "
+            f"(first article stored after {metrics['first_store_seconds']}s, "
+            f"{metrics['near_duplicates_skipped']} near-duplicates and "
+            f"{metrics['low_legitimacy_skipped']} low-legitimacy articles skipped)"
+        )
+        cache_stats = get_analysis_cache().stats()
+        logger.info(
+            f"Analysis cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"(hit rate {cache_stats['hit_rate']:.0%}, {cache_stats['entries']} entries)"
+        )
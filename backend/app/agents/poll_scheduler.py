@@ -0,0 +1,167 @@
+import logging
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from app.core.config import settings
+from .sources import FeedSpec
+
+logger = logging.getLogger(__name__)
+
+class AdaptivePollScheduler:
+    """
+    Decides which feeds are due on each tick.
+    Each feed's poll interval follows the gap between its entries' publish
+    times (smoothed with an EWMA), grows when polls come back unchanged, and
+    is jittered so fetches spread out instead of bursting together.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        min_interval_minutes: float = settings.POLL_MIN_INTERVAL_MINUTES,
+        max_interval_minutes: float = settings.POLL_MAX_INTERVAL_MINUTES,
+        interval_factor: float = settings.POLL_INTERVAL_FACTOR,
+        smoothing: float = 0.3,
+        unchanged_backoff: float = 1.5,
+        jitter: float = 0.25
+    ):
+        self.min_interval = min_interval_minutes * 60
+        self.max_interval = max_interval_minutes * 60
+        self.interval_factor = interval_factor
+        self.smoothing = smoothing
+        self.unchanged_backoff = unchanged_backoff
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS feed_schedule (
+                feed_url TEXT PRIMARY KEY,
+                interval_seconds REAL NOT NULL,
+                entry_gap_seconds REAL,
+                last_polled REAL,
+                next_due REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def _bounds(self, spec: FeedSpec):
+        low = spec.min_interval_minutes * 60 if spec.min_interval_minutes else self.min_interval
+        high = spec.max_interval_minutes * 60 if spec.max_interval_minutes else self.max_interval
+        return low, high
+
+    def _state(self, feed_url: str) -> Optional[Dict]:
+        row = self._conn.execute(
+            "SELECT interval_seconds, entry_gap_seconds, last_polled, next_due FROM feed_schedule WHERE feed_url = ?",
+            (feed_url,)
+        ).fetchone()
+        if not row:
+            return None
+        return {"interval": row[0], "entry_gap": row[1], "last_polled": row[2], "next_due": row[3]}
+
+    def _save(self, feed_url: str, interval: float, entry_gap: Optional[float], last_polled: Optional[float], next_due: float):
+        self._conn.execute(
+            """
+            INSERT INTO feed_schedule (feed_url, interval_seconds, entry_gap_seconds, last_polled, next_due)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(feed_url) DO UPDATE SET
+                interval_seconds = excluded.interval_seconds,
+                entry_gap_seconds = excluded.entry_gap_seconds,
+                last_polled = excluded.last_polled,
+                next_due = excluded.next_due
+            """,
+            (feed_url, interval, entry_gap, last_polled, next_due)
+        )
+        self._conn.commit()
+
+    def _next_due(self, now: float, interval: float) -> float:
+        return now + interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def due(self, specs: List[FeedSpec], now: Optional[float] = None) -> List[FeedSpec]:
+        """
+        Return the feeds due for a poll and reserve them until their next interval,
+        so a feed whose outcome never gets recorded is not hammered every tick.
+        """
+        now = now or time.time()
+        selected = []
+        with self._lock:
+            for spec in specs:
+                state = self._state(spec.url)
+                if state and state["next_due"] > now:
+                    continue
+                low, _ = self._bounds(spec)
+                interval = state["interval"] if state else low
+                entry_gap = state["entry_gap"] if state else None
+                self._save(spec.url, interval, entry_gap, now, self._next_due(now, interval))
+                selected.append(spec)
+        return selected
+
+    def record_unchanged(self, spec: FeedSpec, now: Optional[float] = None):
+        """Nothing new (304 or identical body): poll this feed less often"""
+        now = now or time.time()
+        low, high = self._bounds(spec)
+        with self._lock:
+            state = self._state(spec.url)
+            interval = state["interval"] if state else low
+            interval = min(high, max(low, interval * self.unchanged_backoff))
+            entry_gap = state["entry_gap"] if state else None
+            self._save(spec.url, interval, entry_gap, now, self._next_due(now, interval))
+
+    def _record_changed(self, spec: FeedSpec, low: float, high: float, now: float):
+        """
+        The feed changed but gave no usable publish times: keep the current interval.
+        Shrinking it here would walk quiet, undated feeds down to the minimum.
+        """
+        with self._lock:
+            state = self._state(spec.url)
+            interval = state["interval"] if state else low
+            interval = min(high, max(low, interval))
+            entry_gap = state["entry_gap"] if state else None
+            self._save(spec.url, interval, entry_gap, now, self._next_due(now, interval))
+
+    def record_entries(self, spec: FeedSpec, published_ts: List[Optional[float]], now: Optional[float] = None):
+        """
+        Learn the feed's update rate from the publish times of the entries it served.
+        Undated entries are passed as None and ignored.
+        """
+        now = now or time.time()
+        timestamps = [value for value in published_ts if value is not None]
+
+        low, high = self._bounds(spec)
+        if len(timestamps) < 2:
+            self._record_changed(spec, low, high, now)
+            return
+
+        timestamps.sort()
+        observed_gap = (timestamps[-1] - timestamps[0]) / (len(timestamps) - 1)
+
+        with self._lock:
+            state = self._state(spec.url)
+            previous_gap = state["entry_gap"] if state else None
+            if previous_gap is None:
+                entry_gap = observed_gap
+            else:
+                entry_gap = self.smoothing * observed_gap + (1 - self.smoothing) * previous_gap
+            interval = min(high, max(low, entry_gap * self.interval_factor))
+            self._save(spec.url, interval, entry_gap, now, self._next_due(now, interval))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT feed_url, interval_seconds, entry_gap_seconds, next_due FROM feed_schedule"
+            ).fetchall()
+        return {
+            url: {"interval_minutes": round(interval / 60, 1), "entry_gap_minutes": round(gap / 60, 1) if gap else None, "next_due": next_due}
+            for url, interval, gap, next_due in rows
+        }
+
+_poll_scheduler: Optional[AdaptivePollScheduler] = None
+
+def get_poll_scheduler() -> AdaptivePollScheduler:
+    global _poll_scheduler
+    if _poll_scheduler is None:
+        _poll_scheduler = AdaptivePollScheduler(settings.POLL_STATE_PATH)
+    return _poll_scheduler
@@ -1,23 +1,38 @@
 import google.generativeai as genai
 import json
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
 from ..core.config import settings
+from ..core.metrics import LLM_REQUEST_SECONDS, LLM_REQUESTS
+from .analysis_cache import content_key, get_analysis_cache
 
 # Configure Gemini 1.5 Flash (Free & Fast)
 genai.configure(api_key=settings.GOOGLE_API_KEY)
 
-def analyze_content(title, raw_text):
-    """
-    Analyzes text and maps it to the User's specific Database Schema.
-    """
-    try:
-        model = genai.GenerativeModel('models/gemini-flash-latest')
-        
-        prompt = f"""
+MODEL_NAME = 'models/gemini-flash-latest'
+# Bump whenever build_prompt changes so cached results from the old prompt are ignored
+PROMPT_VERSION = "1"
+
+# Fallback data matching your schema
+FALLBACK_ANALYSIS = {
+    "summary": "Analysis unavailable.",
+    "sentiment_score": 5,
+    "ecosystem_tag": "General",
+    "legitimacy_score": 0.5
+}
+
+ECOSYSTEM_TAGS = ["Ethereum", "Solana", "Base", "DeFi", "NFT", "Regulation", "General"]
+
+# Characters of article text sent to the model
+CONTENT_LIMIT = 4000
+
+def build_prompt(title, raw_text):
+    return f"""
         You are Lexi, a Web3 Intelligence Agent. Analyze this article.
-        
+
         Title: {title}
-        Content: {raw_text[:4000]} (truncated)
-        
+        Content: {raw_text[:CONTENT_LIMIT]} (truncated)
+
         Respond ONLY with a valid JSON object containing:
         1. "summary": A 2-sentence summary.
         2. "sentiment_score": Integer 1-10 (1=Bearish, 10=Bullish).
@@ -25,16 +40,130 @@ def analyze_content(title, raw_text):
         4. "legitimacy_score": Float 0.0 to 1.0 (0.0 = Scam/Spam, 1.0 = Highly Trusted Source).
         """
 
-        response = model.generate_content(prompt)
-        clean_text = response.text.replace("```json", "").replace("```", "").strip()
-        return json.loads(clean_text)
-        
+def _article_block(article_id, title, raw_text):
+    return f"""
+        [id: {article_id}]
+        Title: {title}
+        Content: {raw_text[:CONTENT_LIMIT]} (truncated)
+"""
+
+def build_batch_prompt(items: List[Tuple[str, str, str]]):
+    """Prompt for several (id, title, raw_text) articles answered as one JSON array"""
+    blocks = "".join(_article_block(article_id, title, raw_text) for article_id, title, raw_text in items)
+    return f"""
+        You are Lexi, a Web3 Intelligence Agent. Analyze each of the {len(items)} articles below independently.
+        {blocks}
+        Respond ONLY with a valid JSON array containing one object per article, each with:
+        0. "id": The article id exactly as given in brackets.
+        1. "summary": A 2-sentence summary.
+        2. "sentiment_score": Integer 1-10 (1=Bearish, 10=Bullish).
+        3. "ecosystem_tag": One of [Ethereum, Solana, Base, DeFi, NFT, Regulation, General].
+        4. "legitimacy_score": Float 0.0 to 1.0 (0.0 = Scam/Spam, 1.0 = Highly Trusted Source).
+        """
+
+def estimate_tokens(text: str) -> int:
+    """Cheap ~4 chars/token estimate, good enough for quota pacing"""
+    return len(text) // 4 + 1
+
+def pack_batches(items: List[Tuple[str, str, str]], max_items: int, token_budget: int) -> Iterable[List[Tuple[str, str, str]]]:
+    """Greedily group (id, title, raw_text) items into batches under a prompt token budget"""
+    batch, batch_tokens = [], 0
+    for item in items:
+        cost = estimate_tokens(_article_block(*item))
+        if batch and (len(batch) >= max_items or batch_tokens + cost > token_budget):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(item)
+        batch_tokens += cost
+    if batch:
+        yield batch
+
+def cache_key(title, raw_text):
+    # Only the first CONTENT_LIMIT chars reach the prompt, so only they belong in the key
+    return content_key(MODEL_NAME, PROMPT_VERSION, title, raw_text[:CONTENT_LIMIT])
+
+def _strip_fences(text):
+    return text.replace("```json", "").replace("```", "").strip()
+
+def parse_response(text):
+    return json.loads(_strip_fences(text))
+
+def parse_batch_response(text) -> Dict[str, Dict]:
+    """Map article id -> analysis object; anything not shaped like that is dropped"""
+    data = json.loads(_strip_fences(text))
+    if not isinstance(data, list):
+        return {}
+    return {str(obj["id"]): obj for obj in data if isinstance(obj, dict) and "id" in obj}
+
+def validate_analysis(result) -> bool:
+    """Check an analysis object against the schema the agent stores"""
+    if not isinstance(result, dict):
+        return False
+    summary = result.get("summary")
+    sentiment = result.get("sentiment_score")
+    tag = result.get("ecosystem_tag")
+    legitimacy = result.get("legitimacy_score")
+    return (
+        isinstance(summary, str) and bool(summary.strip())
+        and isinstance(sentiment, (int, float)) and not isinstance(sentiment, bool) and 1 <= sentiment <= 10
+        and isinstance(tag, str) and tag.lower() in {t.lower() for t in ECOSYSTEM_TAGS}
+        and isinstance(legitimacy, (int, float)) and not isinstance(legitimacy, bool) and 0.0 <= legitimacy <= 1.0
+    )
+
+def cached_analysis(title, raw_text) -> Optional[Dict]:
+    """
+    Cache lookup that treats entries failing validate_analysis as misses, so
+    answers cached before they were checked can't keep breaking a batch.
+    """
+    cached = get_analysis_cache().get(cache_key(title, raw_text))
+    return cached if validate_analysis(cached) else None
+
+def remember_analysis(title, raw_text, result) -> bool:
+    """Cache a result only if it passes validate_analysis; returns whether it did"""
+    if not validate_analysis(result):
+        return False
+    get_analysis_cache().set(cache_key(title, raw_text), result)
+    return True
+
+def analyze_content(title, raw_text):
+    """
+    Analyzes text and maps it to the User's specific Database Schema.
+    """
+    cached = cached_analysis(title, raw_text)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
+    try:
+        model = genai.GenerativeModel(MODEL_NAME)
+        response = model.generate_content(build_prompt(title, raw_text))
+        result = parse_response(response.text)
+        LLM_REQUESTS.inc(call="single", outcome="ok")
+        if not remember_analysis(title, raw_text, result):
+            print(f"Agent Error: analysis for '{title[:60]}' doesn't match the schema")
+            return dict(FALLBACK_ANALYSIS)
+        return result
+
     except Exception as e:
+        LLM_REQUESTS.inc(call="single", outcome="error")
         print(f"Agent Error: {e}")
-        # Fallback data matching your schema
-        return {
-            "summary": "Analysis unavailable.",
-            "sentiment_score": 5,
-            "ecosystem_tag": "General",
-            "legitimacy_score": 0.5
-        }
\ No newline at end of file
+        return dict(FALLBACK_ANALYSIS)
+    finally:
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, call="single")
+
+async def request_analysis(title, raw_text):
+    """
+    Async, non-blocking variant of analyze_content.
+    Raises on API or parse errors so callers can decide whether to retry.
+    Caching is left to the caller (see AnalysisExecutor).
+    """
+    model = genai.GenerativeModel(MODEL_NAME)
+    response = await model.generate_content_async(build_prompt(title, raw_text))
+    return parse_response(response.text)
+
+
+async def request_batch_analysis(items: List[Tuple[str, str, str]]) -> Dict[str, Dict]:
+    """Async batch request for (id, title, raw_text) items; returns id -> raw answer"""
+    model = genai.GenerativeModel(MODEL_NAME)
+    response = await model.generate_content_async(build_batch_prompt(items))
+    return parse_batch_response(response.text)
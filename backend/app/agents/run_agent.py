@@ -1,18 +1,16 @@
 import asyncio
-import schedule
-import time
-from app.agents.scraper import run_scraping_agent
+from app.agents.runner import start_scheduler, stop_scheduler
 
 async def main():
-    await run_scraping_agent()
-
-def job():
-    asyncio.run(main())
-
-# Schedule to run every 30 minutes
-schedule.every(30).minutes.do(job)
+    # Same jobs as the API process: quick polls of due feeds plus periodic deep scrapes
+    start_scheduler()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop_scheduler()
 
 if __name__ == "__main__":
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
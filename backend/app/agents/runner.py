@@ -1,15 +1,10 @@
-import socket
-old_getaddrinfo = socket.getaddrinfo
-def new_getaddrinfo(*args, **kwargs):
-    responses = old_getaddrinfo(*args, **kwargs)
-    return [response for response in responses if response[0] == socket.AF_INET]
-socket.getaddrinfo = new_getaddrinfo
-
-import asyncio
-import schedule
-import time
 import logging
+from typing import Optional
+from .jobs import INGESTION_LOCK, AgentJobManager
+from .scheduler import AsyncScheduler, Job, MISFIRE_RUN_ONCE, MISFIRE_SKIP
 from .scraper import run_scraping_agent
+from app.core.config import settings
+from app.core.metrics import registry
 
 # Set up logging
 logging.basicConfig(
@@ -22,11 +17,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-async def run_agent():
+async def run_agent(force_all: bool = False, limit_factor: int = 1):
     """Run the real content scraping agent once"""
     try:
         logger.info("Starting REAL content scraping agent...")
-        stored_count = await run_scraping_agent()
+        stored_count = await run_scraping_agent(force_all=force_all, limit_factor=limit_factor)
         
         if stored_count > 0:
             logger.info(f"Real content scraping completed - stored {stored_count} new articles")
@@ -39,25 +34,71 @@ async def run_agent():
         logger.error(f"Error in real scraping agent: {e}")
         return 0
 
-def scheduled_job():
-    """Wrapper for scheduled jobs"""
-    return asyncio.create_task(run_agent())
-
-def start_scheduler():
-    """Start the scheduled agent for real content"""
-    # Run immediately on startup
-    asyncio.create_task(run_agent())
-    
-    # Schedule regular runs
-    schedule.every(30).minutes.do(scheduled_job)  # Quick updates
-    schedule.every(6).hours.do(scheduled_job)     # Deep scrape
-    
+async def quick_scrape():
+    """Poll only the feeds the adaptive poll scheduler says are due"""
+    return await get_job_manager().run("quick")
+
+async def deep_scrape():
+    """Sweep every registered feed, unconditionally, reading further back in each"""
+    return await get_job_manager().run("deep")
+
+_scheduler: Optional[AsyncScheduler] = None
+_job_manager: Optional[AgentJobManager] = None
+
+def get_job_manager() -> AgentJobManager:
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = AgentJobManager(get_scheduler())
+    return _job_manager
+
+def get_scheduler() -> AsyncScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = AsyncScheduler()
+        # Both jobs write the same tables, so they share one single-flight lock
+        _scheduler.add_job(Job(
+            "quick", quick_scrape,
+            interval_seconds=settings.POLL_TICK_MINUTES * 60,
+            jitter=settings.SCHEDULER_JITTER,
+            misfire=MISFIRE_SKIP,  # the next tick picks up anything due anyway
+            misfire_grace=settings.SCHEDULER_MISFIRE_GRACE_SECONDS,
+            lock_key=INGESTION_LOCK
+        ))
+        _scheduler.add_job(Job(
+            "deep", deep_scrape,
+            interval_seconds=settings.DEEP_SCRAPE_INTERVAL_HOURS * 3600,
+            jitter=settings.SCHEDULER_JITTER,
+            misfire=MISFIRE_RUN_ONCE,
+            misfire_grace=settings.SCHEDULER_MISFIRE_GRACE_SECONDS,
+            run_on_start=True,
+            lock_key=INGESTION_LOCK,
+            wait_if_busy=True  # rare and wide; worth waiting out a quick poll for
+        ))
+    return _scheduler
+
+def _scheduler_counts():
+    if _scheduler is None:
+        return {}
+    return {
+        (name, stat): job.stats[stat]
+        for name, job in _scheduler.jobs.items()
+        for stat in ("runs", "skipped_busy", "skipped_misfire", "errors")
+    }
+
+registry.gauge(
+    "lexi_scheduler_job_events", "Scheduled job runs, skipped slots and errors since startup",
+    ["job", "event"], function=_scheduler_counts
+)
+
+def start_scheduler() -> AsyncScheduler:
+    """Start the agent's jobs on the running event loop; a deep scrape runs right away"""
+    scheduler = get_scheduler()
+    scheduler.start()
     logger.info("Real content agent scheduler started")
-    logger.info("   - Running every 30 minutes for quick updates")
-    logger.info("   - Deep scrape every 6 hours")
-
-async def run_scheduler():
-    """Run the scheduler in background"""
-    while True:
-        schedule.run_pending()
-        await asyncio.sleep(60)  # Check every minute
\ No newline at end of file
+    logger.info(f"   - Checking for due feeds every {settings.POLL_TICK_MINUTES} minutes")
+    logger.info(f"   - Deep scrape every {settings.DEEP_SCRAPE_INTERVAL_HOURS} hours")
+    return scheduler
+
+async def stop_scheduler():
+    if _scheduler is not None:
+        await _scheduler.shutdown()
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Missed-run policies, applied when a job wakes up later than misfire_grace after its due time
+MISFIRE_SKIP = "skip"        # drop the late run and wait for the next slot
+MISFIRE_RUN_ONCE = "run_once"  # run once now, however many slots were missed
+
+class JobBusy(Exception):
+    """Raised by trigger() when the job (or one sharing its lock) is already running"""
+
+class Job:
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval_seconds: float,
+        jitter: float = 0.1,
+        misfire: str = MISFIRE_RUN_ONCE,
+        misfire_grace: float = 300,
+        run_on_start: bool = False,
+        lock_key: Optional[str] = None,
+        wait_if_busy: bool = False
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval_seconds
+        self.jitter = jitter
+        self.misfire = misfire
+        self.misfire_grace = misfire_grace
+        self.run_on_start = run_on_start
+        # Jobs with the same lock_key never run at the same time
+        self.lock_key = lock_key or name
+        # Queue behind a running job instead of skipping this slot
+        self.wait_if_busy = wait_if_busy
+        self.stats = {"runs": 0, "skipped_busy": 0, "skipped_misfire": 0, "errors": 0, "last_duration": None}
+        self.last_started: Optional[float] = None
+        self.next_due: Optional[float] = None
+
+    def delay(self) -> float:
+        """Seconds until the next run; jitter spreads jobs so they don't fire in lockstep"""
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+class AsyncScheduler:
+    """
+    Runs coroutine jobs on intervals inside the app's event loop.
+    Each job has a single-flight lock (shared by lock_key), so a tick that comes
+    due while the previous run is still going is skipped instead of stacking up.
+    Manual triggers go through the same locks.
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._loops: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+
+    def add_job(self, job: Job):
+        self.jobs[job.name] = job
+
+    def _lock(self, job: Job) -> asyncio.Lock:
+        return self.lock_for(job.lock_key)
+
+    def lock_for(self, lock_key: str) -> asyncio.Lock:
+        if lock_key not in self._locks:
+            self._locks[lock_key] = asyncio.Lock()
+        return self._locks[lock_key]
+
+    def is_busy(self, name: str) -> bool:
+        return self._lock(self.jobs[name]).locked()
+
+    async def _execute(self, job: Job):
+        job.last_started = time.time()
+        started = time.monotonic()
+        try:
+            return await job.func()
+        except Exception as e:
+            job.stats["errors"] += 1
+            logger.error(f"Scheduled job '{job.name}' failed: {e}")
+        finally:
+            job.stats["runs"] += 1
+            job.stats["last_duration"] = round(time.monotonic() - started, 2)
+
+    async def _run_locked(self, job: Job, wait: bool = False):
+        lock = self._lock(job)
+        # No await between the check and acquire, so this can't race within the loop
+        if lock.locked() and not wait:
+            job.stats["skipped_busy"] += 1
+            logger.info(f"Scheduler: '{job.name}' skipped, '{job.lock_key}' is still running")
+            return None
+        async with lock:
+            task = asyncio.current_task()
+            self._running[job.name] = task
+            try:
+                return await self._execute(job)
+            finally:
+                self._running.pop(job.name, None)
+
+    async def run_exclusive(self, lock_key: str, name: str, func: Callable[[], Awaitable]):
+        """
+        Run func under a job lock, waiting for any run holding it. Used for work
+        queued outside the schedule; it is cancelled on shutdown like scheduled runs.
+        """
+        self._running[name] = asyncio.current_task()
+        try:
+            async with self.lock_for(lock_key):
+                return await func()
+        finally:
+            self._running.pop(name, None)
+
+    def trigger(self, name: str) -> asyncio.Task:
+        """Start a job now, outside its schedule. Raises JobBusy instead of running it twice."""
+        job = self.jobs[name]
+        if self._lock(job).locked():
+            raise JobBusy(job.lock_key)
+        return asyncio.create_task(self._run_locked(job))
+
+    async def _loop(self, job: Job):
+        if not job.run_on_start:
+            job.next_due = time.monotonic() + job.delay()
+        else:
+            job.next_due = time.monotonic()
+
+        while True:
+            await asyncio.sleep(max(0.0, job.next_due - time.monotonic()))
+            late = time.monotonic() - job.next_due
+            # Suspended host, blocked loop or a long previous run: decide whether to catch up
+            if late > job.misfire_grace and job.misfire == MISFIRE_SKIP:
+                job.stats["skipped_misfire"] += 1
+                logger.info(f"Scheduler: '{job.name}' missed its slot by {late:.0f}s, skipping")
+            else:
+                await self._run_locked(job, wait=job.wait_if_busy)
+            job.next_due = time.monotonic() + job.delay()
+
+    def start(self):
+        for job in self.jobs.values():
+            self._loops.append(asyncio.create_task(self._loop(job), name=f"scheduler:{job.name}"))
+            logger.info(f"Scheduler: '{job.name}' every {job.interval / 60:.0f} min (±{job.jitter:.0%})")
+
+    async def shutdown(self, timeout: float = 10):
+        """Stop scheduling, then cancel runs still in flight"""
+        tasks = self._loops + list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        self._loops = []
+        self._running = {}
+        logger.info("Scheduler stopped")
+
+    def snapshot(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        return {
+            name: {
+                **job.stats,
+                "interval_minutes": round(job.interval / 60, 1),
+                "running": self._lock(job).locked(),
+                "last_started": job.last_started,
+                "next_run_in_seconds": round(job.next_due - now) if job.next_due else None
+            }
+            for name, job in self.jobs.items()
+        }
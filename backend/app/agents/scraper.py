@@ -1,287 +1,152 @@
-import aiohttp
-import asyncio
-import feedparser
-import socket
 import logging
 import time
-import dateutil.parser
-from datetime import datetime
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from typing import Callable, List, Dict, Optional
+from urllib.parse import urlparse
 from app.core.config import settings
-from .language_detector import LanguageFilter
-from supabase import create_client 
-from .processor import analyze_content
+from app.core.database import get_database
+from app.core.http_client import SharedHttpClient, get_http_client
+from app.core.metrics import FEED_FETCH_BYTES, FEED_FETCH_RESULTS, FEED_FETCH_SECONDS
+from app.repositories import ArticleRepository
+from .feed_cache import FeedCache, FetchedFeed
+from .parse_worker import ParsePool, clean_article_content, get_parse_pool
+from .poll_scheduler import get_poll_scheduler
+from .sources import FeedSpec, get_sources
+from .pipeline import IngestionPipeline
 
 logger = logging.getLogger(__name__)
 
+_feed_cache: Optional[FeedCache] = None
+
+def get_feed_cache() -> FeedCache:
+    """Shared validator cache so hit/miss counts survive across cycles"""
+    global _feed_cache
+    if _feed_cache is None:
+        _feed_cache = FeedCache(settings.FEED_CACHE_PATH)
+    return _feed_cache
+
+FEED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+def get_feed_http_client() -> SharedHttpClient:
+    """Shared across cycles so keep-alive connections and DNS entries stay warm"""
+    return get_http_client("feeds", headers=FEED_HEADERS)
+
 class Web3ContentScraper:
-    def __init__(self):
+    def __init__(self, feed_cache: Optional[FeedCache] = None, parse_pool: Optional[ParsePool] = None,
+                 http_client: Optional[SharedHttpClient] = None):
         self.session = None
-        self.language_filter = LanguageFilter()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+        self.feed_cache = feed_cache or get_feed_cache()
+        self.parse_pool = parse_pool or get_parse_pool()
+        self.http_client = http_client or get_feed_http_client()
+        self.headers = FEED_HEADERS
         
     async def __aenter__(self):
-        connector = aiohttp.TCPConnector(family=socket.AF_INET, ssl=False)
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers=self.headers
-        )
+        self.session = await self.http_client.get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The session is shared and outlives this cycle; it is closed on app shutdown
+        self.session = None
     
-    def _extract_text_from_entry(self, entry) -> str:
-        content = ""
-        if hasattr(entry, 'content'):
-            content = entry.content[0].value
-        elif hasattr(entry, 'summary'):
-            content = entry.summary
-        elif hasattr(entry, 'description'):
-            content = entry.description
-        
-        if content:
-            soup = BeautifulSoup(content, 'html.parser')
-            return soup.get_text()
-        return ""
-
-    def _parse_date(self, entry) -> str:
-        """Extract and parse date from feed entry safely"""
-        try:
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                return datetime.fromtimestamp(time.mktime(entry.published_parsed)).isoformat()
-            elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                return datetime.fromtimestamp(time.mktime(entry.updated_parsed)).isoformat()
-            elif hasattr(entry, 'published'):
-                return dateutil.parser.parse(entry.published).isoformat()
-            elif hasattr(entry, 'updated'):
-                return dateutil.parser.parse(entry.updated).isoformat()
-        except Exception:
-            pass
-        return datetime.now().isoformat()
-
     def clean_article_content(self, title: str, summary: str) -> tuple[str, str]:
-        clean_title = self.language_filter.clean_text(title)
-        clean_summary = self.language_filter.clean_text(summary)
-        
-        if len(clean_title) > 200:
-            clean_title = clean_title[:197] + "..."
-        if len(clean_summary) > 3000:
-            clean_summary = clean_summary[:2997] + "..."
-            
-        return clean_title, clean_summary
+        return clean_article_content(title, summary)
     
-    # --- GENERIC FEED SCRAPER ---
-    async def scrape_feed(self, feed_url: str, source: str, default_tag: str, limit: int = 10) -> List[Dict]:
-        articles = []
+    async def fetch_feed(self, feed_url: str, conditional: bool = True, source: Optional[str] = None) -> Optional[FetchedFeed]:
+        """
+        Conditionally fetch a feed body.
+        Returns None when the feed is unchanged (304 or identical body) or unavailable.
+        The new validators are returned with the body rather than saved: the caller
+        commits them (feed_cache.commit) once the feed's articles are stored, so a
+        failure further down doesn't make the next poll skip entries it never kept.
+        conditional=False always returns the body, e.g. for deep scrapes that read further back.
+        `source` labels the fetch metrics; it defaults to the feed's host.
+        """
+        source = source or urlparse(feed_url).netloc
+        headers = self.feed_cache.conditional_headers(feed_url) if conditional else {}
+        started = time.perf_counter()
         try:
-            async with self.session.get(feed_url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    feed = feedparser.parse(content)
-                    
-                    for entry in feed.entries[:limit]:
-                        title = entry.title
-                        raw_text = self._extract_text_from_entry(entry)
-                        
-                        if not self.language_filter.should_include_article(title, raw_text):
-                            continue
-                        
-                        clean_title, clean_summary = self.clean_article_content(title, raw_text)
-                        
-                        # EXTRACT DATE HERE while we have the 'entry' object
-                        pub_date = self._parse_date(entry)
-
-                        article = {
-                            "title": clean_title,
-                            "url": entry.link,
-                            "summary": clean_summary,
-                            "source": source,
-                            "ecosystem_tag": default_tag,
-                            "published_at": pub_date  # Store it now
-                        }
-                        articles.append(article)
-        except Exception as e:
-            logger.error(f"Error scraping {feed_url}: {e}")
-        return articles
-
-    # --- SPECIFIC IMPLEMENTATIONS ---
-    async def scrape_ethereum_blog(self) -> List[Dict]:
-        logger.info("Scraping Ethereum ecosystem...")
-        tasks = [
-            self.scrape_feed("https://blog.ethereum.org/feed.xml", "ethereum", "ethereum"),
-            self.scrape_feed("https://newsletter.banklesshq.com/feed", "bankless", "ethereum")
-        ]
-        results = await asyncio.gather(*tasks)
-        return [item for sublist in results for item in sublist]
-
-    async def scrape_farcaster(self) -> List[Dict]:
-        logger.info("Scraping Farcaster blogs...")
-        tasks = [
-            self.scrape_feed("https://farcaster.mirror.xyz/feed/atom", "farcaster", "farcaster"),
-            self.scrape_feed("https://purple.mirror.xyz/feed/atom", "farcaster", "farcaster")
-        ]
-        results = await asyncio.gather(*tasks)
-        return [item for sublist in results for item in sublist]
-
-    async def scrape_solana_ecosystem(self) -> List[Dict]:
-        logger.info("Scraping Solana ecosystem...")
-        tasks = [
-            self.scrape_feed("https://solana.com/news/rss", "solana", "solana"),
-            self.scrape_feed("https://thedefiant.io/api/feed?tag=solana", "thedefiant", "solana")
-        ]
-        results = await asyncio.gather(*tasks)
-        return [item for sublist in results for item in sublist]
-
-    async def scrape_base_ecosystem(self) -> List[Dict]:
-        logger.info("Scraping Base ecosystem...")
-        tasks = [
-            self.scrape_feed("https://base.mirror.xyz/feed/atom", "base", "base"),
-            self.scrape_feed("https://optimism.mirror.xyz/feed/atom", "optimism", "base")
-        ]
-        results = await asyncio.gather(*tasks)
-        return [item for sublist in results for item in sublist]
-
-    async def scrape_web3_research(self) -> List[Dict]:
-        logger.info("Scraping Web3 Research...")
-        articles = []
-        # Arxiv requires specific handling or just use generic feed if RSS compatible
-        # For simplicity, using the generic scraper for RSS compatible ones
-        sources = [
-            ("https://ethresear.ch/latest.rss", "ethresearch"),
-            ("https://vitalik.eth.limo/feed.xml", "vitalik"),
-            ("https://research.paradigm.xyz/feed.xml", "paradigm")
-        ]
-        for url, source in sources:
-            fetched = await self.scrape_feed(url, source, "research", 5)
-            articles.extend(fetched)
-            
-        # Arxiv manual handling (API)
-        try:
-            arxiv_url = "http://export.arxiv.org/api/query?search_query=all:blockchain+OR+all:smart+contracts&start=0&max_results=5&sortBy=submittedDate&sortOrder=descending"
-            async with self.session.get(arxiv_url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    feed = feedparser.parse(content)
-                    for entry in feed.entries:
-                        pub_date = self._parse_date(entry)
-                        articles.append({
-                            "title": entry.title,
-                            "url": entry.link,
-                            "summary": entry.summary[:500],
-                            "source": "arxiv",
-                            "ecosystem_tag": "research",
-                            "published_at": pub_date
-                        })
-        except Exception as e:
-            logger.error(f"Arxiv error: {e}")
-            
-        return articles
-
-    async def scrape_medium_web3(self) -> List[Dict]:
-        logger.info("Scraping Medium...")
-        url = "https://news.google.com/rss/search?q=site:medium.com+(web3+OR+ethereum+OR+blockchain)+when:7d&hl=en-US&gl=US&ceid=US:en"
-        return await self.scrape_feed(url, "medium", "web3", 8)
-
-    async def scrape_all_sources(self) -> List[Dict]:
-        tasks = [
-            self.scrape_ethereum_blog(),
-            self.scrape_farcaster(),
-            self.scrape_solana_ecosystem(),
-            self.scrape_base_ecosystem(),
-            self.scrape_web3_research(),
-            self.scrape_medium_web3()
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        all_articles = []
-        for result in results:
-            if isinstance(result, list):
-                all_articles.extend(result)
-        
-        # Deduplicate
-        seen_urls = set()
-        unique_articles = []
-        for article in all_articles:
-            if article['url'] not in seen_urls:
-                seen_urls.add(article['url'])
-                unique_articles.append(article)
-        return unique_articles
-
-async def run_scraping_agent():
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+            async with self.session.get(feed_url, headers=headers) as response:
+                if response.status == 304:
+                    self.feed_cache.record_hit(feed_url)
+                    FEED_FETCH_RESULTS.inc(source=source, result="unchanged")
+                    return None
+                if response.status != 200:
+                    logger.warning(f"Feed {feed_url} returned HTTP {response.status}")
+                    FEED_FETCH_RESULTS.inc(source=source, result="http_error")
+                    return None
+
+                body = await response.read()
+                FEED_FETCH_BYTES.inc(len(body), source=source)
+                content_hash = self.feed_cache.hash_content(body)
+                if conditional and self.feed_cache.is_unchanged(feed_url, content_hash):
+                    self.feed_cache.record_hit(feed_url)
+                    FEED_FETCH_RESULTS.inc(source=source, result="unchanged")
+                    return None
+
+                self.feed_cache.record_miss(feed_url)
+                FEED_FETCH_RESULTS.inc(source=source, result="changed")
+                return FetchedFeed(
+                    feed_url,
+                    body,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    content_hash
+                )
+        except Exception:
+            FEED_FETCH_RESULTS.inc(source=source, result="error")
+            raise
+        finally:
+            FEED_FETCH_SECONDS.observe(time.perf_counter() - started, source=source)
+
+    async def parse_content(self, spec: FeedSpec, content: bytes) -> List[Dict]:
+        """Parse a fetched body in the worker pool according to the spec's parser"""
+        if spec.parser == "arxiv":
+            return await self.parse_pool.parse_arxiv(content)
+        # Parsing, cleaning and language detection run in the worker pool
+        return await self.parse_pool.parse_feed(content, spec.source, spec.tag, spec.limit)
+
+    def feed_sources(self) -> List[FeedSpec]:
+        """Every feed in the source registry, for callers that schedule fetches themselves"""
+        return get_sources()
+
+async def run_scraping_agent(force_all: bool = False, limit_factor: int = 1,
+                             on_pipeline: Optional[Callable[[IngestionPipeline], None]] = None):
+    """
+    Run one collection cycle over the feeds the poll scheduler says are due.
+    force_all polls every registered feed regardless of its interval, skipping
+    conditional requests; limit_factor scales how many entries each feed yields.
+    on_pipeline receives the pipeline before it starts, for live progress.
+    """
+    articles = ArticleRepository(get_database("service"))
+    poll_scheduler = get_poll_scheduler()
 
     async with Web3ContentScraper() as scraper:
-        logger.info("Agent: Starting collection cycle...")
-        articles = await scraper.scrape_all_sources()
-        
-        if not articles:
-            logger.warning("Agent: No articles found.")
+        specs = scraper.feed_sources() if force_all else poll_scheduler.due(scraper.feed_sources())
+        if limit_factor != 1:
+            specs = [spec._replace(limit=spec.limit * limit_factor) for spec in specs]
+        if not specs:
+            logger.info("Agent: No feeds due this tick.")
             return 0
-        
-        stored_count = 0 
-        logger.info(f"Agent: Processing {len(articles)} potential articles...")
-        
-        for i, article_data in enumerate(articles):
-            try:
-                # 1. Check if exists
-                existing = supabase.table("articles").select("id").eq("url", article_data["url"]).execute()
-                if existing.data:
-                    continue
 
-                # 2. AI Analysis (Simplified for speed)
-                ai_summary = article_data["summary"]
-                ai_tag = article_data["ecosystem_tag"]
-                ai_legitimacy = 0.5
-                ai_sentiment = 5
-                
-                # Only run AI if summary is missing or tag is generic
-                if ai_tag == "web3" or len(ai_summary) < 50:
-                    try:
-                        logger.info(f"Agent: Analyzing '{article_data['title'][:30]}...'")
-                        if i > 0: time.sleep(1)
-                        full_text = f"{article_data['title']}\n\n{ai_summary}"
-                        ai_analysis = analyze_content(article_data['title'], full_text)
-                        if ai_analysis:
-                            ai_summary = ai_analysis.get("summary", ai_summary)
-                            ai_tag = ai_analysis.get("ecosystem_tag", ai_tag).lower()
-                            ai_legitimacy = ai_analysis.get("legitimacy_score", 0.5)
-                            ai_sentiment = ai_analysis.get("sentiment_score", 5)
-                    except Exception:
-                        pass
-
-                # 3. Prepare Final Payload
-                db_payload = {
-                    "title": article_data["title"],
-                    "url": article_data["url"],
-                    "source": article_data["source"],
-                    "created_at": datetime.now().isoformat(),
-                    "summary": ai_summary,
-                    "ecosystem_tag": ai_tag.lower(),
-                    "published_at": article_data["published_at"], # <--- Using the correctly extracted date
-                    "legitimacy_score": ai_legitimacy,
-                    "sentiment_score": ai_sentiment,
-                    "is_processed": True
-                }
+        logger.info(f"Agent: Starting collection cycle over {len(specs)} feeds...")
+        # The shared cache's counters run across cycles; report this cycle's share
+        cache_before = scraper.feed_cache.summary()
+        pipeline = IngestionPipeline(scraper, articles, poll_scheduler, conditional=not force_all)
+        if on_pipeline:
+            on_pipeline(pipeline)
+        stored_count = await pipeline.run(specs)
+
+        cache_summary = scraper.feed_cache.summary()
+        logger.info(
+            f"Feed cache: {cache_summary['hits'] - cache_before['hits']} unchanged, "
+            f"{cache_summary['misses'] - cache_before['misses']} changed across {len(specs)} feeds"
+        )
+        pipeline.log_summary()
 
-                # 4. Save to Supabase
-                result = supabase.table("articles").insert(db_payload).execute()
-                if result.data:
-                    stored_count += 1
-                    logger.info(f"Agent: Saved '{article_data['title'][:30]}' as [{ai_tag}]")
-                    
-            except Exception as e:
-                logger.error(f"DB ERROR for {article_data.get('url')}: {e}")
-                continue
-        
         logger.info(f"Agent Cycle Complete. New Articles: {stored_count}")
-        return stored_count
\ No newline at end of file
+        return stored_count
@@ -0,0 +1,58 @@
+import json
+import logging
+import os
+from typing import List, NamedTuple, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOURCES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sources.json")
+
+PARSERS = {"rss", "arxiv"}
+
+class FeedSpec(NamedTuple):
+    url: str
+    source: str
+    tag: str
+    limit: int = 10
+    parser: str = "rss"  # "rss" (generic RSS/Atom) or "arxiv" (API, no language filter)
+    group: str = ""
+    min_interval_minutes: Optional[float] = None  # Overrides POLL_MIN_INTERVAL_MINUTES
+    max_interval_minutes: Optional[float] = None  # Overrides POLL_MAX_INTERVAL_MINUTES
+
+def load_sources(path: Optional[str] = None) -> List[FeedSpec]:
+    """Read the source registry; see sources.json for the format"""
+    path = path or settings.SOURCES_PATH or DEFAULT_SOURCES_PATH
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+
+    specs = []
+    for entry in raw.get("sources", []):
+        if entry.get("enabled", True) is False:
+            continue
+        spec = FeedSpec(
+            url=entry["url"],
+            source=entry["source"],
+            tag=entry["tag"],
+            limit=entry.get("limit", 10),
+            parser=entry.get("parser", "rss"),
+            group=entry.get("group", ""),
+            min_interval_minutes=entry.get("min_interval_minutes"),
+            max_interval_minutes=entry.get("max_interval_minutes")
+        )
+        if spec.parser not in PARSERS:
+            raise ValueError(f"Unknown parser '{spec.parser}' for source {spec.url}")
+        specs.append(spec)
+    return specs
+
+_registry: Optional[List[FeedSpec]] = None
+
+def get_sources() -> List[FeedSpec]:
+    global _registry
+    if _registry is None:
+        _registry = load_sources()
+        logger.info(f"Loaded {len(_registry)} feed sources")
+    return _registry
+
+def sources_in_group(group: str) -> List[FeedSpec]:
+    return [spec for spec in get_sources() if spec.group == group]
@@ -0,0 +1,196 @@
+import asyncio
+import base64
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import aiohttp
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "ref_url", "cmpid", "_hsenc", "_hsmi", "oc", "sk"
+})
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+# Medium appends source=rss----<id>---4 to every feed link
+_medium_source = re.compile(r'^rss-+[0-9a-f]*-+\d*$')
+
+# Hosts whose links only redirect to the real article
+WRAPPER_HOSTS = frozenset({
+    "news.google.com", "feedproxy.google.com", "t.co", "bit.ly", "ow.ly", "lnkd.in", "buff.ly", "dlvr.it"
+})
+
+_data_n_au = re.compile(r'data-n-au="([^"]+)"')
+_canonical_link = re.compile(r'<link[^>]+rel="canonical"[^>]+href="([^"]+)"', re.IGNORECASE)
+
+def _is_tracking(key: str, value: str) -> bool:
+    key = key.lower()
+    if key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES):
+        return True
+    return key == "source" and bool(_medium_source.match(value))
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL for dedup: http folded into https, lowercase host, no
+    default port, no fragment, no tracking parameters, sorted query, no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    port_is_default = (scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)
+    # Publishers serve the same article over both; the key must not tell them apart
+    if scheme == "http":
+        scheme = "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and not port_is_default:
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r'/{2,}', '/', parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k, v)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+def is_wrapper(url: str) -> bool:
+    host = (urlsplit(url).hostname or "").lower()
+    return host in WRAPPER_HOSTS
+
+def decode_google_news(url: str) -> Optional[str]:
+    """
+    Older Google News article ids are base64 protobufs that embed the target URL,
+    which saves a request. Newer ids don't; those fall back to fetching.
+    """
+    parts = urlsplit(url)
+    if parts.hostname != "news.google.com" or "/articles/" not in parts.path:
+        return None
+    article_id = parts.path.rsplit("/", 1)[-1]
+    try:
+        raw = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except Exception:
+        return None
+    start = raw.find(b"http")
+    if start < 0:
+        return None
+    end = start
+    while end < len(raw) and 0x21 <= raw[end] <= 0x7e:
+        end += 1
+    target = raw[start:end].decode("ascii", errors="ignore")
+    return target if target.startswith(("http://", "https://")) else None
+
+class RedirectResolver:
+    """
+    Resolves redirect-wrapper links (Google News, shorteners) to the article they
+    point at. Results persist in SQLite so each wrapper costs at most one request;
+    failures are retried after `retry_seconds`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        concurrency: int = settings.URL_RESOLVE_CONCURRENCY,
+        timeout: float = settings.URL_RESOLVE_TIMEOUT,
+        retry_seconds: float = settings.URL_RESOLVE_RETRY_HOURS * 3600
+    ):
+        self.path = path
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self.stats = {"hits": 0, "decoded": 0, "fetched": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS url_redirects (
+                wrapper_url TEXT PRIMARY KEY,
+                target_url TEXT,
+                resolved_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, wrapper_url: str) -> Optional[str]:
+        """Cached target, '' for a recent failure, None if unknown or due for a retry"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT target_url, resolved_at FROM url_redirects WHERE wrapper_url = ?", (wrapper_url,)
+            ).fetchone()
+        if not row:
+            return None
+        target, resolved_at = row
+        if target:
+            return target
+        return "" if time.time() - resolved_at < self.retry_seconds else None
+
+    def set(self, wrapper_url: str, target_url: Optional[str]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO url_redirects (wrapper_url, target_url, resolved_at) VALUES (?, ?, ?)",
+                (wrapper_url, target_url, time.time())
+            )
+            self._conn.commit()
+
+    async def _fetch_target(self, session, url: str) -> Optional[str]:
+        async with session.get(url, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+            final_url = str(response.url)
+            if not is_wrapper(final_url):
+                return final_url
+            # Google News serves an interstitial page rather than a 30x
+            body = await response.text(errors="ignore")
+            for pattern in (_data_n_au, _canonical_link):
+                match = pattern.search(body)
+                if match and not is_wrapper(match.group(1)):
+                    return match.group(1)
+        return None
+
+    async def resolve(self, session, url: str) -> str:
+        """Return the article URL behind `url`, or `url` itself if it isn't a wrapper or can't be resolved"""
+        if not is_wrapper(url):
+            return url
+
+        cached = self.get(url)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached or url
+
+        target = decode_google_news(url)
+        if target:
+            self.stats["decoded"] += 1
+        else:
+            try:
+                target = await self._fetch_target(session, url)
+            except Exception as e:
+                logger.debug(f"Could not resolve {url}: {e}")
+                target = None
+            self.stats["fetched" if target else "failed"] += 1
+
+        self.set(url, target)
+        return target or url
+
+    async def resolve_many(self, session, urls: List[str]) -> Dict[str, str]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(url):
+            async with semaphore:
+                return url, await self.resolve(session, url)
+
+        results = await asyncio.gather(*(bounded(url) for url in dict.fromkeys(urls)))
+        return dict(results)
+
+_redirect_resolver: Optional[RedirectResolver] = None
+
+def get_redirect_resolver() -> RedirectResolver:
+    global _redirect_resolver
+    if _redirect_resolver is None:
+        _redirect_resolver = RedirectResolver(settings.URL_REDIRECT_CACHE_PATH)
+    return _redirect_resolver
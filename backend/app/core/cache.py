@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from app.core.config import settings
+from app.core.metrics import registry
+
+class AsyncTTLCache:
+    """
+    In-process response cache with TTL expiry and LRU eviction.
+    Concurrent misses on the same key share one loader call, and
+    invalidate() discards both cached entries and results of loads
+    that were already in flight when it was called.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return value
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # This waiter was cancelled
+                # The leader was cancelled mid-load; start a fresh load rather than fail
+                return await self.get_or_load(key, loader)
+
+        self.stats["misses"] += 1
+        generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the exception; mark it retrieved so it isn't logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            return value
+        finally:
+            # Cancellation (or any BaseException) skips the handlers above; never leave waiters hanging
+            if not future.done():
+                future.cancel()
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def invalidate(self):
+        """Drop everything; called when the underlying data changes"""
+        self._generation += 1
+        self._entries.clear()
+        self._inflight.clear()
+        self.stats["invalidations"] += 1
+
+    def snapshot(self) -> Dict:
+        return {**self.stats, "entries": len(self._entries), "maxsize": self.maxsize, "ttl": self.ttl}
+
+# Serves GET /feed; the agent invalidates it whenever it stores new articles
+feed_response_cache = AsyncTTLCache(settings.FEED_RESPONSE_CACHE_MAX_ENTRIES, settings.FEED_RESPONSE_CACHE_TTL)
+
+registry.gauge(
+    "lexi_feed_response_cache_events", "GET /feed response cache hits, misses, coalesced loads and invalidations",
+    ["event"], function=lambda: {(event,): count for event, count in feed_response_cache.stats.items()}
+)
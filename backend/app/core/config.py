@@ -4,19 +4,118 @@ class Settings(BaseSettings):
     # --- Database ---
     SUPABASE_URL: str
     SUPABASE_KEY: str
-    SECRET_KEY: str = "lexi-agent-secret-key"
+    SECRET_KEY: str = ""  # Signs session tokens; the API refuses to start without a real one
     SUPABASE_SERVICE_KEY: str
 
     # --- AI & Email ---
     GOOGLE_API_KEY: str
     RESEND_API_KEY: str
-    RECIPIENT_EMAIL: str = "ayanakoji08@gmail.com"
+    RECIPIENT_EMAIL: str = "ayanakoji08@gmail.com"  # Operator copy of the generic digest; empty to skip
+
+    # --- Email digests ---
+    RESEND_API_URL: str = "https://api.resend.com"
+    DIGEST_FROM: str = "Lexi Agent <onboarding@resend.dev>"
+    DIGEST_LOOKBACK_DAYS: int = 7
+    DIGEST_CANDIDATE_LIMIT: int = 300  # Articles loaded once per run and ranked per user
+    DIGEST_ARTICLES_PER_USER: int = 10
+    DIGEST_RECIPIENT_PAGE_SIZE: int = 500
+    DIGEST_BATCH_SIZE: int = 100  # Resend's batch endpoint maximum
+    DIGEST_SEND_CONCURRENCY: int = 2
+    DIGEST_REQUESTS_PER_SECOND: float = 2.0
+    DIGEST_STATE_PATH: str = "digest_state.db"  # Per-run delivery ledger for resuming
+
+    # --- Gemini quota / analysis executor ---
+    ANALYSIS_CONCURRENCY: int = 4
+    ANALYSIS_REQUESTS_PER_MINUTE: float = 15
+    ANALYSIS_TOKENS_PER_MINUTE: float = 1_000_000
+    ANALYSIS_TIMEOUT: float = 30.0
+    ANALYSIS_MAX_RETRIES: int = 3
+    ANALYSIS_BATCH_SIZE: int = 10
+    ANALYSIS_BATCH_TOKEN_BUDGET: int = 12000
+    ANALYSIS_BATCH_TIMEOUT: float = 90.0
 
     # --- Web3 Sources ---
     FARCASTER_HUB_URL: str = "https://hub.pinata.cloud"
     SNAPSHOT_URL: str = "https://snapshot.org"
     MEDIUM_RSS: str = "https://medium.com/feed/tag/web3"
+
+    # --- Shared HTTP client ---
+    HTTP_FORCE_IPV4: bool = True  # Applied per client, not process-wide
+    HTTP_POOL_LIMIT: int = 50
+    HTTP_POOL_LIMIT_PER_HOST: int = 4  # Several feeds share hosts like mirror.xyz
+    HTTP_DNS_CACHE_TTL: int = 600
+    HTTP_KEEPALIVE_TIMEOUT: float = 120
+
+    # --- Source registry & adaptive polling ---
+    SOURCES_PATH: str = ""  # Defaults to app/agents/sources.json
+    POLL_STATE_PATH: str = "feed_cache.db"
+    POLL_TICK_MINUTES: int = 5
+    DEEP_SCRAPE_INTERVAL_HOURS: int = 6
+    DEEP_SCRAPE_LIMIT_FACTOR: int = 2
+    SCHEDULER_JITTER: float = 0.1
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = 300
+    AGENT_JOB_HISTORY: int = 50
+    POLL_MIN_INTERVAL_MINUTES: float = 15
+    POLL_MAX_INTERVAL_MINUTES: float = 720
+    POLL_INTERVAL_FACTOR: float = 0.5  # Poll about twice per observed gap between entries
+
+    # --- Feed parsing worker pool ---
+    PARSE_WORKERS: int = 2
+    PARSE_INLINE: bool = False  # Parse on the calling thread (tests / debugging)
+
+    # --- Ingestion pipeline ---
+    PIPELINE_FETCH_CONCURRENCY: int = 8
+    PIPELINE_ANALYZE_CONCURRENCY: int = 2
+    PIPELINE_QUEUE_SIZE: int = 100
+    PIPELINE_BATCH_SIZE: int = 20
+    PIPELINE_BATCH_WAIT: float = 1.0  # Seconds a stage waits to fill a batch
+
+    # --- Observability ---
+    METRICS_ENABLED: bool = True  # Serve Prometheus metrics at /metrics
+    PROFILE_DIR: str = "profiles"  # Collapsed-stack output of profiled agent runs
+    PROFILE_INTERVAL_MS: float = 5.0
+
+    # --- Wallet auth ---
+    NONCE_TTL_SECONDS: int = 300
+    NONCE_STORE_BACKEND: str = "memory"  # "memory" (single worker) or "sqlite" (shared across workers)
+    NONCE_STORE_PATH: str = "auth_state.db"
+    SESSION_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # --- Database (PostgREST) client pool ---
+    DB_POOL_SIZE: int = 20
+    DB_POOL_MAX_KEEPALIVE: int = 10
+    DB_TIMEOUT: float = 10.0
+    DB_CONNECT_TIMEOUT: float = 5.0
+
+    # --- API response cache ---
+    FEED_RESPONSE_CACHE_TTL: float = 300  # Also invalidated whenever the agent stores rows
+    FEED_RESPONSE_CACHE_MAX_ENTRIES: int = 256
+
+    # --- Agent caches ---
+    FEED_CACHE_PATH: str = "feed_cache.db"
+    ANALYSIS_CACHE_PATH: str = "analysis_cache.db"
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 50000
+    ANALYSIS_CACHE_MAX_AGE_DAYS: int = 30
+
+    # --- URL canonicalization ---
+    URL_REDIRECT_CACHE_PATH: str = "feed_cache.db"
+    URL_RESOLVE_CONCURRENCY: int = 4
+    URL_RESOLVE_TIMEOUT: float = 10.0
+    URL_RESOLVE_RETRY_HOURS: int = 24
+
+    # --- Near-duplicate detection ---
+    NEAR_DUP_INDEX_PATH: str = "feed_cache.db"
+    NEAR_DUP_THRESHOLD: float = 0.6  # estimated Jaccard similarity of title/summary features
+    NEAR_DUP_WINDOW_DAYS: int = 14
     
+    # --- Maintenance jobs (scripts/) ---
+    MAINTENANCE_PAGE_SIZE: int = 500
+    MAINTENANCE_WORKERS: int = 2  # Classification processes; 0 runs inline
+    MAINTENANCE_STATE_PATH: str = "maintenance_state.db"  # Checkpoints for resuming
+
+    # --- Legitimacy pre-filter ---
+    LEGITIMACY_MIN_SCORE: float = 0.4  # Heuristic score below which articles are dropped before analysis
+
     # --- Whitelisted domains ---
     WHITELISTED_DOMAINS: list = [
         "ethereum.org", "blog.ethereum.org", "vitalik.ca",
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, Optional
+import httpx
+from postgrest import AsyncPostgrestClient
+from app.core.config import settings
+from app.core.metrics import DB_REQUEST_SECONDS, DB_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """AsyncPostgrestClient whose httpx session has explicit pool limits"""
+
+    def __init__(self, base_url: str, *, limits: httpx.Limits, **kwargs):
+        # create_session runs inside the base __init__, so limits must be set first
+        self._limits = limits
+        super().__init__(base_url, **kwargs)
+
+    def create_session(self, base_url, headers, timeout):
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=self._limits,
+            follow_redirects=True
+        )
+
+class Database:
+    """
+    Non-blocking access to Supabase's REST API over one pooled HTTP/1.1 client.
+    Every query goes through execute(), which records per-operation latency.
+    The client is tied to the event loop that created it, so callers running
+    asyncio.run per job get a fresh pool instead of a dead one.
+    """
+
+    # Latencies kept per operation for percentile estimates
+    SAMPLE_SIZE = 512
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        key: str,
+        pool_size: int = settings.DB_POOL_SIZE,
+        max_keepalive: int = settings.DB_POOL_MAX_KEEPALIVE,
+        timeout: float = settings.DB_TIMEOUT,
+        connect_timeout: float = settings.DB_CONNECT_TIMEOUT
+    ):
+        self.name = name
+        self.rest_url = f"{url.rstrip('/')}/rest/v1"
+        self.headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+        self.limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=max_keepalive)
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._client: Optional[PooledPostgrestClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.SAMPLE_SIZE))
+        self._counts: Dict[str, Dict[str, float]] = defaultdict(lambda: {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+
+    @property
+    def client(self) -> PooledPostgrestClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = PooledPostgrestClient(
+                self.rest_url,
+                headers={**self.headers, "Accept": "application/json", "Content-Type": "application/json"},
+                timeout=self.timeout,
+                limits=self.limits
+            )
+            self._loop = loop
+            logger.info(f"Database client '{self.name}' created")
+        return self._client
+
+    def table(self, name: str):
+        return self.client.from_(name)
+
+    def rpc(self, function: str, params: Dict):
+        return self.client.rpc(function, params)
+
+    async def execute(self, operation: str, request) -> Any:
+        """Run a built request and record its latency under `operation`"""
+        counts = self._counts[operation]
+        started = time.perf_counter()
+        try:
+            result = await request.execute()
+            DB_REQUESTS.inc(db=self.name, operation=operation, outcome="ok")
+            return result
+        except Exception:
+            counts["errors"] += 1
+            DB_REQUESTS.inc(db=self.name, operation=operation, outcome="error")
+            raise
+        finally:
+            DB_REQUEST_SECONDS.observe(time.perf_counter() - started, db=self.name, operation=operation)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            counts["calls"] += 1
+            counts["total_ms"] += elapsed_ms
+            counts["max_ms"] = max(counts["max_ms"], elapsed_ms)
+            self._latencies[operation].append(elapsed_ms)
+
+    def stats(self) -> Dict[str, Dict]:
+        result = {}
+        for operation, counts in self._counts.items():
+            samples = sorted(self._latencies[operation])
+            result[operation] = {
+                "calls": counts["calls"],
+                "errors": counts["errors"],
+                "avg_ms": round(counts["total_ms"] / counts["calls"], 1) if counts["calls"] else 0.0,
+                "p50_ms": round(samples[len(samples) // 2], 1) if samples else 0.0,
+                "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 1) if samples else 0.0,
+                "max_ms": round(counts["max_ms"], 1)
+            }
+        return result
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+
+_databases: Dict[str, Database] = {}
+
+def get_database(name: str = "api") -> Database:
+    """
+    "api" uses the anon key for request handlers; "service" uses the service key
+    for the agent and jobs that need to bypass row-level security.
+    """
+    if name not in _databases:
+        key = settings.SUPABASE_SERVICE_KEY if name == "service" else settings.SUPABASE_KEY
+        _databases[name] = Database(name, settings.SUPABASE_URL, key)
+    return _databases[name]
+
+def database_stats() -> Dict[str, Dict]:
+    return {name: db.stats() for name, db in _databases.items()}
+
+async def close_databases():
+    for db in _databases.values():
+        await db.close()
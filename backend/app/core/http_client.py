@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import socket
+from collections import Counter
+from typing import Dict, Optional
+import aiohttp
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class SharedHttpClient:
+    """
+    Long-lived aiohttp session reused across agent cycles.
+    Keeps keep-alive connections warm, caps connections per host, caches DNS
+    for `dns_ttl` seconds and pins the address family on this client only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        headers: Optional[Dict[str, str]] = None,
+        family: int = socket.AF_INET if settings.HTTP_FORCE_IPV4 else socket.AF_UNSPEC,
+        limit: int = settings.HTTP_POOL_LIMIT,
+        limit_per_host: int = settings.HTTP_POOL_LIMIT_PER_HOST,
+        dns_ttl: int = settings.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout: float = settings.HTTP_KEEPALIVE_TIMEOUT,
+        timeout: float = 30,
+        verify_ssl: bool = False
+    ):
+        self.name = name
+        self.headers = headers or {}
+        self.family = family
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        # Off for public feeds (some serve broken chains); on for authenticated APIs
+        self.verify_ssl = verify_ssl
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.counters = Counter()
+        self.requests_per_host = Counter()
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.counters["requests"] += 1
+            self.requests_per_host[params.url.host] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.counters["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.counters["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.counters["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.counters["dns_cache_misses"] += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared session, creating it on first use. A session is tied to
+        the loop that created it, so scripts that call asyncio.run per job get a
+        fresh one instead of a dead session.
+        """
+        loop = asyncio.get_running_loop()
+        # No awaits between the check and the assignment, so concurrent callers can't race here
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                family=self.family,
+                ssl=self.verify_ssl,
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers,
+                trace_configs=[self._trace_config()]
+            )
+            self._loop = loop
+            self.counters["sessions_created"] += 1
+            logger.info(f"HTTP client '{self.name}' session created")
+        return self._session
+
+    def stats(self) -> Dict:
+        open_connections = 0
+        in_use = 0
+        if self._session is not None and not self._session.closed:
+            connector = self._session.connector
+            # aiohttp exposes no public pool counters; these are stable across 3.x
+            open_connections = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+            in_use = len(getattr(connector, "_acquired", ()))
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "idle_connections": open_connections,
+            "in_use_connections": in_use,
+            **dict(self.counters),
+            "requests_per_host": dict(self.requests_per_host)
+        }
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+_clients: Dict[str, SharedHttpClient] = {}
+
+def get_http_client(name: str, **kwargs) -> SharedHttpClient:
+    """Return the named shared client; kwargs only apply when it is first created"""
+    if name not in _clients:
+        _clients[name] = SharedHttpClient(name, **kwargs)
+    return _clients[name]
+
+def http_pool_stats() -> Dict[str, Dict]:
+    return {name: client.stats() for name, client in _clients.items()}
+
+async def close_http_clients():
+    for client in _clients.values():
+        await client.close()
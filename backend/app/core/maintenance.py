@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from postgrest.exceptions import APIError
+from app.core.config import settings
+from app.core.database import Database, get_database
+
+logger = logging.getLogger(__name__)
+
+# classify() result for a row that should be removed
+DELETE = "delete"
+
+# PostgREST encodes `in_` filters into the query string, so keep id lists well under URL limits
+WRITE_CHUNK_SIZE = 100
+
+# Postgres unique_violation
+UNIQUE_VIOLATION = "23505"
+
+class MaintenanceJob(ABC):
+    """
+    A backfill or cleanup over one table. Subclasses set `name` and `columns`
+    (only what classify() needs) and implement classify(), which runs in worker
+    processes and returns one decision per row:
+        None     leave the row alone
+        DELETE   delete it
+        dict     patch it with these column values
+    Rows with identical patches are written together with one update ... in_("id", ...)
+    per chunk, so jobs that assign a handful of distinct values (tags, flags,
+    bucketed scores) cost a few requests per page rather than one per row.
+    A patch that would break a unique key is skipped for that row and counted
+    as a conflict; the first row scanned keeps the value.
+    Jobs must be picklable: keep state in plain attributes or module globals.
+    """
+
+    name: str = ""
+    table: str = "articles"
+    columns: str = "id"
+    key: str = "id"  # Unique column the scan pages through in ascending order
+
+    def scope(self, query):
+        """Extra filters on the scan, e.g. query.eq("is_processed", True)"""
+        return query
+
+    @abstractmethod
+    def classify(self, rows: List[Dict]) -> List:
+        ...
+
+    def describe(self, row: Dict) -> str:
+        """How a changed row is shown in dry-run output"""
+        return str(row[self.key])
+
+class CheckpointStore:
+    """Last key each job finished writing, so an interrupted run resumes after it"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS maintenance_checkpoints (
+                job TEXT PRIMARY KEY,
+                last_key TEXT,
+                stats TEXT NOT NULL,
+                finished INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def load(self, job: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_key, stats, finished FROM maintenance_checkpoints WHERE job = ?", (job,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"last_key": row[0], "stats": json.loads(row[1]), "finished": bool(row[2])}
+
+    def save(self, job: str, last_key: Optional[str], stats: Dict, finished: bool = False):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO maintenance_checkpoints (job, last_key, stats, finished, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job, last_key, json.dumps(stats), int(finished), time.time())
+            )
+            self._conn.commit()
+
+    def clear(self, job: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM maintenance_checkpoints WHERE job = ?", (job,))
+            self._conn.commit()
+
+class MaintenanceRunner:
+    """
+    Streams the table in keyset pages (key > last ORDER BY key LIMIT n), so memory
+    stays at a few pages however large the table is and deleting rows behind the
+    scan never shifts it. While one page is classified in the worker pool the next
+    is already being read; writes and checkpoints are applied strictly in page
+    order, so a checkpoint never claims a page whose writes didn't land.
+    """
+
+    def __init__(
+        self,
+        job: MaintenanceJob,
+        db: Optional[Database] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        page_size: int = settings.MAINTENANCE_PAGE_SIZE,
+        workers: int = settings.MAINTENANCE_WORKERS,
+        dry_run: bool = False
+    ):
+        self.job = job
+        self.db = db or get_database("service")
+        self.checkpoints = checkpoints or CheckpointStore(settings.MAINTENANCE_STATE_PATH)
+        self.page_size = page_size
+        self.workers = workers
+        self.dry_run = dry_run
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def _read_page(self, after: Optional[str]) -> List[Dict]:
+        query = self.job.scope(self.db.table(self.job.table).select(self.job.columns))
+        if after is not None:
+            query = query.gt(self.job.key, after)
+        query = query.order(self.job.key).limit(self.page_size)
+        response = await self.db.execute(f"maintenance.{self.job.name}.read", query)
+        return response.data or []
+
+    async def _classify(self, rows: List[Dict]) -> List:
+        if self._executor is None:
+            return self.job.classify(rows)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.job.classify, rows)
+
+    def _plan(self, rows: List[Dict], decisions: List):
+        """Group a page's decisions into (ids to delete, {patch: ids})"""
+        deletes = []
+        updates = defaultdict(list)
+        for row, decision in zip(rows, decisions):
+            if decision is None:
+                continue
+            if decision == DELETE:
+                deletes.append(row[self.job.key])
+            else:
+                updates[json.dumps(decision, sort_keys=True)].append(row[self.job.key])
+        return deletes, updates
+
+    async def _update(self, values: Dict, ids: List[str]) -> int:
+        """Returns how many rows were skipped on unique conflicts"""
+        operation = f"maintenance.{self.job.name}.update"
+        table, key = self.job.table, self.job.key
+        try:
+            await self.db.execute(operation, self.db.table(table).update(values).in_(key, ids))
+            return 0
+        except APIError as e:
+            if e.code != UNIQUE_VIOLATION:
+                raise
+        # One conflicting row fails the whole statement; find it row by row
+        conflicts = 0
+        for row_id in ids:
+            try:
+                await self.db.execute(operation, self.db.table(table).update(values).eq(key, row_id))
+            except APIError as e:
+                if e.code != UNIQUE_VIOLATION:
+                    raise
+                conflicts += 1
+                logger.warning(f"{self.job.name}: {key}={row_id} skipped, {values} is already taken")
+        return conflicts
+
+    async def _write(self, deletes: List[str], updates: Dict[str, List[str]]) -> int:
+        table, key = self.job.table, self.job.key
+        for i in range(0, len(deletes), WRITE_CHUNK_SIZE):
+            await self.db.execute(
+                f"maintenance.{self.job.name}.delete",
+                self.db.table(table).delete().in_(key, deletes[i:i + WRITE_CHUNK_SIZE])
+            )
+        conflicts = 0
+        for patch, ids in updates.items():
+            values = json.loads(patch)
+            for i in range(0, len(ids), WRITE_CHUNK_SIZE):
+                conflicts += await self._update(values, ids[i:i + WRITE_CHUNK_SIZE])
+        return conflicts
+
+    async def _apply(self, rows: List[Dict], decisions: List, stats: Dict):
+        deletes, updates = self._plan(rows, decisions)
+        changed = len(deletes) + sum(len(ids) for ids in updates.values())
+        stats["scanned"] += len(rows)
+        stats["deleted"] += len(deletes)
+        stats["updated"] += changed - len(deletes)
+
+        if self.dry_run:
+            for row, decision in zip(rows, decisions):
+                if decision is not None:
+                    action = "delete" if decision == DELETE else f"update {decision}"
+                    print(f"[dry-run] {action}: {self.job.describe(row)}")
+            return
+
+        conflicts = await self._write(deletes, updates)
+        stats["updated"] -= conflicts
+        stats["conflicts"] += conflicts
+        # The last key of the page, not of the last change: unchanged rows are done too
+        self.checkpoints.save(self.job.name, str(rows[-1][self.job.key]), stats)
+
+    async def run(self, restart: bool = False) -> Dict:
+        stats = {"scanned": 0, "deleted": 0, "updated": 0, "conflicts": 0}
+        after = None
+        checkpoint = None if restart or self.dry_run else self.checkpoints.load(self.job.name)
+        if checkpoint and not checkpoint["finished"]:
+            after = checkpoint["last_key"]
+            stats.update(checkpoint["stats"])
+            logger.info(f"Resuming {self.job.name} after {after} ({stats['scanned']} rows already scanned)")
+
+        started = time.monotonic()
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Pages being classified, oldest first; bounded so reads can't run far ahead
+        in_flight: deque = deque()
+        try:
+            while True:
+                rows = await self._read_page(after)
+                if rows:
+                    in_flight.append((rows, asyncio.ensure_future(self._classify(rows))))
+                    after = str(rows[-1][self.job.key])
+
+                while in_flight and (not rows or len(in_flight) > max(1, self.workers)):
+                    page, decisions = in_flight.popleft()
+                    await self._apply(page, await decisions, stats)
+                    logger.info(f"{self.job.name}: {stats['scanned']} scanned, "
+                                f"{stats['deleted']} deleted, {stats['updated']} updated, {stats['conflicts']} conflicts")
+
+                if len(rows) < self.page_size:
+                    # Short page: the scan is done; drain what's left
+                    while in_flight:
+                        page, decisions = in_flight.popleft()
+                        await self._apply(page, await decisions, stats)
+                    break
+        finally:
+            for _, decisions in in_flight:
+                decisions.cancel()
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+        if not self.dry_run:
+            self.checkpoints.save(self.job.name, after, stats, finished=True)
+        stats["seconds"] = round(time.monotonic() - started, 2)
+        stats["dry_run"] = self.dry_run
+        return stats
+
+def run_cli(job: MaintenanceJob, description: Optional[str] = None) -> Dict:
+    """Shared command line for scripts/: --dry-run, --restart, --page-size, --workers"""
+    parser = argparse.ArgumentParser(description=description or job.name)
+    parser.add_argument("--dry-run", action="store_true", help="Classify and report without writing")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and scan from the start")
+    parser.add_argument("--page-size", type=int, default=settings.MAINTENANCE_PAGE_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.MAINTENANCE_WORKERS)
+    args = parser.parse_args()
+
+    async def main():
+        runner = MaintenanceRunner(job, page_size=args.page_size, workers=args.workers, dry_run=args.dry_run)
+        try:
+            return await runner.run(restart=args.restart)
+        finally:
+            await runner.db.close()
+
+    stats = asyncio.run(main())
+    print(f"{job.name}: {stats}")
+    return stats
@@ -0,0 +1,243 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Prometheus text exposition format, version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers sub-millisecond cache hits up to slow LLM calls and feed downloads
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric(ABC):
+    """A named family of time series, one per combination of label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(suffix, formatted labels, value) for every series"""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+class Gauge(Metric):
+    """Set directly, or read from `function` at scrape time for values owned elsewhere"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.function = function
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        if self.function is not None:
+            try:
+                items = sorted(self.function().items())
+            except Exception:
+                # A broken callback shouldn't take the whole endpoint down
+                items = []
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram; buckets are fixed at creation"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                yield "_bucket", labels, cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield "_count", labels, cumulative
+            yield "_sum", labels, total
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Re-imports (reload, tests) get the series that already exist
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              function: Optional[Callable[[], Dict[LabelValues, float]]] = None) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry served at /metrics. With several uvicorn workers each
+# process exposes its own numbers, so scrape them individually.
+registry = MetricsRegistry()
+
+# --- Ingestion pipeline ---
+PIPELINE_STAGE_SECONDS = registry.histogram(
+    "lexi_pipeline_stage_batch_seconds", "Time a pipeline stage spends handling one batch", ["stage"]
+)
+PIPELINE_STAGE_ITEMS = registry.counter(
+    "lexi_pipeline_stage_items_total", "Items entering and leaving each pipeline stage", ["stage", "direction"]
+)
+PIPELINE_STAGE_ERRORS = registry.counter(
+    "lexi_pipeline_stage_errors_total", "Errors recorded by each pipeline stage", ["stage"]
+)
+AGENT_CYCLE_SECONDS = registry.histogram(
+    "lexi_agent_cycle_seconds", "End-to-end duration of an agent run", ["kind", "status"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+)
+AGENT_ARTICLES_STORED = registry.counter(
+    "lexi_agent_articles_stored_total", "Articles written by agent runs", ["kind"]
+)
+
+# --- Feed fetching ---
+FEED_FETCH_SECONDS = registry.histogram(
+    "lexi_feed_fetch_seconds", "Feed download latency, headers through body", ["source"]
+)
+FEED_FETCH_BYTES = registry.counter(
+    "lexi_feed_fetch_bytes_total", "Feed body bytes downloaded", ["source"]
+)
+FEED_FETCH_RESULTS = registry.counter(
+    "lexi_feed_fetch_total", "Feed fetches by outcome (changed, unchanged, http_error, error)", ["source", "result"]
+)
+
+# --- Parsing and language filter (timed around the worker pool call) ---
+PARSE_SECONDS = registry.histogram(
+    "lexi_parse_seconds", "Feed parse time including cleaning and language filtering", ["parser"]
+)
+LANGUAGE_FILTER_SECONDS = registry.histogram(
+    "lexi_language_filter_seconds", "Language filter time per feed body"
+)
+LANGUAGE_FILTER_ENTRIES = registry.counter(
+    "lexi_language_filter_entries_total", "Feed entries checked by the language filter", ["result"]
+)
+
+# --- LLM analysis ---
+LLM_REQUESTS = registry.counter(
+    "lexi_llm_requests_total", "Gemini requests by call type and outcome (ok, retry, error)", ["call", "outcome"]
+)
+LLM_REQUEST_SECONDS = registry.histogram(
+    "lexi_llm_request_seconds", "Gemini request latency per attempt", ["call"]
+)
+LLM_CACHE_LOOKUPS = registry.counter(
+    "lexi_llm_cache_lookups_total", "Analysis cache lookups", ["result"]
+)
+
+# --- Database ---
+DB_REQUEST_SECONDS = registry.histogram(
+    "lexi_db_request_seconds", "PostgREST round-trip latency", ["db", "operation"]
+)
+DB_REQUESTS = registry.counter(
+    "lexi_db_requests_total", "PostgREST round trips by outcome", ["db", "operation", "outcome"]
+)
+
+# --- HTTP API ---
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "lexi_http_request_seconds", "API request latency by route template", ["method", "route", "status"]
+)
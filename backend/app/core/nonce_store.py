@@ -0,0 +1,96 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+from app.core.config import settings
+
+class NonceStore(ABC):
+    """
+    Login nonces keyed by wallet address. A nonce expires after `ttl` seconds
+    and is single use: take() removes it whether or not the signature checks out,
+    and issuing a new one replaces the previous.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+
+    @abstractmethod
+    def put(self, address: str, nonce: str):
+        ...
+
+    @abstractmethod
+    def take(self, address: str) -> Optional[str]:
+        """Remove and return the address's live nonce, or None"""
+
+class InMemoryNonceStore(NonceStore):
+    """Per-process store; fine for a single worker"""
+
+    def __init__(self, ttl: float, max_entries: int = 100_000):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, address: str, nonce: str):
+        with self._lock:
+            self._entries.pop(address, None)
+            self._entries[address] = (nonce, time.monotonic() + self.ttl)
+            # Oldest first, so abandoned logins are what gets dropped
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def take(self, address: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.pop(address, None)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return entry[0]
+
+class SqliteNonceStore(NonceStore):
+    """Shared by every worker process on the host through one SQLite file"""
+
+    def __init__(self, ttl: float, path: str):
+        super().__init__(ttl)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS login_nonces (
+                address TEXT PRIMARY KEY,
+                nonce TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+
+    def put(self, address: str, nonce: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO login_nonces (address, nonce, expires_at) VALUES (?, ?, ?)",
+                (address, nonce, now + self.ttl)
+            )
+            self._conn.execute("DELETE FROM login_nonces WHERE expires_at < ?", (now,))
+
+    def take(self, address: str) -> Optional[str]:
+        with self._lock:
+            # DELETE ... RETURNING makes read-and-consume atomic across processes
+            row = self._conn.execute(
+                "DELETE FROM login_nonces WHERE address = ? RETURNING nonce, expires_at", (address,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+_nonce_store: Optional[NonceStore] = None
+
+def get_nonce_store() -> NonceStore:
+    global _nonce_store
+    if _nonce_store is None:
+        if settings.NONCE_STORE_BACKEND == "sqlite":
+            _nonce_store = SqliteNonceStore(settings.NONCE_TTL_SECONDS, settings.NONCE_STORE_PATH)
+        else:
+            _nonce_store = InMemoryNonceStore(settings.NONCE_TTL_SECONDS)
+    return _nonce_store
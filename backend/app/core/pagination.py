@@ -0,0 +1,80 @@
+import base64
+import json
+import math
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Hard cap on page size for every paginated endpoint
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(row: Dict) -> str:
+    """Opaque cursor pointing just past `row` in (published_at, id) DESC order"""
+    if row.get("published_at") is None:
+        # Keyset pages never contain these (see apply_keyset)
+        raise ValueError("Cannot page past a row without published_at")
+    raw = json.dumps({"p": row["published_at"], "i": row["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode(cursor: str) -> Dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+
+def _row_id(value) -> str:
+    """Article ids are UUIDs; normalizing through UUID() rules out PostgREST syntax"""
+    return str(uuid.UUID(str(value)))
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Raises ValueError for anything that isn't a cursor we issued.
+    Both values end up inside a PostgREST filter, so they are parsed into a
+    timestamp and a UUID and re-serialized rather than passed through.
+    """
+    try:
+        data = _decode(cursor)
+        published_at = datetime.fromisoformat(data["p"]).isoformat()
+        return published_at, _row_id(data["i"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def encode_search_cursor(rank: float, row_id: str) -> str:
+    """Cursor for relevance-ordered search results: (search_rank, id) DESC"""
+    raw = json.dumps({"r": rank, "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        data = _decode(cursor)
+        rank = float(data["r"])
+        if not math.isfinite(rank):
+            raise ValueError(rank)
+        return rank, _row_id(data["i"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def apply_keyset(query, cursor: Optional[str]):
+    """
+    Order by (published_at, id) DESC and, given a cursor, continue strictly after it.
+    Deep pages cost the same as the first one since Postgres seeks straight to the key.
+    Rows without published_at are left out: they sort first under DESC and have
+    no key a cursor could point past.
+    """
+    query = query.filter("published_at", "not.is", "null")
+    # One order param: the pinned client adds a separate one per order() call
+    query.params = query.params.add("order", "published_at.desc,id.desc")
+    if cursor:
+        published_at, row_id = decode_cursor(cursor)
+        # Quote values: timestamps contain characters PostgREST treats as syntax.
+        # The pinned postgrest client predates or_(), so add the param it would.
+        query.params = query.params.add(
+            "or",
+            f'(published_at.lt."{published_at}",'
+            f'and(published_at.eq."{published_at}",id.lt."{row_id}"))'
+        )
+    return query
+
+def build_page(rows: List[Dict], limit: int) -> Dict:
+    """Rows must come from a query limited to limit + 1 so we can tell if more exist"""
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > limit and items else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,112 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Leaf frames that mean "blocked, not working": the idle event loop, pool threads
+# waiting for work. They stay in the output file but are left out of top().
+IDLE_FRAMES = {
+    ("selectors.py", "select"), ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"), ("connection.py", "_recv"), ("connection.py", "wait"), ("thread.py", "_worker")
+}
+
+class SamplingProfiler:
+    """
+    Statistical profiler for one agent cycle.
+    A daemon thread snapshots every thread's Python stack each `interval`
+    seconds, so overhead stays flat no matter how much code runs, unlike
+    cProfile which hooks every call. Output is in collapsed-stack format
+    ("frame;frame;frame count" per line), which flamegraph.pl and speedscope
+    read directly. Parse workers run in separate processes and are not sampled;
+    their time shows up as the event loop waiting on the pool.
+    """
+
+    MAX_DEPTH = 64
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.idle: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self, own_id: int, thread_names: Dict[int, str]):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+            stack = []
+            while frame is not None and len(stack) < self.MAX_DEPTH:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            stack.append(thread_names.get(thread_id, f"thread-{thread_id}"))
+            key = ";".join(reversed(stack))
+            self.stacks[key] += 1
+            if leaf in IDLE_FRAMES:
+                self.idle[key] += 1
+        self.samples += 1
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            self._sample(own_id, names)
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.monotonic() - self.started_at
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def top(self, limit: int = 15) -> List[Dict]:
+        """Functions by self time: the leaf frame of each sampled stack, idle waits excluded"""
+        leaves: Counter = Counter()
+        for stack, count in (self.stacks - self.idle).items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        return [
+            {"frame": frame, "samples": count, "share": round(count / total, 3)}
+            for frame, count in leaves.most_common(limit)
+        ]
+
+    def write(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        logger.info(f"Profile: {self.samples} samples over {self.duration:.1f}s written to {path}")
+
+    def summary(self, path: Optional[str] = None) -> Dict:
+        return {
+            "path": path,
+            "samples": self.samples,
+            "interval_ms": self.interval * 1000,
+            "duration_seconds": round(self.duration, 2) if self.duration is not None else None,
+            "idle_share": round(sum(self.idle.values()) / (sum(self.stacks.values()) or 1), 3),
+            "top": self.top()
+        }
@@ -1,4 +1,11 @@
 from web3 import Web3
+from fastapi import Header, HTTPException
+from typing import Optional
+from app.core.config import settings
+import base64
+import hashlib
+import hmac
+import json
 import secrets
 import time
 
@@ -15,4 +22,59 @@ def verify_signature(address: str, signature: str, message: str) -> bool:
         return False
 
 def get_login_message(nonce: str) -> str:
-    return f"Login to Nexus Agent. Nonce: {nonce}"
\ No newline at end of file
+    # MUST MATCH FRONTEND EXACTLY (AuthContext.jsx signs this text)
+    return f"Login to Lexi. Nonce: {nonce}"
+
+# --- Session tokens ---
+# Stateless: "<payload>.<signature>", both base64url, signed with HMAC-SHA256 over SECRET_KEY.
+# Verifying one is a hash comparison, so authenticated requests never touch the database.
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+# The value this setting used to default to; tokens signed with it are forgeable by anyone
+_PUBLIC_SECRET_KEYS = {"", "lexi-agent-secret-key"}
+
+def check_secret_key():
+    """Raise unless SECRET_KEY is set to something other than a publicly known value"""
+    if settings.SECRET_KEY in _PUBLIC_SECRET_KEYS:
+        raise RuntimeError("SECRET_KEY is missing or set to the old default; set it to a long random value to sign session tokens")
+
+def _sign(payload: str) -> str:
+    check_secret_key()
+    return _b64encode(hmac.new(settings.SECRET_KEY.encode(), payload.encode(), hashlib.sha256).digest())
+
+def create_session_token(address: str, ttl_seconds: int = settings.SESSION_TTL_SECONDS) -> str:
+    now = int(time.time())
+    payload = _b64encode(json.dumps({"sub": address.lower(), "iat": now, "exp": now + ttl_seconds}, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload)}"
+
+def verify_session_token(token: str) -> Optional[str]:
+    """Return the wallet address the token was issued to, or None if it is forged or expired"""
+    check_secret_key()  # A misconfiguration, not a bad token: let it surface as a 500
+    try:
+        payload, signature = token.split(".")
+        if not hmac.compare_digest(signature, _sign(payload)):
+            return None
+        claims = json.loads(_b64decode(payload))
+        if claims["exp"] < time.time():
+            return None
+        return claims["sub"]
+    except Exception:
+        return None
+
+def require_session(authorization: Optional[str] = Header(None)) -> str:
+    """FastAPI dependency: the wallet address from a valid `Authorization: Bearer <token>` header"""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing session token")
+    address = verify_session_token(authorization[len("Bearer "):])
+    if address is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired session token")
+    return address
+
+def ensure_owner(session_address: str, wallet_address: str):
+    if session_address != wallet_address.lower():
+        raise HTTPException(status_code=403, detail="Session does not match wallet address")
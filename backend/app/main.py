@@ -1,11 +1,17 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
-import asyncio
 import logging
+import time
 from app.routers import feed, user, agent
 from app.core.config import settings
-from app.agents.runner import start_scheduler, run_scheduler
+from app.core.metrics import CONTENT_TYPE, HTTP_REQUEST_SECONDS, registry
+from app.agents.runner import start_scheduler, stop_scheduler
+from app.agents.parse_worker import shutdown_parse_pool
+from app.core.http_client import close_http_clients
+from app.core.database import close_databases
+from app.core.security import check_secret_key
 
 # logging block
 logging.basicConfig(
@@ -17,17 +23,21 @@ logging.basicConfig(
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Start the agent scheduler
+    # Startup: Refuse to serve with a session signing key anyone could know
+    check_secret_key()
+
+    # Start the agent scheduler (its jobs run as tasks on this loop)
     print("Starting Lexi Agent Scheduler...")
     start_scheduler()
     
-    # Start the scheduler in background
-    asyncio.create_task(run_scheduler())
-    
     yield  # App runs here
     
-    # Shutdown: Clean up resources
+    # Shutdown: Cancel scheduled and in-flight agent runs, then clean up resources
     print("Shutting down Lexi Agent...")
+    await stop_scheduler()
+    shutdown_parse_pool()
+    await close_http_clients()
+    await close_databases()
 
 app = FastAPI(
     title="Lexi Agent API",
@@ -45,6 +55,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, so ids and cursors don't explode cardinality
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status)
+        )
+
 # Include routers
 app.include_router(feed.router, prefix="/api/v1")
 app.include_router(user.router, prefix="/api/v1")
@@ -59,6 +87,12 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "lexi-agent-api"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus text exposition of pipeline, LLM, database and API metrics"""
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
 @app.get("/api")
 async def api_root():
     return {"message": "Lexi Agent API", "endpoints": {
@@ -1,11 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ArticleBase(BaseModel):
     id: str
     title: str
     url: str
+    canonical_url: Optional[str] = None
     summary: Optional[str] = None
     source: Optional[str] = None
     ecosystem_tag: Optional[str] = None
@@ -24,6 +25,10 @@ class Article(ArticleBase):
     class Config:
         from_attributes = True
 
+class ArticlePage(BaseModel):
+    items: List[Article]
+    next_cursor: Optional[str] = None
+
 class UserBase(BaseModel):
     wallet_address: str
 
@@ -37,6 +42,10 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+class DigestSettings(BaseModel):
+    email: Optional[str] = Field(None, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+    enabled: bool = True
+
 class BookmarkBase(BaseModel):
     user_address: str
     article_id: str
@@ -49,4 +58,11 @@ class Bookmark(BookmarkBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BookmarkBatch(BaseModel):
+    user_address: str
+    article_ids: List[str] = Field(..., min_length=1, max_length=100)
+
+class BookmarkIds(BaseModel):
+    article_ids: List[str]
\ No newline at end of file
@@ -0,0 +1,6 @@
+# Repositories package initialization
+from .articles import ArticleRepository
+from .users import UserRepository
+from .bookmarks import BookmarkRepository
+
+__all__ = ['ArticleRepository', 'UserRepository', 'BookmarkRepository']
@@ -0,0 +1,105 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.core.database import Database, get_database
+from app.core.pagination import apply_keyset
+
+logger = logging.getLogger(__name__)
+
+# PostgREST encodes `in_` filters into the query string, so keep lookups well under URL limits
+LOOKUP_CHUNK_SIZE = 100
+INSERT_CHUNK_SIZE = 200
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+class ArticleRepository:
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or get_database("api")
+
+    async def page(self, ecosystem: Optional[str], limit: int, cursor: Optional[str]) -> List[Dict]:
+        """One keyset page; fetches limit + 1 rows so callers can tell if more exist"""
+        query = apply_keyset(self.db.table("articles").select("*"), cursor).limit(limit + 1)
+        if ecosystem:
+            query = query.eq("ecosystem_tag", ecosystem)
+        response = await self.db.execute("articles.page", query)
+        return response.data or []
+
+    async def search(self, q: str, ecosystem: Optional[str], page_size: int,
+                     after_rank: Optional[float], after_id: Optional[str]) -> List[Dict]:
+        """Rows of {article, search_rank} from the search_articles function"""
+        params = {
+            "q": q,
+            "ecosystem": ecosystem,
+            "page_size": page_size,
+            "after_rank": after_rank,
+            "after_id": after_id
+        }
+        response = await self.db.execute("articles.search", self.db.rpc("search_articles", params))
+        return response.data or []
+
+    async def exists(self, article_id: str) -> bool:
+        response = await self.db.execute(
+            "articles.exists", self.db.table("articles").select("id").eq("id", article_id).limit(1)
+        )
+        return bool(response.data)
+
+    async def count(self) -> Optional[int]:
+        response = await self.db.execute(
+            "articles.count", self.db.table("articles").select("id", count="exact").limit(1)
+        )
+        return response.count
+
+    async def recent_processed(self, since: str, limit: int, columns: str = "*") -> List[Dict]:
+        query = self.db.table("articles")\
+            .select(columns)\
+            .gte("created_at", since)\
+            .eq("is_processed", True)\
+            .order("legitimacy_score", desc=True)\
+            .limit(limit)
+        response = await self.db.execute("articles.recent_processed", query)
+        return response.data or []
+
+    async def existing_urls(self, urls: List[str], column: str = "canonical_url",
+                            chunk_size: int = LOOKUP_CHUNK_SIZE) -> Set[str]:
+        """Return the subset of urls already stored in `column`, one round trip per chunk"""
+        existing = set()
+        unique_urls = list(dict.fromkeys(urls))
+        for chunk in _chunks(unique_urls, chunk_size):
+            response = await self.db.execute(
+                "articles.existing_urls", self.db.table("articles").select(column).in_(column, chunk)
+            )
+            existing.update(row[column] for row in response.data or [])
+        return existing
+
+    async def store_many(self, payloads: List[Dict], chunk_size: int = INSERT_CHUNK_SIZE) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Bulk upsert article rows keyed on canonical_url.
+        Returns (stored_rows, failures) where failures holds {"url", "error"} per rejected row.
+        A failed chunk is retried row by row so one bad payload doesn't sink the batch.
+        """
+        stored: List[Dict] = []
+        failures: List[Dict] = []
+
+        for chunk in _chunks(payloads, chunk_size):
+            try:
+                result = await self.db.execute(
+                    "articles.upsert",
+                    self.db.table("articles").upsert(chunk, on_conflict="canonical_url", ignore_duplicates=True)
+                )
+                stored.extend(result.data or [])
+                continue
+            except Exception as e:
+                logger.warning(f"Bulk insert of {len(chunk)} articles failed, retrying per row: {e}")
+
+            for payload in chunk:
+                try:
+                    result = await self.db.execute(
+                        "articles.upsert",
+                        self.db.table("articles").upsert(payload, on_conflict="canonical_url", ignore_duplicates=True)
+                    )
+                    stored.extend(result.data or [])
+                except Exception as e:
+                    failures.append({"url": payload.get("url"), "error": str(e)})
+
+        return stored, failures
@@ -0,0 +1,47 @@
+from typing import Dict, List, Optional
+from app.core.database import Database, get_database
+
+class BookmarkRepository:
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or get_database("api")
+
+    async def save_many(self, user_address: str, article_ids: List[str]) -> List[Dict]:
+        """
+        Upsert on the (user_address, article_id) unique constraint: one round trip,
+        and saving an existing bookmark returns the existing row. An unknown article
+        fails the foreign key (Postgres error 23503).
+        """
+        rows = [{"user_address": user_address, "article_id": article_id} for article_id in dict.fromkeys(article_ids)]
+        response = await self.db.execute(
+            "bookmarks.save",
+            self.db.table("saved_bookmarks").upsert(rows, on_conflict="user_address,article_id")
+        )
+        return response.data or []
+
+    async def for_user(self, user_address: str) -> List[Dict]:
+        response = await self.db.execute(
+            "bookmarks.for_user",
+            self.db.table("saved_bookmarks").select("*, articles(*)").eq("user_address", user_address)
+        )
+        return response.data or []
+
+    async def article_ids(self, user_address: str) -> List[str]:
+        response = await self.db.execute(
+            "bookmarks.article_ids",
+            self.db.table("saved_bookmarks").select("article_id").eq("user_address", user_address)
+        )
+        return [row["article_id"] for row in response.data or []]
+
+    async def delete(self, bookmark_id: str, user_address: str):
+        await self.db.execute(
+            "bookmarks.delete",
+            self.db.table("saved_bookmarks").delete().eq("id", bookmark_id).eq("user_address", user_address)
+        )
+
+    async def delete_many(self, user_address: str, article_ids: List[str]) -> int:
+        response = await self.db.execute(
+            "bookmarks.delete_many",
+            self.db.table("saved_bookmarks").delete()
+                .eq("user_address", user_address).in_("article_id", list(dict.fromkeys(article_ids)))
+        )
+        return len(response.data or [])
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from postgrest.types import ReturnMethod
+from app.core.database import Database, get_database
+
+class UserRepository:
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or get_database("api")
+
+    async def record_login(self, address: str):
+        """Create the user on first login, otherwise bump last_login; one round trip"""
+        await self.db.execute(
+            "users.record_login",
+            self.db.table("users").upsert(
+                {"wallet_address": address, "last_login": datetime.now(timezone.utc).isoformat()},
+                on_conflict="wallet_address",
+                # The anon key can't read every column (see migrations/004), so don't ask for the row back
+                returning=ReturnMethod.minimal
+            )
+        )
+
+    async def digest_email(self, address: str) -> Optional[str]:
+        """The stored digest address, if any; needs the service database"""
+        response = await self.db.execute(
+            "users.digest_email",
+            self.db.table("users").select("email").eq("wallet_address", address).limit(1)
+        )
+        return response.data[0].get("email") if response.data else None
+
+    async def set_digest(self, address: str, email: Optional[str], enabled: bool) -> Dict:
+        """Opt in or out of the email digest; email=None keeps the stored address. Needs the service database"""
+        row = {"wallet_address": address, "digest_enabled": enabled}
+        if email is not None:
+            row["email"] = email
+        response = await self.db.execute(
+            "users.set_digest", self.db.table("users").upsert(row, on_conflict="wallet_address")
+        )
+        return (response.data or [{}])[0]
+
+    async def digest_recipients(self, after_address: Optional[str], page_size: int) -> List[Dict]:
+        """One keyset page of {wallet_address, email, ecosystems}; see migrations/004_digest_subscriptions.sql"""
+        response = await self.db.execute(
+            "users.digest_recipients",
+            self.db.rpc("digest_recipients", {"after_address": after_address, "page_size": page_size})
+        )
+        return response.data or []
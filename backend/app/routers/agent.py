@@ -1,26 +1,41 @@
-from fastapi import APIRouter, HTTPException
-from app.agents.runner import run_agent
+from fastapi import APIRouter, HTTPException, Query
+from app.agents.runner import get_job_manager, get_scheduler
 
 router = APIRouter(prefix="/agent", tags=["agent"])
 
-@router.post("/run")
-async def trigger_agent():
-    """Manually trigger the content scraping agent"""
-    try:
-        result = await run_agent()
-        return {
-            "status": "success", 
-            "message": "Content scraping agent executed successfully",
-            "articles_stored": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Agent execution failed: {str(e)}")
+@router.post("/run", status_code=202)
+async def trigger_agent(
+    kind: str = Query("deep", pattern="^(quick|deep)$", description="quick: due feeds only; deep: every feed"),
+    profile: bool = Query(False, description="Sample stacks during this run; the summary appears in its status")
+):
+    """
+    Queue a content scraping run and return its job id immediately.
+    Poll /agent/status/{job_id} for progress. If a run of this kind is already
+    queued or running, that job is returned instead of starting another.
+    """
+    job, created = get_job_manager().submit(kind, profile=profile)
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "created": created,
+        "status_url": f"/api/v1/agent/status/{job.id}"
+    }
 
 @router.get("/status")
 async def agent_status():
     """Get agent status"""
     return {
-        "status": "running", 
-        "schedule": "every_30_minutes",
+        "status": get_job_manager().state(),
+        "jobs": get_scheduler().snapshot(),
+        "recent_runs": get_job_manager().recent(),
         "description": "Web3 content scraping agent"
-    }
\ No newline at end of file
+    }
+
+@router.get("/status/{job_id}")
+async def agent_job_status(job_id: str):
+    """Live progress of one run: stage, fetched/analyzed/stored counts, errors and time per stage"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found (it may have aged out of history)")
+    return job.snapshot()
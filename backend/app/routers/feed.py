@@ -1,37 +1,66 @@
 from fastapi import APIRouter, HTTPException, Query
-from app.core.config import settings
-from app.models.schemas import Article
-from typing import List
-from supabase import create_client
+from app.core.cache import feed_response_cache
+from app.core.pagination import (
+    MAX_PAGE_SIZE, build_page, decode_cursor, decode_search_cursor, encode_search_cursor
+)
+from app.models.schemas import ArticlePage
+from app.repositories import ArticleRepository
+from typing import Optional
 
 router = APIRouter(prefix="/feed", tags=["feed"])
-supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+articles = ArticleRepository()
 
-@router.get("/", response_model=List[Article])
+def _validate_cursor(cursor: Optional[str]):
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("/", response_model=ArticlePage)
 async def get_feed(
     ecosystem: str = Query(None, description="Filter by ecosystem"),
-    limit: int = Query(30, description="Number of articles to return")
+    limit: int = Query(30, ge=1, le=MAX_PAGE_SIZE, description="Number of articles to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
+    _validate_cursor(cursor)
     try:
-        query = supabase.table("articles").select("*").order("published_at", desc=True).limit(limit)
-        
-        if ecosystem and ecosystem.lower() != "all":
-            query = query.eq("ecosystem_tag", ecosystem.lower())
-        
-        response = query.execute()
-        return response.data
+        ecosystem_filter = ecosystem.lower() if ecosystem and ecosystem.lower() != "all" else None
+
+        async def load():
+            return build_page(await articles.page(ecosystem_filter, limit, cursor), limit)
+
+        return await feed_response_cache.get_or_load((ecosystem_filter, limit, cursor), load)
     except Exception as e:
         print(f"Feed Error: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching feed: {str(e)}")
 
-@router.get("/search")
-async def search_articles(q: str = Query(..., description="Search query")):
+@router.get("/search", response_model=ArticlePage)
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    ecosystem: str = Query(None, description="Filter by ecosystem"),
+    limit: int = Query(30, ge=1, le=MAX_PAGE_SIZE, description="Number of articles to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """
+    Ranked full-text search (title weighted above summary) with prefix matching.
+    Backed by the search_articles Postgres function; see migrations/001_article_search.sql.
+    """
+    after_rank, after_id = None, None
+    if cursor:
+        try:
+            after_rank, after_id = decode_search_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
     try:
-        response = supabase.table("articles")\
-            .select("*")\
-            .or_(f"title.ilike.%{q}%,summary.ilike.%{q}%")\
-            .order("published_at", desc=True)\
-            .execute()
-        return response.data
+        ecosystem_filter = ecosystem.lower() if ecosystem and ecosystem.lower() != "all" else None
+        rows = await articles.search(q, ecosystem_filter, limit + 1, after_rank, after_id)
+
+        items = [row["article"] for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit and items:
+            next_cursor = encode_search_cursor(rows[limit - 1]["search_rank"], items[-1]["id"])
+        return {"items": items, "next_cursor": next_cursor}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error searching articles: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error searching articles: {str(e)}")
@@ -1,19 +1,20 @@
 from fastapi import APIRouter
-from supabase import create_client
-from app.core.config import settings
+from app.core.database import database_stats
+from app.repositories import ArticleRepository
 
 router = APIRouter(prefix="/test", tags=["test"])
-supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+articles = ArticleRepository()
 
 @router.get("/db-check")
 async def test_database():
     """Test database connection"""
     try:
-        result = supabase.table("articles").select("count", count="exact").execute()
+        count = await articles.count()
         return {
             "status": "success",
             "database": "connected",
-            "articles_count": result.count
+            "articles_count": count,
+            "query_latency": database_stats()
         }
     except Exception as e:
         return {
@@ -39,12 +40,16 @@ async def list_routes():
                 "POST /api/v1/user/auth/nonce",
                 "POST /api/v1/user/auth/verify",
                 "POST /api/v1/user/bookmarks",
+                "POST /api/v1/user/bookmarks/batch",
+                "POST /api/v1/user/bookmarks/batch-delete",
                 "GET /api/v1/user/{wallet_address}/bookmarks",
+                "GET /api/v1/user/{wallet_address}/bookmarks/ids",
                 "DELETE /api/v1/user/bookmarks/{bookmark_id}"
             ],
             "agent": [
                 "POST /api/v1/agent/run",
-                "GET /api/v1/agent/status"
+                "GET /api/v1/agent/status",
+                "GET /api/v1/agent/status/{job_id}"
             ]
         }
     }
\ No newline at end of file
@@ -1,15 +1,27 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
-from app.models.schemas import User, UserCreate, Bookmark, BookmarkCreate
-from app.core.security import verify_signature, generate_nonce
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Body
+from app.models.schemas import User, UserCreate, Bookmark, BookmarkCreate, BookmarkBatch, BookmarkIds, DigestSettings
 from app.core.config import settings
-from supabase import create_client
+from app.core.database import get_database
+from app.core.nonce_store import get_nonce_store
+from app.core.security import create_session_token, ensure_owner, get_login_message, require_session
+from app.repositories import BookmarkRepository, UserRepository
+from postgrest.exceptions import APIError
 from eth_account.messages import encode_defunct
 from eth_account import Account
 from pydantic import BaseModel
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/user", tags=["user"])
-supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+users = UserRepository()
+# Digest settings touch users.email, which only the service role can read (migrations/004)
+subscribers = UserRepository(get_database("service"))
+bookmarks = BookmarkRepository()
+
+# Postgres foreign_key_violation: the bookmarked article doesn't exist
+FOREIGN_KEY_VIOLATION = "23503"
 
 # Request Models
 class AuthRequest(BaseModel):
@@ -19,97 +31,133 @@ class VerifyRequest(BaseModel):
     wallet_address: str
     signature: str
 
+async def _record_login(address: str):
+    try:
+        await users.record_login(address)
+    except Exception as e:
+        logger.warning(f"Could not record login for {address}: {e}")
+
 @router.post("/auth/nonce")
 async def get_nonce(request: AuthRequest):
     address = request.wallet_address.lower()
-    
-    # 1. Check if user exists
-    user = supabase.table("users").select("*").eq("wallet_address", address).execute()
-    
     nonce = str(uuid.uuid4())
     
-    if not user.data:
-        # Create new user
-        supabase.table("users").insert({
-            "wallet_address": address,
-            "nonce": nonce
-        }).execute()
-    else:
-        # Update nonce
-        supabase.table("users").update({"nonce": nonce}).eq("wallet_address", address).execute()
+    # Replaces any earlier nonce for this address; expires after NONCE_TTL_SECONDS
+    get_nonce_store().put(address, nonce)
         
     return {"nonce": nonce}
 
 @router.post("/auth/verify")
-async def verify_signature(request: VerifyRequest):
+async def verify_signature(request: VerifyRequest, background_tasks: BackgroundTasks):
     address = request.wallet_address.lower()
     
-    # 1. Get user and nonce from DB
-    user_response = supabase.table("users").select("nonce").eq("wallet_address", address).execute()
+    # 1. Consume the nonce: single use, so a signature can't be replayed even if it fails here
+    stored_nonce = get_nonce_store().take(address)
     
-    if not user_response.data:
-        raise HTTPException(status_code=400, detail="User not found")
-        
-    stored_nonce = user_response.data[0]['nonce']
+    if stored_nonce is None:
+        raise HTTPException(status_code=400, detail="Nonce expired or not requested")
     
     # 2. Reconstruct the EXACT message the frontend signed
-    # MUST MATCH FRONTEND EXACTLY (Spaces, punctuation, everything)
-    message_text = f"Login to Lexi. Nonce: {stored_nonce}"
+    message_text = get_login_message(stored_nonce)
     
     try:
         # 3. Verify Signature
         # Encode as EIP-191 (Ethereum standard)
         encoded_msg = encode_defunct(text=message_text)
         recovered_address = Account.recover_message(encoded_msg, signature=request.signature)
-        
-        if recovered_address.lower() == address:
-            # Success! Generate a session token or just return success
-            # Ideally, clear the nonce here to prevent replay attacks
-            new_nonce = str(uuid.uuid4())
-            supabase.table("users").update({"nonce": new_nonce}).eq("wallet_address", address).execute()
-            
-            return {
-                "authenticated": True, 
-                "user": {"address": address}
-            }
-        else:
-            raise HTTPException(status_code=401, detail="Invalid signature")
-            
     except Exception as e:
         print(f"Auth Error: {e}")
         raise HTTPException(status_code=401, detail="Signature verification failed")
+        
+    if recovered_address.lower() != address:
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    # Bookkeeping only; runs after the response is sent
+    background_tasks.add_task(_record_login, address)
+    
+    return {
+        "authenticated": True, 
+        "user": {"address": address},
+        "token": create_session_token(address),
+        "expires_in": settings.SESSION_TTL_SECONDS
+    }
 
 @router.post("/bookmarks", response_model=Bookmark)
-async def create_bookmark(bookmark: BookmarkCreate):
+async def create_bookmark(bookmark: BookmarkCreate, session_address: str = Depends(require_session)):
+    ensure_owner(session_address, bookmark.user_address)
     try:
-        # Check if article exists
-        article = supabase.table("articles").select("id").eq("id", bookmark.article_id).execute()
-        if not article.data:
+        rows = await bookmarks.save_many(bookmark.user_address, [bookmark.article_id])
+        return rows[0]
+    except APIError as e:
+        if e.code == FOREIGN_KEY_VIOLATION:
             raise HTTPException(status_code=404, detail="Article not found")
-        
-        # Check if bookmark already exists
-        existing = supabase.table("saved_bookmarks").select("*").eq("user_address", bookmark.user_address).eq("article_id", bookmark.article_id).execute()
-        
-        if existing.data:
-            return existing.data[0]
-        
-        response = supabase.table("saved_bookmarks").insert(bookmark.dict()).execute()
-        return response.data[0]
+        raise HTTPException(status_code=500, detail=f"Error creating bookmark: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating bookmark: {str(e)}")
 
+@router.post("/bookmarks/batch", response_model=list[Bookmark])
+async def create_bookmarks(batch: BookmarkBatch, session_address: str = Depends(require_session)):
+    """Save up to 100 articles in one request; already-saved ones are returned as they are"""
+    ensure_owner(session_address, batch.user_address)
+    try:
+        return await bookmarks.save_many(batch.user_address, batch.article_ids)
+    except APIError as e:
+        if e.code == FOREIGN_KEY_VIOLATION:
+            raise HTTPException(status_code=404, detail="One or more articles not found")
+        raise HTTPException(status_code=500, detail=f"Error creating bookmarks: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating bookmarks: {str(e)}")
+
+@router.post("/bookmarks/batch-delete")
+async def delete_bookmarks(batch: BookmarkBatch, session_address: str = Depends(require_session)):
+    """Remove the user's bookmarks on the given articles in one request"""
+    ensure_owner(session_address, batch.user_address)
+    try:
+        removed = await bookmarks.delete_many(batch.user_address, batch.article_ids)
+        return {"status": "success", "removed": removed}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error deleting bookmarks: {str(e)}")
+
 @router.get("/{wallet_address}/bookmarks", response_model=list[Bookmark])
-async def get_user_bookmarks(wallet_address: str):
+async def get_user_bookmarks(wallet_address: str, session_address: str = Depends(require_session)):
+    ensure_owner(session_address, wallet_address)
     try:
-        response = supabase.table("saved_bookmarks").select("*, articles(*)").eq("user_address", wallet_address).execute()
-        return response.data
+        return await bookmarks.for_user(wallet_address)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching bookmarks: {str(e)}")
 
+@router.get("/{wallet_address}/bookmarks/ids", response_model=BookmarkIds)
+async def get_user_bookmark_ids(wallet_address: str, session_address: str = Depends(require_session)):
+    """Just the bookmarked article ids, for marking saved cards without loading the articles"""
+    ensure_owner(session_address, wallet_address)
+    try:
+        return {"article_ids": await bookmarks.article_ids(wallet_address)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching bookmarks: {str(e)}")
+
+@router.put("/{wallet_address}/digest")
+async def update_digest(wallet_address: str, digest: DigestSettings, session_address: str = Depends(require_session)):
+    """Opt in to (or out of) the daily email digest, personalized by the user's bookmarks"""
+    ensure_owner(session_address, wallet_address)
+    address = wallet_address.lower()
+    try:
+        # Re-enabling without an address only works if one is already stored; check before writing anything
+        can_update = digest.email is not None or not digest.enabled or bool(await subscribers.digest_email(address))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating digest: {str(e)}")
+    if not can_update:
+        raise HTTPException(status_code=400, detail="An email address is required to enable the digest")
+    try:
+        row = await subscribers.set_digest(address, digest.email, digest.enabled)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating digest: {str(e)}")
+    return {"enabled": row.get("digest_enabled", digest.enabled), "email": row.get("email")}
+
 @router.delete("/bookmarks/{bookmark_id}")
-async def delete_bookmark(bookmark_id: str, wallet_address: str):
+async def delete_bookmark(bookmark_id: str, wallet_address: str, session_address: str = Depends(require_session)):
+    ensure_owner(session_address, wallet_address)
     try:
-        supabase.table("saved_bookmarks").delete().eq("id", bookmark_id).eq("user_address", wallet_address).execute()
+        await bookmarks.delete(bookmark_id, wallet_address)
         return {"status": "success"}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error deleting bookmark: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error deleting bookmark: {str(e)}")
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Dict
+
+_IDS = re.compile(r"\[id: ([^\]]+)\]")
+_TAGS = ["Ethereum", "Solana", "Base", "DeFi", "NFT", "Regulation", "General"]
+
+class FakeApiError(Exception):
+    """Shaped like google.api_core errors: the HTTP status is on `.code`"""
+
+    def __init__(self, code: int):
+        super().__init__(f"{code} fake Gemini error")
+        self.code = code
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGemini:
+    """
+    Stand-in for genai.GenerativeModel. Answers every article in the prompt with
+    a valid analysis after `latency` seconds (±jitter), plus `per_item_latency`
+    per article in batch prompts. A share `error_rate` of calls raises a
+    retryable 503, and `malformed_rate` of batch answers drops one article so
+    the executor's single-item fallback gets exercised too.
+    """
+
+    def __init__(self, latency: float = 0.8, per_item_latency: float = 0.05, jitter: float = 0.3,
+                 error_rate: float = 0.02, malformed_rate: float = 0.05, seed: int = 11):
+        self.latency = latency
+        self.per_item_latency = per_item_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.rng = random.Random(seed)
+        self.stats = {"calls": 0, "batch_calls": 0, "errors": 0, "articles": 0}
+
+    def _answer(self) -> Dict:
+        return {
+            "summary": "A benchmark summary sentence. A second benchmark sentence.",
+            "sentiment_score": self.rng.randint(1, 10),
+            "ecosystem_tag": self.rng.choice(_TAGS),
+            "legitimacy_score": round(self.rng.random(), 2)
+        }
+
+    def _delay(self, items: int) -> float:
+        base = self.latency + self.per_item_latency * max(0, items - 1)
+        return max(0.0, base * self.rng.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def _respond(self, prompt: str) -> str:
+        self.stats["calls"] += 1
+        if self.rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            raise FakeApiError(503)
+        ids = _IDS.findall(prompt)
+        if not ids:
+            self.stats["articles"] += 1
+            return json.dumps(self._answer())
+
+        self.stats["batch_calls"] += 1
+        self.stats["articles"] += len(ids)
+        if len(ids) > 1 and self.rng.random() < self.malformed_rate:
+            ids = ids[:-1]
+        return "```json\n" + json.dumps([{"id": article_id, **self._answer()} for article_id in ids]) + "\n```"
+
+    def model(self, model_name: str = "", **kwargs) -> "FakeModel":
+        return FakeModel(self)
+
+    def install(self):
+        """Route every genai.GenerativeModel(...) in the app to this fake"""
+        from app.agents import processor
+        processor.genai.GenerativeModel = self.model
+
+class FakeModel:
+    def __init__(self, backend: FakeGemini):
+        self.backend = backend
+
+    async def generate_content_async(self, prompt: str) -> _Response:
+        await asyncio.sleep(self.backend._delay(len(_IDS.findall(prompt)) or 1))
+        return _Response(self.backend._respond(prompt))
+
+    def generate_content(self, prompt: str) -> _Response:
+        time.sleep(self.backend._delay(len(_IDS.findall(prompt)) or 1))
+        return _Response(self.backend._respond(prompt))
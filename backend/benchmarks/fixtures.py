@@ -0,0 +1,125 @@
+import glob
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, List, NamedTuple
+from xml.sax.saxutils import escape
+
+# Drop recorded feed captures (*.xml) here to serve them alongside the generated ones
+RECORDED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# English filler so entries pass the language filter's stopword tier like real posts do
+_STOPWORDS = "the and of to is that for it with was are be this by from have has or an but not will".split()
+_TOPICS = [
+    "ethereum", "solana", "rollup", "validator", "staking", "bridge", "governance", "liquidity",
+    "oracle", "wallet", "zk", "proof", "sequencer", "restaking", "airdrop", "stablecoin", "lending",
+    "mev", "blob", "client", "upgrade", "testnet", "mainnet", "protocol", "treasury", "audit",
+    "exploit", "token", "market", "regulation", "custody", "layer", "settlement", "consensus"
+]
+_VERBS = ["launches", "ships", "proposes", "delays", "expands", "audits", "pauses", "funds", "tests", "explains"]
+
+class FeedFixture(NamedTuple):
+    name: str
+    body: bytes
+    entries: int
+    tag: str
+    delay: float = 0.0  # seconds before the response starts
+    chunk_delay: float = 0.0  # seconds between body chunks, to emulate a slow trickle
+
+def _sentence(rng: random.Random, words: int) -> str:
+    out = []
+    for i in range(words):
+        out.append(rng.choice(_STOPWORDS) if i % 3 == 1 else rng.choice(_TOPICS))
+    return " ".join(out).capitalize() + "."
+
+def _entry(rng: random.Random, feed: str, index: int, published: datetime, paragraphs: int) -> Dict:
+    # Random topic triples keep titles distinct enough for the near-duplicate filter
+    title = f"{rng.choice(_TOPICS).title()} {rng.choice(_VERBS)} {' '.join(rng.sample(_TOPICS, 3))} #{index}"
+    body = "".join(f"<p>{_sentence(rng, rng.randint(18, 40))} {_sentence(rng, rng.randint(12, 30))}</p>" for _ in range(paragraphs))
+    return {
+        "title": title,
+        "link": f"https://bench.lexi.local/{feed}/posts/{index}",
+        "published": published - timedelta(minutes=17 * index),
+        "html": body
+    }
+
+def render_rss(feed: str, entries: List[Dict]) -> bytes:
+    items = "".join(
+        f"""
+    <item>
+      <title>{escape(e['title'])}</title>
+      <link>{e['link']}</link>
+      <guid>{e['link']}</guid>
+      <pubDate>{format_datetime(e['published'])}</pubDate>
+      <description>{escape(e['html'])}</description>
+    </item>"""
+        for e in entries
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>{feed}</title>
+    <link>https://bench.lexi.local/{feed}</link>
+    <description>Benchmark fixture</description>{items}
+  </channel>
+</rss>""".encode("utf-8")
+
+def render_atom(feed: str, entries: List[Dict]) -> bytes:
+    items = "".join(
+        f"""
+  <entry>
+    <title>{escape(e['title'])}</title>
+    <link href="{e['link']}"/>
+    <id>{e['link']}</id>
+    <updated>{e['published'].isoformat()}</updated>
+    <content type="html">{escape(e['html'])}</content>
+  </entry>"""
+        for e in entries
+    )
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>{feed}</title>
+  <id>https://bench.lexi.local/{feed}</id>
+  <updated>{datetime.now(timezone.utc).isoformat()}</updated>{items}
+</feed>""".encode("utf-8")
+
+def generate_fixtures(
+    feeds: int = 20,
+    entries: int = 20,
+    large_feeds: int = 1,
+    large_entries: int = 1000,
+    slow_feeds: int = 2,
+    slow_delay: float = 2.0,
+    web3_share: float = 0.3,
+    seed: int = 7
+) -> List[FeedFixture]:
+    """
+    Deterministic set of feeds: regular ones, `large_feeds` very long ones and
+    `slow_feeds` that stall before responding and trickle their body. Roughly
+    `web3_share` of feeds use the generic "web3" tag, which sends their entries
+    to the LLM. Recorded captures in RECORDED_DIR are added as-is.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    fixtures = []
+    total = feeds + large_feeds + slow_feeds
+    for i in range(total):
+        name = f"feed-{i:03d}"
+        count = large_entries if i < large_feeds else entries
+        slow = large_feeds <= i < large_feeds + slow_feeds
+        tag = "web3" if rng.random() < web3_share else rng.choice(["ethereum", "solana", "base", "research"])
+        items = [_entry(rng, name, j, now, paragraphs=rng.randint(2, 6)) for j in range(count)]
+        render = render_atom if i % 2 else render_rss
+        fixtures.append(FeedFixture(
+            name, render(name, items), count, tag,
+            delay=slow_delay if slow else 0.0,
+            chunk_delay=slow_delay / 10 if slow else 0.0
+        ))
+
+    for path in sorted(glob.glob(os.path.join(RECORDED_DIR, "*.xml"))):
+        with open(path, "rb") as f:
+            body = f.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        fixtures.append(FeedFixture(name, body, body.count(b"<item") + body.count(b"<entry"), "web3"))
+    return fixtures
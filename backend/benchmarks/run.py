@@ -0,0 +1,346 @@
+"""
+Offline benchmark for the ingestion pipeline and the feed/search API.
+
+Everything the agent talks to is replaced by a local stand-in: fixture feeds
+over HTTP (including a very large feed and slow, trickling ones), a fake
+Gemini with configurable latency and error rate, and an in-memory PostgREST
+in place of Supabase. Nothing leaves the machine, so runs are comparable.
+
+From backend/:
+
+    python -m benchmarks.run                        # default scenario
+    python -m benchmarks.run --save bench.json      # keep results as a baseline
+    python -m benchmarks.run --compare bench.json   # exit 1 on a regression beyond --tolerance
+
+Reported: articles/s and end-to-end time for a cold cycle and a repeat cycle
+(nothing new), peak RSS, and p50/p99 latency for /feed and /feed/search under
+concurrent load. API requests go through the ASGI app in-process, so the
+numbers cover routing, validation, caching and the database client but not
+uvicorn's socket handling.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fixtures import generate_fixtures
+from benchmarks.servers import serve_in_background
+
+# (dotted result path, True if higher is better)
+TRACKED = [
+    ("ingestion.articles_per_second", True),
+    ("ingestion.cold_cycle_seconds", False),
+    ("ingestion.repeat_cycle_seconds", False),
+    ("api.feed.p50_ms", False),
+    ("api.feed.p99_ms", False),
+    ("api.search.p50_ms", False),
+    ("api.search.p99_ms", False),
+    ("memory.peak_rss_mb", False),
+]
+
+SEARCH_QUERIES = ["ethereum", "rollup", "stak", "zk proof", "bridge exploit", "solana validator",
+                  "restaking", "governance treasury", "blob", "liquid", "mev", "stablecoin regulation"]
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline Lexi benchmark")
+    fixtures = parser.add_argument_group("feeds")
+    fixtures.add_argument("--feeds", type=int, default=20, help="regular fixture feeds")
+    fixtures.add_argument("--entries", type=int, default=25, help="entries per regular feed")
+    fixtures.add_argument("--large-feeds", type=int, default=1)
+    fixtures.add_argument("--large-entries", type=int, default=1000)
+    fixtures.add_argument("--slow-feeds", type=int, default=2)
+    fixtures.add_argument("--slow-delay", type=float, default=2.0, help="seconds a slow feed stalls, then as long again to trickle")
+    fixtures.add_argument("--web3-share", type=float, default=0.3, help="share of feeds whose entries go to the LLM")
+    llm = parser.add_argument_group("fake Gemini")
+    llm.add_argument("--llm-latency", type=float, default=0.8)
+    llm.add_argument("--llm-error-rate", type=float, default=0.02)
+    llm.add_argument("--llm-rpm", type=float, default=600, help="ANALYSIS_REQUESTS_PER_MINUTE for the run")
+    db = parser.add_argument_group("database")
+    db.add_argument("--db-latency-ms", type=float, default=2.0, help="added to every PostgREST round trip")
+    db.add_argument("--seed-articles", type=int, default=5000, help="extra rows stored before the API load")
+    api = parser.add_argument_group("API load")
+    api.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    api.add_argument("--concurrency", type=int, default=32)
+    api.add_argument("--no-response-cache", action="store_true", help="bypass the /feed response cache")
+    out = parser.add_argument_group("output")
+    out.add_argument("--save", help="write results as JSON")
+    out.add_argument("--compare", help="baseline JSON from an earlier --save")
+    out.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    out.add_argument("--seed", type=int, default=7)
+    out.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+    # The run chdirs into a scratch directory, so pin output paths first
+    args.save = os.path.abspath(args.save) if args.save else None
+    args.compare = os.path.abspath(args.compare) if args.compare else None
+    return args
+
+def configure_environment(args: argparse.Namespace, workdir: str, ports: Dict[str, int], fixtures) -> None:
+    """Point settings at the stand-ins; must run before anything under app/ is imported"""
+    sources = {"sources": [
+        {
+            "group": "bench",
+            "url": f"http://127.0.0.1:{ports['feeds']}/feeds/{f.name}",
+            "source": f.name,
+            "tag": f.tag,
+            "limit": f.entries
+        }
+        for f in fixtures
+    ]}
+    sources_path = os.path.join(workdir, "sources.json")
+    with open(sources_path, "w", encoding="utf-8") as fh:
+        json.dump(sources, fh)
+
+    state_db = os.path.join(workdir, "state.db")
+    os.environ.update({
+        "SUPABASE_URL": f"http://127.0.0.1:{ports['postgrest']}",
+        "SUPABASE_KEY": "bench-anon",
+        "SUPABASE_SERVICE_KEY": "bench-service",
+        "GOOGLE_API_KEY": "bench",
+        "RESEND_API_KEY": "bench",
+        "SOURCES_PATH": sources_path,
+        "FEED_CACHE_PATH": state_db,
+        "POLL_STATE_PATH": state_db,
+        "URL_REDIRECT_CACHE_PATH": state_db,
+        "NEAR_DUP_INDEX_PATH": state_db,
+        "ANALYSIS_CACHE_PATH": os.path.join(workdir, "analysis.db"),
+        "ANALYSIS_REQUESTS_PER_MINUTE": str(args.llm_rpm),
+        "METRICS_ENABLED": "false",
+    })
+    if args.no_response_cache:
+        os.environ["FEED_RESPONSE_CACHE_MAX_ENTRIES"] = "0"
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+def seed_payloads(count: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    words = [w.strip(".,") for q in SEARCH_QUERIES for w in q.split()] + ["update", "report", "launch", "market"]
+    tags = ["ethereum", "solana", "base", "defi", "nft", "research", "general"]
+    payloads = []
+    for i in range(count):
+        title = " ".join(rng.choice(words) for _ in range(6)).capitalize()
+        url = f"https://seed.lexi.local/articles/{i}"
+        payloads.append({
+            "title": f"{title} {i}",
+            "url": url,
+            "canonical_url": url,
+            "source": "seed",
+            "summary": " ".join(rng.choice(words) for _ in range(60)),
+            "ecosystem_tag": rng.choice(tags),
+            "published_at": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00",
+            "legitimacy_score": round(rng.random(), 2),
+            "sentiment_score": rng.randint(1, 10),
+            "is_processed": True
+        })
+    return payloads
+
+async def run_cycle(label: str) -> Dict:
+    from app.agents.scraper import run_scraping_agent
+    holder = {}
+    started = time.perf_counter()
+    stored = await run_scraping_agent(force_all=True, on_pipeline=lambda p: holder.setdefault("pipeline", p))
+    elapsed = time.perf_counter() - started
+    pipeline = holder.get("pipeline")
+    metrics = pipeline.metrics() if pipeline else {"stages": {}, "first_store_seconds": None}
+    stages = metrics["stages"]
+    print(f"  {label}: stored {stored} in {elapsed:.2f}s")
+    return {
+        "seconds": round(elapsed, 3),
+        "stored": stored,
+        "parsed": stages.get("parse", {}).get("out", 0),
+        "analyzed": stages.get("analyze", {}).get("in", 0),
+        "first_store_seconds": metrics["first_store_seconds"],
+        "stage_busy_seconds": {name: stage["busy_seconds"] for name, stage in stages.items()},
+        "stage_errors": {name: stage["errors"] for name, stage in stages.items() if stage["errors"]}
+    }
+
+async def load(client, paths: List[str], total: int, concurrency: int, seed: int) -> Dict:
+    rng = random.Random(seed)
+    queue = [rng.choice(paths) for _ in range(total)]
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while queue:
+            path = queue.pop()
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "errors": errors,
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies, default=0.0), 2)
+    }
+
+async def feed_paths(client) -> List[str]:
+    """First pages for each ecosystem plus a few cursor pages deep, as the infinite scroll would ask"""
+    paths = []
+    for ecosystem in ["all", "ethereum", "solana", "base", "research", "defi"]:
+        path = f"/api/v1/feed/?ecosystem={ecosystem}&limit=30"
+        for _ in range(5):
+            paths.append(path)
+            page = (await client.get(path)).json()
+            if not page.get("next_cursor"):
+                break
+            path = f"/api/v1/feed/?ecosystem={ecosystem}&limit=30&cursor={page['next_cursor']}"
+    return paths
+
+async def bench(args: argparse.Namespace, fake_gemini) -> Dict:
+    import httpx
+    from app.agents.parse_worker import get_parse_pool
+    from app.core.database import close_databases, database_stats, get_database
+    from app.core.http_client import close_http_clients
+    from app.main import app
+    from app.repositories import ArticleRepository
+
+    print("Ingestion")
+    cold = await run_cycle("cold cycle")
+    repeat = await run_cycle("repeat cycle")
+    get_parse_pool().shutdown(wait=True)
+
+    print(f"Seeding {args.seed_articles} articles")
+    articles = ArticleRepository(get_database("service"))
+    for start in range(0, args.seed_articles, 1000):
+        await articles.store_many(seed_payloads(min(1000, args.seed_articles - start), args.seed + start))
+
+    print(f"API load: {args.requests} requests per endpoint, concurrency {args.concurrency}")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        feed = await load(client, await feed_paths(client), args.requests, args.concurrency, args.seed)
+        rng = random.Random(args.seed)
+        search_paths = [
+            f"/api/v1/feed/search?q={q}" + (f"&ecosystem={rng.choice(['ethereum', 'solana'])}" if i % 3 == 0 else "")
+            for i, q in enumerate(SEARCH_QUERIES)
+        ]
+        search = await load(client, search_paths, args.requests, args.concurrency, args.seed + 1)
+
+    db_stats = database_stats()
+    await close_http_clients()
+    await close_databases()
+
+    return {
+        "ingestion": {
+            "cold_cycle_seconds": cold["seconds"],
+            "articles_stored": cold["stored"],
+            "articles_per_second": round(cold["stored"] / cold["seconds"], 1) if cold["seconds"] else 0.0,
+            "parsed_per_second": round(cold["parsed"] / cold["seconds"], 1) if cold["seconds"] else 0.0,
+            "repeat_cycle_seconds": repeat["seconds"],
+            "cold": cold,
+            "repeat": repeat,
+            "llm": dict(fake_gemini.stats)
+        },
+        "api": {"feed": feed, "search": search},
+        "memory": {
+            "peak_rss_mb": peak_rss_mb(),
+            # Parse pool workers; they were reaped by the shutdown above
+            "parse_workers_peak_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN)
+        },
+        "database": db_stats
+    }
+
+def _lookup(results: Dict, dotted: str) -> Optional[float]:
+    value = results
+    for part in dotted.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> bool:
+    """Print a comparison table; False if any tracked metric regressed beyond tolerance"""
+    ok = True
+    print(f"\n{'metric':36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for dotted, higher_is_better in TRACKED:
+        before, after = _lookup(baseline, dotted), _lookup(results, dotted)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        regressed = change < -tolerance if higher_is_better else change > tolerance
+        ok &= not regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{dotted:36} {before:>10} {after:>10} {change:>+8.1%}{flag}")
+    return ok
+
+def print_report(results: Dict):
+    ingestion, api, memory = results["ingestion"], results["api"], results["memory"]
+    print("\nResults")
+    print(f"  cold cycle      {ingestion['cold_cycle_seconds']:.2f}s, {ingestion['articles_stored']} stored "
+          f"({ingestion['articles_per_second']} articles/s, {ingestion['parsed_per_second']} parsed/s)")
+    print(f"  repeat cycle    {ingestion['repeat_cycle_seconds']:.2f}s")
+    print(f"  fake Gemini     {ingestion['llm']}")
+    for name in ("feed", "search"):
+        stats = api[name]
+        print(f"  /{name:14} p50 {stats['p50_ms']}ms  p99 {stats['p99_ms']}ms  "
+              f"{stats['requests_per_second']} req/s  errors {stats['errors']}")
+    print(f"  peak RSS        {memory['peak_rss_mb']} MB (parse workers {memory['parse_workers_peak_rss_mb']} MB)")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    fixtures = generate_fixtures(
+        feeds=args.feeds, entries=args.entries,
+        large_feeds=args.large_feeds, large_entries=args.large_entries,
+        slow_feeds=args.slow_feeds, slow_delay=args.slow_delay,
+        web3_share=args.web3_share, seed=args.seed
+    )
+    process, ports, conn = serve_in_background(fixtures, args.db_latency_ms / 1000)
+    workdir = tempfile.mkdtemp(prefix="lexi-bench-")
+    try:
+        configure_environment(args, workdir, ports, fixtures)
+        # Relative paths in the app (agent.log, .env) resolve here, away from the real ones
+        os.chdir(workdir)
+
+        import logging
+        from benchmarks.fake_gemini import FakeGemini
+        import app.main  # noqa: F401  configures logging on import; quiet it afterwards
+        logging.getLogger().setLevel(args.log_level)
+
+        fake_gemini = FakeGemini(latency=args.llm_latency, error_rate=args.llm_error_rate, seed=args.seed)
+        fake_gemini.install()
+        print(f"{len(fixtures)} feeds, {sum(f.entries for f in fixtures)} entries, "
+              f"{sum(len(f.body) for f in fixtures) / 1e6:.1f} MB; state in {workdir}")
+        results = asyncio.run(bench(args, fake_gemini))
+    finally:
+        conn.close()
+        process.join(timeout=5)
+
+    results["config"] = vars(args)
+    print_report(results)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            if not compare(results, json.load(fh), args.tolerance):
+                return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,434 @@
+"""
+Local stand-ins for the agent's network dependencies:
+
+- feed_app serves fixture feeds with ETag support, optional stalls and slow bodies.
+- FakePostgrest is an in-memory subset of the PostgREST API that Supabase exposes,
+  covering exactly the queries app/repositories issues (filters, keyset `or`,
+  ordering, upserts with on_conflict, exact counts, deletes and search_articles).
+
+Both run in a separate process (see serve_in_background) so their CPU time and
+memory stay out of the measurements taken in the benchmark process.
+"""
+import asyncio
+import bisect
+import hashlib
+import json
+import multiprocessing
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from aiohttp import web
+from .fixtures import FeedFixture
+
+# --- Feed server ---
+
+def feed_app(fixtures: List[FeedFixture]) -> web.Application:
+    by_name = {f.name: f for f in fixtures}
+    etags = {f.name: f'"{hashlib.md5(f.body).hexdigest()}"' for f in fixtures}
+
+    async def serve(request: web.Request):
+        fixture = by_name.get(request.match_info["name"])
+        if fixture is None:
+            raise web.HTTPNotFound()
+        if fixture.delay:
+            await asyncio.sleep(fixture.delay)
+        etag = etags[fixture.name]
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+
+        headers = {"ETag": etag, "Content-Type": "application/xml"}
+        if not fixture.chunk_delay:
+            return web.Response(body=fixture.body, headers=headers)
+
+        response = web.StreamResponse(headers=headers)
+        await response.prepare(request)
+        step = max(1, len(fixture.body) // 10)
+        for start in range(0, len(fixture.body), step):
+            await response.write(fixture.body[start:start + step])
+            await asyncio.sleep(fixture.chunk_delay)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/feeds/{name}", serve)
+    return app
+
+# --- PostgREST stand-in ---
+
+_OR_TERM = re.compile(r'(and\((?P<group>.*?)\))|(?P<col>[\w]+)\.(?P<op>\w+)\.(?P<val>"[^"]*"|[^,]*)')
+_TERM = re.compile(r"[a-z0-9]+")
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+def _coerce(row_value: Any, raw: str) -> Tuple[Any, Any]:
+    """Pair the row value and filter literal up so they compare like Postgres would"""
+    if isinstance(row_value, bool):
+        return row_value, raw.lower() == "true"
+    if isinstance(row_value, (int, float)):
+        try:
+            return row_value, float(raw)
+        except ValueError:
+            return str(row_value), raw
+    if row_value is None:
+        return None, raw
+    return str(row_value), raw
+
+def _match(row: Dict, column: str, op: str, raw: str) -> bool:
+    if op == "not":
+        op, _, raw = raw.partition(".")
+        return not _match(row, column, op, raw)
+    value = row.get(column)
+    if op == "is":
+        return value is None if raw == "null" else value == (raw == "true")
+    if op == "in":
+        options = {_unquote(v) for v in _split_list(raw.strip("()"))}
+        return value is not None and str(value) in options
+    if value is None:
+        return False
+    left, right = _coerce(value, _unquote(raw))
+    if op == "eq":
+        return left == right
+    if op == "neq":
+        return left != right
+    if op == "lt":
+        return left < right
+    if op == "lte":
+        return left <= right
+    if op == "gt":
+        return left > right
+    if op == "gte":
+        return left >= right
+    raise web.HTTPBadRequest(text=f"unsupported operator {op}")
+
+def _split_list(raw: str) -> List[str]:
+    """Split a PostgREST list on commas outside double quotes"""
+    items, current, quoted = [], [], False
+    for char in raw:
+        if char == '"':
+            quoted = not quoted
+        if char == "," and not quoted:
+            items.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        items.append("".join(current))
+    return items
+
+def _parse_logic(expression: str) -> List:
+    """`a.lt.1,and(b.eq.2,c.lt.3)` -> [("a","lt","1"), [("b","eq","2"), ("c","lt","3")]]"""
+    terms = []
+    for match in _OR_TERM.finditer(expression):
+        if match.group("group") is not None:
+            terms.append(_parse_logic(match.group("group")))
+        elif match.group("col"):
+            terms.append((match.group("col"), match.group("op"), match.group("val")))
+    return terms
+
+def _match_all(row: Dict, terms: List) -> bool:
+    return all(_match_all(row, t) if isinstance(t, list) else _match(row, *t) for t in terms)
+
+class Table:
+    def __init__(self, name: str, unique: List[Tuple[str, ...]]):
+        self.name = name
+        self.rows: Dict[str, Dict] = {}
+        # Unique constraints: tuple of columns -> key -> row id
+        self.unique = {cols: {} for cols in unique}
+        self.version = 0
+        self._sorted: Dict[Tuple, Tuple[int, List[Dict]]] = {}
+
+    def find_conflict(self, row: Dict, columns: Tuple[str, ...]) -> Optional[str]:
+        index = self.unique.get(columns)
+        if index is None:
+            return None
+        return index.get(tuple(row.get(c) for c in columns))
+
+    def put(self, row: Dict):
+        self.rows[row["id"]] = row
+        for cols, index in self.unique.items():
+            index[tuple(row.get(c) for c in cols)] = row["id"]
+        self.version += 1
+
+    def remove(self, row_id: str):
+        row = self.rows.pop(row_id)
+        for cols, index in self.unique.items():
+            key = tuple(row.get(c) for c in cols)
+            if index.get(key) == row_id:
+                del index[key]
+        self.version += 1
+
+    def ordered(self, order: Tuple[Tuple[str, bool], ...]) -> List[Dict]:
+        """Rows sorted by `order`, cached until the table changes"""
+        cached = self._sorted.get(order)
+        if cached and cached[0] == self.version:
+            return cached[1]
+        rows = list(self.rows.values())
+        for column, desc in reversed(order):
+            rows.sort(key=lambda r: (r.get(column) is not None, r.get(column)), reverse=desc)
+        self._sorted[order] = (self.version, rows)
+        return rows
+
+class FakePostgrest:
+    """
+    Enough of PostgREST for the repositories: rows live in dicts, reads are
+    linear scans over a cached sort order with early exit at `limit`.
+    `latency` adds a fixed delay per request to emulate the network round trip.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables = {
+            "articles": Table("articles", [("canonical_url",)]),
+            "saved_bookmarks": Table("saved_bookmarks", [("user_address", "article_id")]),
+            "users": Table("users", [("wallet_address",)]),
+        }
+        self.requests = 0
+        self._index = None
+
+    def _table(self, name: str) -> Table:
+        table = self.tables.get(name)
+        if table is None:
+            raise web.HTTPNotFound(text=json.dumps({"message": f"relation {name} does not exist"}))
+        return table
+
+    def _query(self, table: Table, params: List[Tuple[str, str]]) -> List[Dict]:
+        filters, order, limit, offset = [], [], None, 0
+        for key, value in params:
+            if key == "select" or key == "on_conflict":
+                continue
+            if key == "order":
+                for part in value.split(","):
+                    column, _, direction = part.partition(".")
+                    order.append((column, direction.startswith("desc")))
+            elif key == "limit":
+                limit = int(value)
+            elif key == "offset":
+                offset = int(value)
+            elif key == "or":
+                terms = _parse_logic(value[1:-1] if value.startswith("(") else value)
+                filters.append(lambda row, terms=terms: any(
+                    _match_all(row, t) if isinstance(t, list) else _match(row, *t) for t in terms
+                ))
+            else:
+                op, _, raw = value.partition(".")
+                filters.append(lambda row, key=key, op=op, raw=raw: _match(row, key, op, raw))
+
+        rows = table.ordered(tuple(order)) if order else list(table.rows.values())
+        out = []
+        skipped = 0
+        for row in rows:
+            if all(f(row) for f in filters):
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                out.append(row)
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
+
+    def _select(self, rows: List[Dict], select: str) -> List[Dict]:
+        select = select.replace(" ", "")
+        if not select or select == "*":
+            return rows
+        columns = [c for c in select.split(",") if "(" not in c]
+        embeds = [c for c in select.split(",") if "(" in c]
+        shaped = []
+        for row in rows:
+            item = dict(row) if "*" in columns else {c: row.get(c) for c in columns}
+            for embed in embeds:
+                # saved_bookmarks -> articles via article_id
+                name = embed.split("(")[0]
+                item[name] = self.tables[name].rows.get(row.get("article_id"))
+            shaped.append(item)
+        return shaped
+
+    async def handle_table(self, request: web.Request):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        table = self._table(request.match_info["table"])
+        prefer = request.headers.get("Prefer", "")
+
+        params = list(request.query.items())
+
+        if request.method == "GET":
+            rows = self._select(self._query(table, params), request.query.get("select", "*"))
+            headers = {}
+            if "count=exact" in prefer:
+                total = len(self._query(table, [(k, v) for k, v in params if k not in ("limit", "offset")]))
+                headers["Content-Range"] = f"0-{max(len(rows) - 1, 0)}/{total}"
+            return web.json_response(rows, headers=headers)
+
+        if request.method == "POST":
+            payload = await request.json()
+            rows = payload if isinstance(payload, list) else [payload]
+            conflict = tuple(c for c in request.query.get("on_conflict", "").split(",") if c)
+            ignore = "resolution=ignore-duplicates" in prefer
+            written = []
+            for incoming in rows:
+                if table.name == "saved_bookmarks" and incoming.get("article_id") not in self.tables["articles"].rows:
+                    return web.json_response(
+                        {"code": "23503", "message": "insert or update violates foreign key constraint", "details": None, "hint": None},
+                        status=409
+                    )
+                existing_id = table.find_conflict(incoming, conflict) if conflict else None
+                if existing_id is not None:
+                    if ignore:
+                        continue
+                    row = {**table.rows[existing_id], **incoming}
+                else:
+                    row = {"id": str(uuid.uuid4()), "created_at": datetime.now(timezone.utc).isoformat(), **incoming}
+                table.put(row)
+                written.append(row)
+            return web.json_response(written, status=201)
+
+        if request.method == "PATCH":
+            changes = await request.json()
+            targets = self._query(table, params)
+            if self._violates_unique(table, targets, changes):
+                # Like Postgres, one duplicate key rejects the whole statement
+                return web.json_response(
+                    {"code": "23505", "message": "duplicate key value violates unique constraint", "details": None, "hint": None},
+                    status=409
+                )
+            updated = []
+            for row in targets:
+                table.remove(row["id"])
+                row.update(changes)
+                table.put(row)
+                updated.append(row)
+            return web.json_response(updated)
+
+        if request.method == "DELETE":
+            removed = self._query(table, params)
+            for row in removed:
+                table.remove(row["id"])
+            return web.json_response(removed)
+
+        raise web.HTTPMethodNotAllowed(request.method, ["GET", "POST", "PATCH", "DELETE"])
+
+    @staticmethod
+    def _violates_unique(table: Table, targets: List[Dict], changes: Dict) -> bool:
+        target_ids = {row["id"] for row in targets}
+        for cols in table.unique:
+            if not set(cols) & set(changes):
+                continue
+            claimed = set()
+            for row in targets:
+                key = tuple({**row, **changes}.get(c) for c in cols)
+                if None in key:
+                    continue  # Nulls never conflict
+                holder = table.find_conflict(dict(zip(cols, key)), cols)
+                if (holder is not None and holder not in target_ids) or key in claimed:
+                    return True
+                claimed.add(key)
+        return False
+
+    def _search_index(self):
+        """Sorted vocabulary and postings {word: {row_id: (title hits, summary hits)}}, rebuilt after writes"""
+        table = self.tables["articles"]
+        if self._index is not None and self._index[0] == table.version:
+            return self._index[1], self._index[2]
+        postings: Dict[str, Dict[str, List[int]]] = {}
+        for row_id, row in table.rows.items():
+            for field, slot in (("title", 0), ("summary", 1)):
+                for word in _TERM.findall((row.get(field) or "").lower()):
+                    postings.setdefault(word, {}).setdefault(row_id, [0, 0])[slot] += 1
+        vocabulary = sorted(postings)
+        self._index = (table.version, vocabulary, postings)
+        return vocabulary, postings
+
+    def search(self, q: str, ecosystem: Optional[str], page_size: int,
+               after_rank: Optional[float], after_id: Optional[str]) -> List[Dict]:
+        """Python take on search_articles: AND of prefix terms, title hits weighted above summary"""
+        terms = _TERM.findall(q.lower())
+        if not terms:
+            return []
+        vocabulary, postings = self._search_index()
+        rows = self.tables["articles"].rows
+        scores: Optional[Dict[str, float]] = None
+        for term in terms:
+            term_scores: Dict[str, float] = {}
+            start = bisect.bisect_left(vocabulary, term)
+            for word in vocabulary[start:]:
+                if not word.startswith(term):
+                    break
+                for row_id, (in_title, in_summary) in postings[word].items():
+                    term_scores[row_id] = term_scores.get(row_id, 0.0) + in_title + in_summary * 0.4
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {row_id: score + term_scores[row_id] for row_id, score in scores.items() if row_id in term_scores}
+
+        ranked = []
+        for row_id, score in (scores or {}).items():
+            row = rows[row_id]
+            if ecosystem and row.get("ecosystem_tag") != ecosystem:
+                continue
+            rank = round(score / (1 + len(row.get("summary") or "") / 300), 6)
+            if after_rank is None or rank < after_rank or (rank == after_rank and row_id < after_id):
+                ranked.append((rank, row_id, row))
+        ranked.sort(key=lambda r: (r[0], r[1]), reverse=True)
+        return [{"article": row, "search_rank": rank} for rank, _, row in ranked[:page_size]]
+
+    async def handle_rpc(self, request: web.Request):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if request.match_info["function"] != "search_articles":
+            raise web.HTTPNotFound()
+        params = await request.json()
+        return web.json_response(self.search(
+            params["q"], params.get("ecosystem"), params.get("page_size", 30),
+            params.get("after_rank"), params.get("after_id")
+        ))
+
+    async def handle_stats(self, request: web.Request):
+        return web.json_response({
+            "requests": self.requests,
+            "rows": {name: len(table.rows) for name, table in self.tables.items()}
+        })
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_route("*", "/rest/v1/rpc/{function}", self.handle_rpc)
+        app.router.add_route("*", "/rest/v1/{table}", self.handle_table)
+        app.router.add_get("/_bench/stats", self.handle_stats)
+        return app
+
+# --- Process wrapper ---
+
+async def _serve(fixtures: List[FeedFixture], db_latency: float, conn):
+    runners = []
+    ports = {}
+    for name, app in (("feeds", feed_app(fixtures)), ("postgrest", FakePostgrest(db_latency).app())):
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        ports[name] = runner.addresses[0][1]
+        runners.append(runner)
+    conn.send(ports)
+    # Run until the parent closes its end of the pipe
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, conn.recv)
+
+def _child(fixtures, db_latency, conn):
+    try:
+        asyncio.run(_serve(fixtures, db_latency, conn))
+    except EOFError:
+        pass
+
+def serve_in_background(fixtures: List[FeedFixture], db_latency: float = 0.0):
+    """Start both servers in a child process; returns (process, ports, conn). Close conn to stop them."""
+    parent_conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.get_context("spawn").Process(
+        target=_child, args=(fixtures, db_latency, child_conn), daemon=True
+    )
+    process.start()
+    ports = parent_conn.recv()
+    return process, ports, parent_conn
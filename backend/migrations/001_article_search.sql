@@ -0,0 +1,47 @@
+-- Full-text search over article titles and summaries.
+-- Run once in the Supabase SQL editor (or psql) before deploying the /feed/search change.
+
+-- Weighted document: title matches rank above summary matches.
+alter table articles
+    add column if not exists search_vector tsvector
+    generated always as (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+    ) stored;
+
+create index if not exists articles_search_vector_idx on articles using gin (search_vector);
+
+-- Ranked, prefix-matching search with an optional ecosystem filter.
+-- Every word in q must match (AND) and each word matches as a prefix,
+-- so "ether merg" finds "Ethereum merge". Results page by (search_rank, id) DESC:
+-- pass the last row's search_rank and id as after_rank / after_id to continue.
+create or replace function search_articles(
+    q text,
+    ecosystem text default null,
+    page_size int default 30,
+    after_rank real default null,
+    after_id text default null
+)
+returns table (article jsonb, search_rank real)
+language sql
+stable
+as $$
+    with query as (
+        select to_tsquery('english', string_agg(term || ':*', ' & ')) as tsq
+        from regexp_split_to_table(lower(q), '[^a-z0-9]+') as term
+        where term <> ''
+    ),
+    ranked as (
+        select a.*, ts_rank(a.search_vector, query.tsq)::real as match_rank
+        from articles a, query
+        where a.search_vector @@ query.tsq
+          and (ecosystem is null or a.ecosystem_tag = ecosystem)
+    )
+    select to_jsonb(r) - 'search_vector' - 'match_rank', r.match_rank
+    from ranked r
+    where after_rank is null
+       or r.match_rank < after_rank
+       or (r.match_rank = after_rank and r.id::text < after_id)
+    order by r.match_rank desc, r.id::text desc
+    limit page_size;
+$$;
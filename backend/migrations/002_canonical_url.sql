@@ -0,0 +1,11 @@
+-- Dedup key for ingestion: the article URL with tracking parameters, fragments,
+-- trailing slashes, host case and http vs https normalized away, after unwrapping redirect links.
+-- The agent upserts on this column (see app/agents/url_canonicalizer.py).
+
+alter table articles add column if not exists canonical_url text;
+
+-- Nulls don't conflict, so rows stored before this migration are fine until
+-- backfilled. Fill them with the agent's own canonicalizer rather than an SQL
+-- approximation, whose keys wouldn't match what the agent looks up:
+--     python scripts/backfill_canonical_url.py
+create unique index if not exists articles_canonical_url_key on articles (canonical_url);
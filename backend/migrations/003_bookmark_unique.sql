@@ -0,0 +1,13 @@
+-- One bookmark per (user, article), so saving is a single idempotent upsert.
+
+-- Drop duplicates left by the old check-then-insert flow, keeping the oldest
+delete from saved_bookmarks a
+using saved_bookmarks b
+where a.user_address = b.user_address
+  and a.article_id = b.article_id
+  and (a.created_at, a.id::text) > (b.created_at, b.id::text);
+
+-- A unique index rather than a constraint so the migration can be re-run; the
+-- bookmark upsert's on_conflict="user_address,article_id" targets it either way.
+create unique index if not exists saved_bookmarks_user_article_key
+    on saved_bookmarks (user_address, article_id);
@@ -0,0 +1,68 @@
+-- Opt-in email digests, personalized by the ecosystems a user bookmarks.
+
+alter table users
+    add column if not exists email text,
+    add column if not exists digest_enabled boolean not null default false;
+
+create index if not exists users_digest_subscribers_idx
+    on users (wallet_address)
+    where digest_enabled and email is not null;
+
+-- One page of subscribers with their bookmark counts per ecosystem, e.g.
+-- {"ethereum": 12, "defi": 3}. The digest job walks pages by wallet_address
+-- (pass the last one as after_address), so thousands of users cost a handful of
+-- round trips instead of a bookmark query per user.
+create or replace function digest_recipients(
+    after_address text default null,
+    page_size int default 500
+)
+returns table (wallet_address text, email text, ecosystems jsonb)
+language sql
+stable
+as $$
+    with page as (
+        select u.wallet_address, u.email
+        from users u
+        where u.digest_enabled
+          and u.email is not null
+          and (after_address is null or u.wallet_address > after_address)
+        order by u.wallet_address
+        limit page_size
+    ),
+    preferences as (
+        -- Bookmarks may carry checksummed addresses; users are stored lowercase
+        select lower(b.user_address) as address, a.ecosystem_tag as tag, count(*) as bookmarks
+        from saved_bookmarks b
+        join articles a on a.id = b.article_id
+        where lower(b.user_address) in (select p.wallet_address from page p)
+        group by 1, 2
+    )
+    select p.wallet_address,
+           p.email,
+           coalesce(jsonb_object_agg(pr.tag, pr.bookmarks) filter (where pr.tag is not null), '{}'::jsonb)
+    from page p
+    left join preferences pr on pr.address = p.wallet_address
+    group by p.wallet_address, p.email
+    order by p.wallet_address;
+$$;
+
+-- Email addresses are only for the digest job and the API's digest endpoint, both
+-- on the service role. The anon key is meant to be shareable, so anon and
+-- authenticated keep every users column except email. Columns added to users
+-- later need their own grant.
+do $$
+declare
+    visible text;
+begin
+    select string_agg(quote_ident(column_name), ', ' order by ordinal_position) into visible
+    from information_schema.columns
+    where table_schema = 'public' and table_name = 'users' and column_name <> 'email';
+
+    revoke select, insert, update on users from anon, authenticated;
+    execute format('grant select (%1$s), insert (%1$s), update (%1$s) on users to anon, authenticated', visible);
+end
+$$;
+
+-- Returns every subscriber's address: service role only
+revoke execute on function digest_recipients(text, int) from public, anon, authenticated;
+grant execute on function digest_recipients(text, int) to service_role;
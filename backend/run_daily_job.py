@@ -16,7 +16,7 @@ async def main():
     # 2. Run Reporter (Email)
     if count > 0:
         print("\n PHASE 2: Reporting...")
-        send_daily_briefing()
+        await send_daily_briefing()
     else:
         print("\n No new articles to report.")
 
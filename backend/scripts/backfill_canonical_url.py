@@ -0,0 +1,32 @@
+"""
+Fill articles.canonical_url for rows stored before migrations/002_canonical_url.sql,
+using the same canonicalize_url the agent dedups with. Run it right after the
+migration, before the agent's next cycle.
+
+    python scripts/backfill_canonical_url.py --dry-run
+    python scripts/backfill_canonical_url.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.agents.url_canonicalizer import canonicalize_url
+from app.core.maintenance import MaintenanceJob, run_cli
+
+class BackfillCanonicalUrl(MaintenanceJob):
+    name = "backfill_canonical_url"
+    columns = "id,url,canonical_url"
+
+    def classify(self, rows):
+        decisions = []
+        for row in rows:
+            canonical = canonicalize_url(row["url"])
+            decisions.append(None if row.get("canonical_url") == canonical else {"canonical_url": canonical})
+        return decisions
+
+    def describe(self, row):
+        return f"{row['url']} -> {canonicalize_url(row['url'])}"
+
+if __name__ == "__main__":
+    # Older duplicates that collapse to the same key are reported as conflicts and keep a null key
+    run_cli(BackfillCanonicalUrl(), "Backfill articles.canonical_url")
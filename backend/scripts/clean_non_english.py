@@ -1,33 +1,29 @@
 """
 Script to clean existing non-English articles from database
+
+    python scripts/clean_non_english.py --dry-run   # list what would go
+    python scripts/clean_non_english.py             # delete; rerun to resume if interrupted
 """
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.agents.language_detector import LanguageFilter
-from app.core.config import settings
-from supabase import create_client
+from app.core.maintenance import DELETE, MaintenanceJob, run_cli
+
+# One filter per worker process
+_language_filter = LanguageFilter()
+
+class CleanNonEnglish(MaintenanceJob):
+    name = "clean_non_english"
+    columns = "id,title,summary"
+
+    def classify(self, rows):
+        texts = [f"{row['title']} {row.get('summary') or ''}" for row in rows]
+        return [None if include else DELETE for include in _language_filter.filter_many(texts)]
 
-def clean_database():
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    language_filter = LanguageFilter()
-    
-    # Get all articles
-    articles = supabase.table("articles").select("*").execute()
-    
-    deleted_count = 0
-    for article in articles.data:
-        title = article['title']
-        summary = article.get('summary', '')
-        
-        if not language_filter.should_include_article(title, summary):
-            # Delete non-English article
-            supabase.table("articles").delete().eq('id', article['id']).execute()
-            deleted_count += 1
-            print(f"Deleted non-English article: {title[:50]}...")
-    
-    print(f"Cleaned {deleted_count} non-English articles from database")
+    def describe(self, row):
+        return f"{row['title'][:50]}..."
 
 if __name__ == "__main__":
-    clean_database()
\ No newline at end of file
+    run_cli(CleanNonEnglish(), "Delete non-English articles")
@@ -0,0 +1,13 @@
+from app.agents.near_duplicates import BANDS, NearDuplicateIndex, minhash
+
+TITLE = "Ethereum developers schedule Pectra upgrade for mainnet after final testnet fork"
+
+def test_reindexing_a_story_does_not_duplicate_buckets(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "near_dup.db"))
+    signature = minhash(TITLE)
+
+    index.add_many({"https://news.example/pectra": signature})
+    index.add_many({"https://news.example/pectra": signature})
+
+    rows = index._conn.execute("SELECT COUNT(*) FROM near_dup_buckets").fetchone()[0]
+    assert rows == BANDS
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.agents import pipeline as pipeline_module
+from app.agents.near_duplicates import NearDuplicateIndex
+from app.agents.pipeline import IngestionPipeline
+
+TITLE = "Ethereum developers schedule Pectra upgrade for mainnet after final testnet fork"
+SUMMARY = "Core developers agreed on a mainnet date for the Pectra upgrade once the last testnet fork went smoothly. " * 2
+
+class FakeArticles:
+    def __init__(self):
+        self.stored = []
+
+    async def existing_urls(self, urls):
+        return set()
+
+    async def store_many(self, payloads):
+        self.stored.extend(payloads)
+        return payloads, []
+
+class FakeChecker:
+    """Scores the spam copy below LEGITIMACY_MIN_SCORE and everything else as legitimate"""
+
+    def score_many(self, articles):
+        return [0.0 if "spam" in a["url"] else 0.9 for a in articles]
+
+class FakeExecutor:
+    async def analyze_many(self, items):
+        return [None for _ in items]
+
+def article(url, feed_url):
+    return {
+        "title": TITLE,
+        "summary": SUMMARY,
+        "url": url,
+        "canonical_url": url,
+        "feed_url": feed_url,
+        "source": "Test",
+        "ecosystem_tag": "ethereum",
+        "published_at": None,
+    }
+
+def test_story_dropped_by_verifier_does_not_shadow_later_copy(tmp_path, monkeypatch):
+    index = NearDuplicateIndex(str(tmp_path / "near_dup.db"))
+    monkeypatch.setattr(pipeline_module, "get_near_duplicate_index", lambda: index)
+    monkeypatch.setattr(pipeline_module, "get_legitimacy_checker", lambda: FakeChecker())
+    monkeypatch.setattr(pipeline_module, "get_analysis_executor", lambda: FakeExecutor())
+
+    scraper = SimpleNamespace(feed_cache=SimpleNamespace(commit=lambda fetched: None))
+    articles = FakeArticles()
+    pipe = IngestionPipeline(scraper, articles)
+    pipe.started_at = 0.0
+    for feed_url in ("https://spam.example/feed", "https://news.example/feed"):
+        pipe._fetched[feed_url] = SimpleNamespace(url=feed_url)
+        pipe._unsettled[feed_url] = 1
+
+    async def ingest(item):
+        kept = await pipe._dedup([item])
+        kept = await pipe._verify(kept)
+        return await pipe._store(await pipe._analyze(kept))
+
+    async def scenario():
+        spam = await ingest(article("https://spam.example/pectra", "https://spam.example/feed"))
+        real = await ingest(article("https://news.example/pectra", "https://news.example/feed"))
+        return spam, real
+
+    spam, real = asyncio.run(scenario())
+
+    assert spam == []
+    assert [row["url"] for row in real] == ["https://news.example/pectra"]
+    assert pipe.skipped_low_legitimacy == 1
+    assert pipe.skipped_near_duplicates == 0
+    assert pipe.near_duplicates.pending == {}
+
+def test_cancelled_run_stops_every_stage(tmp_path, monkeypatch):
+    index = NearDuplicateIndex(str(tmp_path / "near_dup.db"))
+    monkeypatch.setattr(pipeline_module, "get_near_duplicate_index", lambda: index)
+
+    fetch_started = asyncio.Event()
+
+    async def hang(*args, **kwargs):
+        fetch_started.set()
+        await asyncio.Event().wait()
+
+    scraper = SimpleNamespace(fetch_feed=hang, feed_cache=SimpleNamespace(commit=lambda fetched: None))
+    pipe = IngestionPipeline(scraper, FakeArticles())
+
+    async def scenario():
+        spec = SimpleNamespace(url="https://news.example/feed", source="Test")
+        run = asyncio.create_task(pipe.run([spec]))
+        await fetch_started.wait()
+        run.cancel()
+        try:
+            await run
+        except asyncio.CancelledError:
+            pass
+        current = asyncio.current_task()
+        return [task for task in asyncio.all_tasks() if task is not current]
+
+    assert asyncio.run(scenario()) == []
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from app.agents.parse_worker import parse_feed_bytes
+from app.agents.poll_scheduler import AdaptivePollScheduler
+from app.agents.sources import FeedSpec
+
+DATELESS_FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Quiet blog</title>
+<item><title>Ethereum validators prepare for the next network upgrade</title><link>https://quiet.example/one</link>
+<description>Client teams published release notes explaining what node operators need to change before the fork.</description></item>
+<item><title>Rollup teams compare notes on lowering transaction fees</title><link>https://quiet.example/two</link>
+<description>Several layer two projects shared measurements showing how blob space changed their costs this month.</description></item>
+<item><title>A practical guide to running your own staking node at home</title><link>https://quiet.example/three</link>
+<description>The guide walks through hardware choices, client diversity and keeping the machine online reliably.</description></item>
+</channel></rss>"""
+
+def dateless_timestamps():
+    articles = parse_feed_bytes(DATELESS_FEED, "Quiet", "web3")
+    assert len(articles) == 3
+    # The stored date still falls back to now; the scheduler must not see it
+    assert all(article["published_at"] for article in articles)
+    return [article["published_ts"] for article in articles]
+
+def make_scheduler(tmp_path):
+    return AdaptivePollScheduler(str(tmp_path / "schedule.db"), min_interval_minutes=15, max_interval_minutes=720)
+
+def test_changed_feed_without_dates_keeps_learned_interval(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    spec = FeedSpec("https://quiet.example/feed", "Quiet", "web3", 10)
+    week = timedelta(days=7)
+    start = datetime(2026, 1, 1)
+    scheduler.record_entries(spec, [(start + week * i).timestamp() for i in range(3)], now=1000.0)
+    learned = scheduler._state(spec.url)["interval"]
+    assert learned == 720 * 60
+
+    for poll in range(15):
+        scheduler.record_entries(spec, dateless_timestamps(), now=2000.0 + poll)
+
+    assert scheduler._state(spec.url)["interval"] == learned
+
+def test_changed_feed_without_dates_stays_within_bounds(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    spec = FeedSpec("https://quiet.example/feed", "Quiet", "web3", 10)
+
+    scheduler.record_entries(spec, dateless_timestamps(), now=1000.0)
+
+    assert scheduler._state(spec.url)["interval"] == 15 * 60
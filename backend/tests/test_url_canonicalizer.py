@@ -0,0 +1,9 @@
+from app.agents.url_canonicalizer import canonicalize_url
+
+def test_http_and_https_share_a_key():
+    assert canonicalize_url("http://www.Example.com/post/?utm_source=x") == canonicalize_url("https://example.com/post")
+
+def test_default_ports_are_dropped_for_both_schemes():
+    assert canonicalize_url("http://example.com:80/post") == "https://example.com/post"
+    assert canonicalize_url("https://example.com:443/post") == "https://example.com/post"
+    assert canonicalize_url("http://example.com:8080/post") == "https://example.com:8080/post"
@@ -8,6 +8,13 @@ const api = axios.create({
   timeout: 10000,
 });
 
+// Bookmark endpoints require the session token issued at login
+api.interceptors.request.use((config) => {
+  const token = localStorage.getItem('sessionToken');
+  if (token) config.headers.Authorization = `Bearer ${token}`;
+  return config;
+});
+
 // Add response interceptor for better error handling
 api.interceptors.response.use(
   (response) => response,
@@ -18,10 +25,12 @@ api.interceptors.response.use(
 );
 
 export const feedAPI = {
-  getFeed: async (ecosystem = null, limit = 20) => {
+  // Both endpoints return { items, next_cursor }; pass next_cursor back to get the next page
+  getFeed: async (ecosystem = null, limit = 20, cursor = null) => {
     try {
       const params = { limit };
       if (ecosystem) params.ecosystem = ecosystem;
+      if (cursor) params.cursor = cursor;
       
       const response = await api.get('/feed/', { params });
       return response.data;
@@ -31,11 +40,14 @@ export const feedAPI = {
     }
   },
 
-  searchArticles: async (query) => {
+  // Results come back most relevant first; each word also matches as a prefix
+  searchArticles: async (query, cursor = null, ecosystem = null) => {
     try {
-      const response = await api.get('/feed/search', {
-        params: { q: query }
-      });
+      const params = { q: query };
+      if (cursor) params.cursor = cursor;
+      if (ecosystem) params.ecosystem = ecosystem;
+
+      const response = await api.get('/feed/search', { params });
       return response.data;
     } catch (error) {
       console.error('Error searching articles:', error);
@@ -56,6 +68,44 @@ export const feedAPI = {
     }
   },
 
+  // Save or remove many bookmarks in one request (up to 100 article ids)
+  saveBookmarks: async (userAddress, articleIds) => {
+    try {
+      const response = await api.post('/user/bookmarks/batch', {
+        user_address: userAddress,
+        article_ids: articleIds
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Error saving bookmarks:', error);
+      throw error;
+    }
+  },
+
+  deleteBookmarks: async (userAddress, articleIds) => {
+    try {
+      const response = await api.post('/user/bookmarks/batch-delete', {
+        user_address: userAddress,
+        article_ids: articleIds
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Error deleting bookmarks:', error);
+      throw error;
+    }
+  },
+
+  // Compact list of saved article ids; fetch once and keep it in state
+  getBookmarkedIds: async (userAddress) => {
+    try {
+      const response = await api.get(`/user/${userAddress}/bookmarks/ids`);
+      return response.data.article_ids;
+    } catch (error) {
+      console.error('Error fetching bookmarked ids:', error);
+      throw error;
+    }
+  },
+
   getBookmarks: async (userAddress) => {
     try {
       const response = await api.get(`/user/${userAddress}/bookmarks`);
@@ -1,18 +1,25 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { feedAPI } from '../api/feed';
 
-const ArticleCard = ({ article }) => {
+const ArticleCard = ({ article, saved = false, onToggleSave }) => {
   const { user, isAuthenticated } = useAuth();
-  const [isSaved, setIsSaved] = useState(false);
+  const [isSaved, setIsSaved] = useState(saved);
+
+  useEffect(() => {
+    setIsSaved(saved);
+  }, [saved]);
 
   const handleSave = async () => {
     if (!isAuthenticated) return;
     try {
-      if (!isSaved) {
+      if (isSaved) {
+        await feedAPI.deleteBookmarks(user.address, [article.id]);
+      } else {
         await feedAPI.saveBookmark(user.address, article.id);
       }
       setIsSaved(!isSaved);
+      if (onToggleSave) onToggleSave(article.id, !isSaved);
     } catch (error) {
       console.error('Error saving bookmark:', error);
     }
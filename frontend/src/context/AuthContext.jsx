@@ -19,9 +19,16 @@ export const AuthProvider = ({ children }) => {
   // 1. Check connection on load
   useEffect(() => {
     const savedAddress = localStorage.getItem('userAddress');
-    if (savedAddress) {
+    const token = localStorage.getItem('sessionToken');
+    const expiresAt = Number(localStorage.getItem('sessionExpiresAt') || 0);
+    // Without a live session token the backend will reject bookmark calls, so sign in again
+    if (savedAddress && token && expiresAt > Date.now()) {
       setUser({ address: savedAddress });
       setIsAuthenticated(true);
+    } else {
+      localStorage.removeItem('userAddress');
+      localStorage.removeItem('sessionToken');
+      localStorage.removeItem('sessionExpiresAt');
     }
   }, []);
 
@@ -68,6 +75,8 @@ export const AuthProvider = ({ children }) => {
         setUser({ address: address });
         setIsAuthenticated(true);
         localStorage.setItem('userAddress', address);
+        localStorage.setItem('sessionToken', data.token);
+        localStorage.setItem('sessionExpiresAt', String(Date.now() + data.expires_in * 1000));
       }
     } catch (error) {
       console.error("Login failed:", error);
@@ -82,6 +91,8 @@ export const AuthProvider = ({ children }) => {
     setUser(null);
     setIsAuthenticated(false);
     localStorage.removeItem('userAddress');
+    localStorage.removeItem('sessionToken');
+    localStorage.removeItem('sessionExpiresAt');
     // Optional: Reload page to clear any other state
     window.location.reload();
   };
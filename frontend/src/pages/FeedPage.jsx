@@ -1,10 +1,15 @@
 import React, { useState, useEffect } from 'react';
 import ArticleCard from '../components/ArticleCard';
 import { feedAPI } from '../api/feed';
+import { useAuth } from '../context/AuthContext';
 
 const FeedPage = () => {
+  const { user, isAuthenticated } = useAuth();
+  const [savedIds, setSavedIds] = useState(new Set());
   const [articles, setArticles] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedEcosystem, setSelectedEcosystem] = useState('');
   const [searchQuery, setSearchQuery] = useState('');
 
@@ -24,28 +29,66 @@ const FeedPage = () => {
     try {
       let data;
       if (searchQuery) {
-        data = await feedAPI.searchArticles(searchQuery);
+        data = await feedAPI.searchArticles(searchQuery, null, selectedEcosystem);
       } else {
         data = await feedAPI.getFeed(selectedEcosystem);
       }
       
       // FIX: Trust the API response. If it's empty, it's empty.
       // Don't fallback to test data, or you'll never know if scraping worked.
-      setArticles(data || []); 
+      setArticles(data?.items || []); 
+      setNextCursor(data?.next_cursor || null);
       
     } catch (error) {
       console.error('Error loading articles:', error);
       // Optional: You could set an error state here to show a message to the user
       setArticles([]); 
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const data = searchQuery
+        ? await feedAPI.searchArticles(searchQuery, nextCursor, selectedEcosystem)
+        : await feedAPI.getFeed(selectedEcosystem, 20, nextCursor);
+      setArticles((prev) => [...prev, ...(data?.items || [])]);
+      setNextCursor(data?.next_cursor || null);
+    } catch (error) {
+      console.error('Error loading more articles:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadArticles();
   }, [selectedEcosystem]);
 
+  // One small request per login instead of checking each card
+  useEffect(() => {
+    if (!isAuthenticated || !user?.address) {
+      setSavedIds(new Set());
+      return;
+    }
+    feedAPI.getBookmarkedIds(user.address)
+      .then((ids) => setSavedIds(new Set(ids)))
+      .catch(() => setSavedIds(new Set()));
+  }, [isAuthenticated, user?.address]);
+
+  const handleToggleSave = (articleId, saved) => {
+    setSavedIds((prev) => {
+      const next = new Set(prev);
+      if (saved) next.add(articleId);
+      else next.delete(articleId);
+      return next;
+    });
+  };
+
   const handleSearch = (e) => {
     e.preventDefault();
     loadArticles();
@@ -187,7 +230,12 @@ const FeedPage = () => {
             gap: '1.5rem'
           }}>
             {articles.map(article => (
-              <ArticleCard key={article.id} article={article} />
+              <ArticleCard
+                key={article.id}
+                article={article}
+                saved={savedIds.has(article.id)}
+                onToggleSave={handleToggleSave}
+              />
             ))}
           </div>
         ) : (
@@ -198,6 +246,29 @@ const FeedPage = () => {
             <p>Try adjusting your filters or check back later for new intelligence.</p>
           </div>
         )}
+
+        {/* Load More */}
+        {!loading && nextCursor && (
+          <div style={{ display: 'flex', justifyContent: 'center', padding: '2rem 0' }}>
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              style={{
+                padding: '8px 20px',
+                background: '#14b8a6',
+                color: 'white',
+                border: 'none',
+                borderRadius: '8px',
+                fontSize: '14px',
+                fontWeight: '500',
+                cursor: loadingMore ? 'default' : 'pointer',
+                opacity: loadingMore ? 0.7 : 1
+              }}
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
 
       <style>{`